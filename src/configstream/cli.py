@@ -4,7 +4,7 @@ import asyncio
 import json
 import sys
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, Coroutine, Sequence
 
 import click
 from rich.console import Console
@@ -14,6 +14,7 @@ from . import pipeline
 from .config import AppSettings
 from .models import Proxy
 from .geoip import download_geoip_dbs
+from .http_client import close_shared_client
 from .logging_config import setup_logging
 from .cli_errors import handle_cli_errors, CLIError
 
@@ -24,6 +25,18 @@ config = AppSettings()
 # Error handling functions moved to cli_errors.py module
 
 
+def _run_async(main: Coroutine[Any, Any, None]) -> None:
+    """Run a command coroutine, closing the shared HTTP client before its loop ends."""
+
+    async def _main() -> None:
+        try:
+            await main
+        finally:
+            await close_shared_client()
+
+    asyncio.run(_main())
+
+
 def validate_proxy_data(proxies_data: Sequence[object] | None, *, for_retest: bool = False) -> None:
     """Validate that proxy data is non-empty"""
     if not proxies_data or len(proxies_data) == 0:
@@ -151,7 +164,7 @@ def merge(
     leniency: bool,
 ) -> None:
     """Run the full pipeline: fetch, test, and generate outputs."""
-    asyncio.run(
+    _run_async(
         _merge_logic_async(
             sources_file=sources_file,
             output_dir=output_dir,
@@ -180,7 +193,7 @@ async def _update_databases_logic_async() -> None:
 @cli.command()
 def update_databases() -> None:
     """Update GeoIP databases for proxy geolocation."""
-    asyncio.run(_update_databases_logic_async())
+    _run_async(_update_databases_logic_async())
 
 
 async def _retest_logic_async(
@@ -291,7 +304,7 @@ def retest(
     show_metrics: bool,
 ) -> None:
     """Retest previously tested proxies from a JSON file."""
-    asyncio.run(
+    _run_async(
         _retest_logic_async(
             input_file=input_file,
             output_dir=output_dir,
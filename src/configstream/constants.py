@@ -1,5 +1,8 @@
 """Centralized constants for all modules."""
 
+import multiprocessing
+from typing import FrozenSet
+
 # Size Limits
 MAX_B64_INPUT_SIZE = 50 * 1024 * 1024  # 50 MB
 MAX_B64_OUTPUT_SIZE = 100 * 1024 * 1024  # 100 MB
@@ -13,44 +16,56 @@ TEST_TIMEOUT = 10
 GEOIP_TIMEOUT = 5
 
 # Ports & Domains
-DANGEROUS_PORTS = [21, 22, 23, 25, 110, 143, 445, 3306, 3389, 5432, 6379, 27017]
-SUSPICIOUS_DOMAINS = ["localhost", "127.0.0.1", "0.0.0.0", "169.254.", "192.168.", "10."]
+DANGEROUS_PORTS: FrozenSet[int] = frozenset(
+    {21, 22, 23, 25, 110, 143, 445, 3306, 3389, 5432, 6379, 27017}
+)
+SUSPICIOUS_DOMAINS: FrozenSet[str] = frozenset(
+    {"localhost", "127.0.0.1", "0.0.0.0", "169.254.", "192.168.", "10."}
+)
 MIN_SAFE_PORT = 1024
 MAX_PORT = 65535
 
+# Process pools start workers from a clean server process: forking a process
+# that already runs threads can copy locks they hold into the children
+POOL_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
 # URL for a known, trusted endpoint to test proxy integrity (header/body tampering).
 # This should be a service you control or a highly reliable public one like httpbin.
 CANARY_URL = "https://httpbin.org/"
 
 
 # Protocols
-VALID_PROTOCOLS = [
-    "vmess",
-    "vless",
-    "shadowsocks",
-    "ss",
-    "ss2022",
-    "ssr",
-    "trojan",
-    "hysteria",
-    "hysteria2",
-    "hy2",
-    "tuic",
-    "wireguard",
-    "wg",
-    "naive",
-    "snell",
-    "brook",
-    "juicity",
-    "xray",
-    "xtls",
-    "ssh",
-    "http",
-    "https",
-    "socks",
-    "socks4",
-    "socks5",
-]
+VALID_PROTOCOLS: FrozenSet[str] = frozenset(
+    {
+        "vmess",
+        "vless",
+        "shadowsocks",
+        "ss",
+        "ss2022",
+        "ssr",
+        "trojan",
+        "hysteria",
+        "hysteria2",
+        "hy2",
+        "tuic",
+        "wireguard",
+        "wg",
+        "naive",
+        "snell",
+        "brook",
+        "juicity",
+        "xray",
+        "xtls",
+        "ssh",
+        "http",
+        "https",
+        "socks",
+        "socks4",
+        "socks5",
+    }
+)
 
 # Test URLs for proxy validation (centralized configuration)
 TEST_URLS = {
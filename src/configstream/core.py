@@ -1,29 +1,11 @@
 import logging
 import re
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Dict, Optional
 
 import httpx
-from .http_client import get_client
-
-from .parsers import (
-    _parse_brook,
-    _parse_generic_url_scheme,
-    _parse_hysteria,
-    _parse_hysteria2,
-    _parse_juicity,
-    _parse_naive,
-    _parse_snell,
-    _parse_ss,
-    _parse_ss2022,
-    _parse_ssr,
-    _parse_trojan,
-    _parse_tuic,
-    _parse_v2ray_json,
-    _parse_vless,
-    _parse_vmess,
-    _parse_wireguard,
-    _parse_xray,
-)
+from .http_client import get_shared_client
+
+from .parsers import _build_parser_dispatch, parse_any
 
 from .models import Proxy
 from .countries import COUNTRY_NAMES
@@ -79,11 +61,11 @@ async def _lookup_geoip_http(
         return None
 
     try:
-        async with get_client() as client:
-            url = f"http://ip-api.com/json/{address}?fields=status,country,countryCode,city,as"
-            response = await client.get(url, timeout=timeout_seconds)
-            response.raise_for_status()
-            payload = response.json()
+        client = get_shared_client()
+        url = f"http://ip-api.com/json/{address}?fields=status,country,countryCode,city,as"
+        response = await client.get(url, timeout=timeout_seconds)
+        response.raise_for_status()
+        payload = response.json()
     except (httpx.HTTPError, ValueError):
         return None
 
@@ -105,36 +87,9 @@ async def _lookup_geoip_http(
     }
 
 
-ParserFunc = Callable[[str], Optional[Proxy]]
-
-
-def _create_parser_map() -> Dict[str, ParserFunc]:
-    """Create a mapping from protocol prefixes to parser functions."""
-    return {
-        "vmess://": _parse_vmess,
-        "vless://": _parse_vless,
-        "ss://": _parse_ss,
-        "ss2022://": _parse_ss2022,
-        "ssr://": _parse_ssr,
-        "trojan://": _parse_trojan,
-        "hysteria://": _parse_hysteria,
-        "hy2://": _parse_hysteria2,
-        "hysteria2://": _parse_hysteria2,
-        "tuic://": _parse_tuic,
-        "wg://": _parse_wireguard,
-        "wireguard://": _parse_wireguard,
-        "naive+https://": _parse_naive,
-        "xray://": _parse_xray,
-        "xtls://": _parse_xray,
-        "snell://": _parse_snell,
-        "brook://": _parse_brook,
-        "juicity://": _parse_juicity,
-    }
-
-
-# Pre-compute the parser map at module load time for efficiency
-_parser_map = _create_parser_map()
-_generic_protocols = {"ssh", "http", "https", "socks", "socks4", "socks5"}
+# Built at import time (rather than shared with parsers.PARSER_DISPATCH) so a
+# reload picks up whichever parser functions are currently installed.
+_parser_map = _build_parser_dispatch()
 
 
 def parse_config(config_string: str) -> Proxy | None:
@@ -151,24 +106,7 @@ def parse_config(config_string: str) -> Proxy | None:
         return None
 
     try:
-        # Fast path for common protocols using the pre-computed map
-        for prefix, parser in _parser_map.items():
-            if config_string.startswith(prefix):
-                return parser(config_string)
-
-        # Special case for JSON-based V2Ray configs
-        if config_string.lstrip().startswith("{"):
-            return _parse_v2ray_json(config_string)
-
-        # Fallback for generic URL-based schemes
-        if "://" in config_string:
-            protocol = config_string.split("://", 1)[0]
-            if protocol in _generic_protocols:
-                return _parse_generic_url_scheme(config_string)
-
-        logger.debug(f"Unknown protocol in config: {config_string[:50]}...")
-        return None
-
+        return parse_any(config_string, _parser_map)
     except Exception as e:
         logger.debug(f"Error parsing config '{config_string[:50]}...': {e}")
         return None
@@ -183,8 +121,13 @@ def parse_config_batch(config_strings: list[str]) -> list[Proxy]:
     return parsed
 
 
-async def geolocate_proxy(proxy: Proxy, geoip_reader: Any | None = None) -> Proxy:
-    """Geolocate a proxy using remarks, a local DB, or a fallback HTTP lookup."""
+def parse_config_list(config_strings: list[str]) -> list[Proxy | None]:
+    """Parse each config string, keeping a ``None`` in place of every failure."""
+    return [parse_config(config_string) for config_string in config_strings]
+
+
+def apply_known_location(proxy: Proxy) -> bool:
+    """Fill the country from the proxy's own code or remarks; return whether it had one."""
 
     # 1. If country code is valid, ensure country name is consistent.
     if proxy.country_code and proxy.country_code != "XX":
@@ -192,13 +135,22 @@ async def geolocate_proxy(proxy: Proxy, geoip_reader: Any | None = None) -> Prox
             payload = _country_payload_from_code(proxy.country_code)
             if payload:
                 proxy.country = payload["country"]
-        return proxy
+        return True
 
     # 2. Try to infer from remarks (e.g., flags, country codes).
     inferred = _infer_country_from_remarks(proxy.remarks)
     if inferred:
         proxy.country = inferred["country"]
         proxy.country_code = inferred["country_code"]
+        return True
+
+    return False
+
+
+async def geolocate_proxy(proxy: Proxy, geoip_reader: Any | None = None) -> Proxy:
+    """Geolocate a proxy using remarks, a local DB, or a fallback HTTP lookup."""
+
+    if apply_known_location(proxy):
         return proxy
 
     # 3. Use the local GeoIP database if available.
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import AsyncIterator, Set
 
 import httpx
 
@@ -18,7 +19,15 @@ else:  # pragma: no cover
     HTTP2_AVAILABLE = True
 
 DEFAULT_TIMEOUT = httpx.Timeout(20.0, connect=10.0, read=15.0)
-POOL_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=100, max_connections=200, keepalive_expiry=30.0
+)
+SHARED_CLIENT_RETRIES = 3
+
+_shared_client: httpx.AsyncClient | None = None
+_shared_client_loop: asyncio.AbstractEventLoop | None = None
+# Close tasks of clients retired by a loop change, kept referenced until done
+_retiring: Set[asyncio.Task[None]] = set()
 
 
 class CachedDNS_AsyncHTTPTransport(httpx.AsyncHTTPTransport):
@@ -38,13 +47,7 @@ class CachedDNS_AsyncHTTPTransport(httpx.AsyncHTTPTransport):
         return await super().handle_async_request(request)
 
 
-@asynccontextmanager
-async def get_client(retries: int = 0) -> AsyncIterator[httpx.AsyncClient]:
-    """Yield a configured AsyncClient with sane defaults.
-
-    The client enables HTTP/2, follows redirects, and sets a deterministic
-    user agent so providers can more easily identify ConfigStream traffic.
-    """
+def _build_client(retries: int) -> httpx.AsyncClient:
     app_settings = AppSettings()
     transport: httpx.AsyncHTTPTransport
     if app_settings.DNS_CACHE_ENABLED:
@@ -52,7 +55,7 @@ async def get_client(retries: int = 0) -> AsyncIterator[httpx.AsyncClient]:
     else:
         transport = httpx.AsyncHTTPTransport(retries=retries)
 
-    async with httpx.AsyncClient(
+    return httpx.AsyncClient(
         http2=HTTP2_AVAILABLE,
         timeout=DEFAULT_TIMEOUT,
         limits=POOL_LIMITS,
@@ -62,5 +65,57 @@ async def get_client(retries: int = 0) -> AsyncIterator[httpx.AsyncClient]:
         },
         follow_redirects=True,
         transport=transport,
-    ) as client:
+    )
+
+
+@asynccontextmanager
+async def get_client(retries: int = 0) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield a configured AsyncClient with sane defaults.
+
+    The client enables HTTP/2, follows redirects, and sets a deterministic
+    user agent so providers can more easily identify ConfigStream traffic.
+    """
+    async with _build_client(retries) as client:
         yield client
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the process-wide client, creating it on first use.
+
+    Reusing one client keeps TLS sessions and HTTP/2 connections alive across
+    every request a pipeline run makes. Connections are bound to the event
+    loop that opened them, so a new client is built when the running loop
+    changes, and the previous one is closed rather than leaked. Callers must
+    not close it; use :func:`close_shared_client`.
+    """
+    global _shared_client, _shared_client_loop
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client.is_closed or _shared_client_loop is not loop:
+        if _shared_client is not None and not _shared_client.is_closed:
+            _retire_client(_shared_client, _shared_client_loop, loop)
+        _shared_client = _build_client(SHARED_CLIENT_RETRIES)
+        _shared_client_loop = loop
+    return _shared_client
+
+
+def _retire_client(
+    client: httpx.AsyncClient,
+    client_loop: asyncio.AbstractEventLoop | None,
+    loop: asyncio.AbstractEventLoop,
+) -> None:
+    """Close a shared client built on another event loop."""
+    if client_loop is not None and client_loop.is_running():
+        # That loop still runs in another thread, which owns the connections
+        asyncio.run_coroutine_threadsafe(client.aclose(), client_loop)
+        return
+    task = loop.create_task(client.aclose())
+    _retiring.add(task)
+    task.add_done_callback(_retiring.discard)
+
+
+async def close_shared_client() -> None:
+    """Close the shared client, if one is open; the next call reopens it."""
+    global _shared_client, _shared_client_loop
+    client, _shared_client, _shared_client_loop = _shared_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
@@ -1,16 +1,76 @@
 import base64
 import json
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, repeat
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
 try:
     import yaml
 except ImportError:
     yaml = None  # type: ignore[assignment]
 
+try:  # pragma: no cover - optional speed-up
+    import orjson
+except Exception:  # pragma: no cover - fallback to stdlib
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional SIMD speed-up
+    import pybase64 as _base64
+except Exception:  # pragma: no cover - fallback to stdlib
+    _base64 = base64  # type: ignore[no-redef]
+
+from .constants import VALID_PROTOCOLS
 from .models import Proxy
 from .selection import select_chosen_proxies, get_selection_stats
 
+# Prefer the libyaml C emitter (10-20x faster); output is byte-identical to the
+# pure-Python emitter, so fall back silently when PyYAML was built without it
+_YAML_DUMPER: Any = getattr(yaml, "CSafeDumper", None) or getattr(yaml, "SafeDumper", None)
+
+# Fetch every field a client-config builder needs in one C-level call instead
+# of a separate attribute load per field
+_CLIENT_FIELDS = attrgetter("protocol", "address", "port", "uuid", "remarks", "details")
+_SUBSCRIPTION_FIELDS = attrgetter("protocol", "address", "remarks", "config")
+
+# Case-folded protocol names, keyed by the protocol string as parsed. Builders
+# run per proxy, so this turns a fresh str allocation into a dict lookup.
+_PROTOCOL_LOWER: Dict[str, str] = {name: name.lower() for name in VALID_PROTOCOLS}
+_PROTOCOL_UPPER: Dict[str, str] = {name: name.upper() for name in VALID_PROTOCOLS}
+
+
+def _protocol_lower(protocol: str) -> str:
+    cached = _PROTOCOL_LOWER.get(protocol)
+    if cached is None:
+        cached = _PROTOCOL_LOWER[protocol] = protocol.lower()
+    return cached
+
+
+def _protocol_upper(protocol: str) -> str:
+    cached = _PROTOCOL_UPPER.get(protocol)
+    if cached is None:
+        cached = _PROTOCOL_UPPER[protocol] = protocol.upper()
+    return cached
+
+
+# Per-thread scratch buffer for assembling subscription bodies as bytes
+_BUFFER_LOCAL = threading.local()
+
+
+def _subscription_buffer() -> bytearray:
+    """Return this thread's reusable scratch buffer, emptied for a new payload."""
+    buffer: bytearray | None = getattr(_BUFFER_LOCAL, "buffer", None)
+    if buffer is None:
+        buffer = bytearray()
+        _BUFFER_LOCAL.buffer = buffer
+    buffer.clear()
+    return buffer
+
 
 def get_country_flag(country_code: str) -> str:
     """Convert country code to flag emoji."""
@@ -30,7 +90,7 @@ def format_proxy_names_with_rank(proxies: List[Proxy]) -> None:
     # Group proxies by protocol and sort by latency within each group
     protocol_groups: Dict[str, List[Proxy]] = {}
     for proxy in proxies:
-        protocol = proxy.protocol.upper()
+        protocol = _protocol_upper(proxy.protocol)
         if protocol not in protocol_groups:
             protocol_groups[protocol] = []
         protocol_groups[protocol].append(proxy)
@@ -75,7 +135,147 @@ def generate_base64_subscription(proxies: List[Proxy]) -> str:
     return "\n".join(configs)
 
 
-def generate_categorized_outputs(all_proxies: List[Proxy], output_dir: Path) -> Dict[str, str]:
+def generate_base64_subscription_bytes(proxies: List[Proxy]) -> bytes:
+    """Same payload as :func:`generate_base64_subscription`, as UTF-8 bytes.
+
+    Use this when the result goes straight to a file or socket, so the body
+    is encoded once rather than built as str and re-encoded by the caller.
+    """
+    return b"\n".join(p.config.encode("utf-8") for p in proxies if p.is_working)
+
+
+# Flags for raw file writes; O_BINARY only exists (and matters) on Windows
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+_MMAP_FLAGS = os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+# Below ~1 MB the mapping setup and page faults cost more than a plain write
+MMAP_WRITE_THRESHOLD = 1 << 20
+
+
+def _json_bytes(data: Any, indent: bool = True) -> bytes:
+    """Serialize ``data`` as JSON straight to UTF-8 bytes.
+
+    orjson produces bytes directly, so no intermediate JSON str the size of
+    the whole document is ever materialized. ``indent=False`` emits compact
+    JSON for files that are only consumed by machines.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        result: bytes = orjson.dumps(data, option=option)
+        return result
+    if indent:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _write_bytes_mmap(path: Path, payload: bytes) -> None:
+    """Write a large ``payload`` through a pre-sized shared memory mapping.
+
+    Copying into the mapping lets the kernel write pages back on its own
+    schedule and skips the extra user-to-kernel buffer copy of ``write()``.
+    """
+    fd = os.open(path, _MMAP_FLAGS, 0o666)
+    try:
+        os.ftruncate(fd, len(payload))
+        with mmap.mmap(fd, len(payload)) as mapping:
+            mapping[:] = payload
+    finally:
+        os.close(fd)
+
+
+def write_output_bytes(path: Path, payload: bytes) -> None:
+    """Write ``payload`` to ``path`` with only open/write/close syscalls.
+
+    ``Path.write_bytes`` goes through the buffered io stack, which adds
+    fstat/ioctl/lseek calls per file; for many tiny files those dominate.
+    Shards larger than ``MMAP_WRITE_THRESHOLD`` are written via mmap instead.
+    """
+    if len(payload) > MMAP_WRITE_THRESHOLD:
+        _write_bytes_mmap(path, payload)
+        return
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(payload)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def write_output_lines(path: Path, lines: Iterable[str]) -> None:
+    """Write ``lines`` to ``path`` with a newline between each, and none at the end.
+
+    Lines are encoded and handed to the buffered writer one at a time, so the
+    joined text and its encoded copy are never held in memory.
+    """
+    encoded = (line.encode("utf-8") for line in lines)
+    with open(path, "wb") as handle:
+        first = next(encoded, None)
+        if first is not None:
+            handle.write(first)
+            handle.writelines(chain.from_iterable(zip(repeat(b"\n"), encoded)))
+
+
+@lru_cache(maxsize=128)
+def _ensure_dir(directory: str) -> None:
+    """Create ``directory`` once per process; later calls are a cache hit."""
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+
+def _write_pending(path: Path, payload: bytes) -> None:
+    try:
+        write_output_bytes(path, payload)
+    except FileNotFoundError:
+        # The directory was removed after _ensure_dir cached it as created
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_output_bytes(path, payload)
+
+
+def _write_files_parallel(pending: Dict[Path, bytes]) -> None:
+    """Write independent ``path -> payload`` entries concurrently.
+
+    Each write releases the GIL inside the underlying ``write()`` call, so
+    overlapping them in a small thread pool hides per-file syscall latency.
+    Keying by path guarantees no two threads ever write the same file.
+    Parent directories are created lazily, only for files that are actually
+    emitted, and only once per process.
+    """
+    tasks: List[Tuple[Path, bytes]] = list(pending.items())
+    if not tasks:
+        return
+    for directory in {str(path.parent) for path, _ in tasks}:
+        _ensure_dir(directory)
+    if len(tasks) == 1:
+        _write_pending(*tasks[0])
+        return
+    with ThreadPoolExecutor(max_workers=min(32, len(tasks))) as executor:
+        # Consume the iterator so any write error is re-raised here
+        list(executor.map(lambda task: _write_pending(*task), tasks))
+
+
+def proxy_to_dict(proxy: Proxy) -> Dict[str, Any]:
+    """Serialize a proxy to the record shape used by the JSON output files."""
+    return {
+        "config": proxy.config,
+        "protocol": proxy.protocol,
+        "address": proxy.address,
+        "port": proxy.port,
+        "latency": proxy.latency,
+        "country": proxy.country,
+        "country_code": proxy.country_code,
+        "city": proxy.city,
+        "remarks": proxy.remarks,
+        "is_working": proxy.is_working,
+        "security_issues": proxy.security_issues,
+        "tested_at": proxy.tested_at,
+    }
+
+
+def generate_categorized_outputs(
+    all_proxies: List[Proxy], output_dir: Path, pretty: bool = False
+) -> Dict[str, str]:
     """
     Generate categorized output files with smart organization:
     - Main outputs (by_protocol/, by_country/) contain ONLY passed proxies
@@ -83,95 +283,74 @@ def generate_categorized_outputs(all_proxies: List[Proxy], output_dir: Path) ->
     - No duplication - each proxy appears in only one place
     - No need to gitignore anything - all files are reasonably sized
 
+    Proxy lists are written as compact JSON unless ``pretty`` is set;
+    summary.json is always indented since it is meant to be read by people.
+
     Returns:
         Dictionary mapping category names to file paths
     """
     output_files: Dict[str, str] = {}
-
-    # Categorize proxies: passed vs rejected with reasons
-    passed = [p for p in all_proxies if p.is_working and not p.security_issues]
-    security_failed = [p for p in all_proxies if p.security_issues]
-    connectivity_failed = [p for p in all_proxies if not p.is_working and not p.security_issues]
-
-    # Helper function to serialize proxy to dict
-    def proxy_to_dict(proxy: Proxy) -> Dict[str, Any]:
-        return {
-            "config": proxy.config,
-            "protocol": proxy.protocol,
-            "address": proxy.address,
-            "port": proxy.port,
-            "latency": proxy.latency,
-            "country": proxy.country,
-            "country_code": proxy.country_code,
-            "city": proxy.city,
-            "remarks": proxy.remarks,
-            "is_working": proxy.is_working,
-            "security_issues": proxy.security_issues,
-            "tested_at": proxy.tested_at,
-        }
-
-    # Generate protocol-based breakdown (ONLY passed proxies)
-    protocol_dir = output_dir / "by_protocol"
-    protocol_dir.mkdir(parents=True, exist_ok=True)
-
+    # Serialized payloads are collected here and written together at the end;
+    # a later payload for the same path replaces the earlier one (last wins)
+    write_tasks: Dict[Path, bytes] = {}
+
+    def queue_json(path: Path, data: Any, indent: bool = pretty) -> None:
+        write_tasks[path] = _json_bytes(data, indent=indent)
+
+    # Project every proxy to its JSON record once, up front. A passed proxy
+    # lands in its protocol, country and chosen files (a rejected one in each
+    # of its categories plus the aggregate file), so the record is shared
+    # instead of re-reading the same attributes for every file.
+    records: Dict[int, Dict[str, Any]] = {id(p): proxy_to_dict(p) for p in all_proxies}
+
+    def records_for(proxies: List[Proxy]) -> List[Dict[str, Any]]:
+        return [records[id(p)] for p in proxies]
+
+    # Single classification pass: partition passed vs rejected and bucket
+    # each group at the same time instead of rescanning the list per category
+    passed: List[Proxy] = []
+    security_failed: List[Proxy] = []
+    connectivity_failed: List[Proxy] = []
     protocols: Dict[str, List[Proxy]] = {}
-    for proxy in passed:
-        protocol = proxy.protocol.lower()
-        if protocol not in protocols:
-            protocols[protocol] = []
-        protocols[protocol].append(proxy)
-
-    for protocol, proxies in protocols.items():
-        protocol_path = protocol_dir / f"{protocol}.json"
-        protocol_path.write_text(json.dumps([proxy_to_dict(p) for p in proxies], indent=2))
-        output_files[f"protocol_{protocol}"] = str(protocol_path)
-
-    # Generate country-based breakdown (ONLY passed proxies)
-    country_dir = output_dir / "by_country"
-    country_dir.mkdir(parents=True, exist_ok=True)
-
     countries: Dict[str, List[Proxy]] = {}
-    for proxy in passed:
-        country_code = proxy.country_code or "unknown"
-        if country_code not in countries:
-            countries[country_code] = []
-        countries[country_code].append(proxy)
-
-    for country_code, proxies in countries.items():
-        country_path = country_dir / f"{country_code.lower()}.json"
-        country_path.write_text(json.dumps([proxy_to_dict(p) for p in proxies], indent=2))
-        output_files[f"country_{country_code}"] = str(country_path)
-
-    # Save rejected proxies in rejected/ directory by failure reason
-    rejected_dir = output_dir / "rejected"
-    rejected_dir.mkdir(parents=True, exist_ok=True)
-
-    # Categorize security failures by specific issue type
     security_by_category: Dict[str, List[Proxy]] = {}
-    for proxy in security_failed:
-        if isinstance(proxy.security_issues, dict):
-            for category in proxy.security_issues.keys():
-                if category not in security_by_category:
-                    security_by_category[category] = []
-                security_by_category[category].append(proxy)
-
-    # Save each security category to its own file
-    for category, proxies_list in security_by_category.items():
-        category_path = rejected_dir / f"{category}.json"
-        category_path.write_text(json.dumps([proxy_to_dict(p) for p in proxies_list], indent=2))
-        output_files[f"rejected_{category}"] = str(category_path)
+    for proxy in all_proxies:
+        if proxy.security_issues:
+            security_failed.append(proxy)
+            # Categorize security failures by specific issue type
+            if isinstance(proxy.security_issues, dict):
+                for category in proxy.security_issues:
+                    security_by_category.setdefault(category, []).append(proxy)
+        elif proxy.is_working:
+            # Protocol and country breakdowns contain ONLY passed proxies
+            passed.append(proxy)
+            protocols.setdefault(_protocol_lower(proxy.protocol), []).append(proxy)
+            countries.setdefault(proxy.country_code or "unknown", []).append(proxy)
+        else:
+            connectivity_failed.append(proxy)
+
+    # One file per bucket: (output key prefix, directory, buckets, file-name transform)
+    rejected_dir = output_dir / "rejected"
+    layout: Tuple[Tuple[str, Path, Dict[str, List[Proxy]], Callable[[str], str]], ...] = (
+        ("protocol_", output_dir / "by_protocol", protocols, str),
+        ("country_", output_dir / "by_country", countries, str.lower),
+        ("rejected_", rejected_dir, security_by_category, str),
+    )
+    for key_prefix, directory, buckets, file_name in layout:
+        for bucket, members in buckets.items():
+            bucket_path = directory / f"{file_name(bucket)}.json"
+            queue_json(bucket_path, records_for(members))
+            output_files[f"{key_prefix}{bucket}"] = str(bucket_path)
 
     # Save general security issues file (all security failures)
     if security_failed:
         security_path = rejected_dir / "all_security_issues.json"
-        security_path.write_text(json.dumps([proxy_to_dict(p) for p in security_failed], indent=2))
+        queue_json(security_path, records_for(security_failed))
         output_files["rejected_security_all"] = str(security_path)
 
     if connectivity_failed:
         connectivity_path = rejected_dir / "no_response.json"
-        connectivity_path.write_text(
-            json.dumps([proxy_to_dict(p) for p in connectivity_failed], indent=2)
-        )
+        queue_json(connectivity_path, records_for(connectivity_failed))
         output_files["rejected_connectivity"] = str(connectivity_path)
 
     # Generate summary stats with detailed security categorization
@@ -195,7 +374,7 @@ def generate_categorized_outputs(all_proxies: List[Proxy], output_dir: Path) ->
     chosen_proxies = select_chosen_proxies(all_proxies)
     if chosen_proxies:
         chosen_path = output_dir / "chosen.json"
-        chosen_path.write_text(json.dumps([proxy_to_dict(p) for p in chosen_proxies], indent=2))
+        queue_json(chosen_path, records_for(chosen_proxies))
         output_files["chosen"] = str(chosen_path)
 
         # Add selection stats to summary
@@ -203,9 +382,11 @@ def generate_categorized_outputs(all_proxies: List[Proxy], output_dir: Path) ->
         summary["chosen_selection"] = selection_stats
 
     summary_path = output_dir / "summary.json"
-    summary_path.write_text(json.dumps(summary, indent=2))
+    queue_json(summary_path, summary, indent=True)
     output_files["summary"] = str(summary_path)
 
+    _write_files_parallel(write_tasks)
+
     return output_files
 
 
@@ -217,15 +398,16 @@ def generate_clash_config(proxies: List[Proxy]) -> str:
     working_proxies = [p for p in proxies if p.is_working]
     clash_proxies = []
     for proxy in working_proxies:
+        protocol, address, port, uuid, remarks, details = _CLIENT_FIELDS(proxy)
         proxy_data = {
-            "name": proxy.remarks or f"{proxy.protocol}-{proxy.address}",
-            "type": proxy.protocol,
-            "server": proxy.address,
-            "port": proxy.port,
-            "uuid": proxy.uuid,
+            "name": remarks or f"{protocol}-{address}",
+            "type": protocol,
+            "server": address,
+            "port": port,
+            "uuid": uuid,
         }
-        if proxy.details:
-            proxy_data.update(proxy.details)
+        if details:
+            proxy_data.update(details)
         clash_proxies.append(proxy_data)
 
     clash_yaml = yaml.dump(
@@ -238,7 +420,8 @@ def generate_clash_config(proxies: List[Proxy]) -> str:
                     "proxies": [p["name"] for p in clash_proxies],
                 }
             ],
-        }
+        },
+        Dumper=_YAML_DUMPER,
     )
     result: str = clash_yaml
     return result
@@ -246,52 +429,68 @@ def generate_clash_config(proxies: List[Proxy]) -> str:
 
 def generate_singbox_config(proxies: List[Proxy]) -> str:
     working_proxies = [p for p in proxies if p.is_working]
-    outbounds = []
+    # Preallocate and fill by index so large lists never regrow
+    outbounds: List[Any] = [None] * len(working_proxies)
     for index, proxy in enumerate(working_proxies, start=1):
+        protocol, address, port, uuid, remarks, details = _CLIENT_FIELDS(proxy)
         outbound = {
-            "type": proxy.protocol.lower(),
-            "tag": proxy.remarks or f"{proxy.protocol}-{index}",
-            "server": proxy.address,
-            "server_port": proxy.port,
+            "type": _protocol_lower(protocol),
+            "tag": remarks or f"{protocol}-{index}",
+            "server": address,
+            "server_port": port,
         }
-        if proxy.uuid:
-            outbound["uuid"] = proxy.uuid
-        if proxy.details:
-            outbound.update(proxy.details)
-        outbounds.append(outbound)
-    return json.dumps({"outbounds": outbounds}, indent=2)
+        if uuid:
+            outbound["uuid"] = uuid
+        if details:
+            outbound.update(details)
+        outbounds[index - 1] = outbound
+    return _json_bytes({"outbounds": outbounds}).decode("utf-8")
 
 
 def generate_shadowrocket_subscription(proxies: List[Proxy]) -> str:
+    return generate_shadowrocket_subscription_bytes(proxies).decode("ascii")
+
+
+def generate_shadowrocket_subscription_bytes(proxies: List[Proxy]) -> bytes:
+    """Base64 Shadowrocket subscription as bytes, skipping the str round-trip."""
     working = [p for p in proxies if p.is_working]
-    lines = []
+    # Append encoded lines straight into a reused buffer; this skips building
+    # one large joined str and then encoding it a second time
+    buffer = _subscription_buffer()
     for proxy in working:
-        name = proxy.remarks or f"{proxy.protocol}-{proxy.address}"
-        lines.append(f"{name} = {proxy.config}")  # use the raw config
-    return base64.b64encode("\n".join(lines).encode("utf-8")).decode("utf-8")
+        protocol, address, remarks, config = _SUBSCRIPTION_FIELDS(proxy)
+        name = remarks or f"{protocol}-{address}"
+        if buffer:
+            buffer += b"\n"
+        buffer += f"{name} = {config}".encode("utf-8")  # use the raw config
+    encoded: bytes = _base64.b64encode(buffer)
+    return encoded
+
+
+# Line templates are parsed once here rather than on every formatted proxy
+_QUANTUMULT_LINE = "%s = %s, %s, %s, password=%s"
+_SURGE_LINE = "%s = %s, %s, %s, username=%s, password=%s"
+
+
+def _format_quantumult_line(proxy: Proxy) -> str:
+    protocol, address, port, _uuid, remarks, details = _CLIENT_FIELDS(proxy)
+    name = remarks or f"{protocol}-{address}"
+    password = details.get("password", "") if details else ""
+    return _QUANTUMULT_LINE % (name, _protocol_lower(protocol), address, port, password)
 
 
 def generate_quantumult_config(proxies: List[Proxy]) -> str:
-    working_proxies = [p for p in proxies if p.is_working]
-    lines = ["[SERVER]"]
-    for proxy in working_proxies:
-        name = proxy.remarks or f"{proxy.protocol}-{proxy.address}"
-        lines.append(
-            f"{name} = {proxy.protocol.lower()}, {proxy.address}, {proxy.port}, "
-            f"password={proxy.details.get('password', '') if proxy.details else ''}"
-        )
-    return "\n".join(lines)
+    lines = (_format_quantumult_line(p) for p in proxies if p.is_working)
+    return "\n".join(chain(("[SERVER]",), lines))
+
+
+def _format_surge_line(proxy: Proxy) -> str:
+    protocol, address, port, uuid, remarks, details = _CLIENT_FIELDS(proxy)
+    name = remarks or f"{protocol}-{address}"
+    password = details.get("password", "") if details else ""
+    return _SURGE_LINE % (name, _protocol_upper(protocol), address, port, uuid, password)
 
 
 def generate_surge_config(proxies: List[Proxy]) -> str:
-    working_proxies = [p for p in proxies if p.is_working]
-    lines = ["[Proxy]"]
-    for proxy in working_proxies:
-        name = proxy.remarks or f"{proxy.protocol}-{proxy.address}"
-        password = proxy.details.get("password", "") if proxy.details else ""
-        surge_line = (
-            f"{name} = {proxy.protocol.upper()}, {proxy.address}, "
-            f"{proxy.port}, username={proxy.uuid}, password={password}"
-        )
-        lines.append(surge_line)
-    return "\n".join(lines)
+    lines = (_format_surge_line(p) for p in proxies if p.is_working)
+    return "\n".join(chain(("[Proxy]",), lines))
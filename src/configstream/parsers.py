@@ -2,8 +2,16 @@ import base64
 import binascii
 import json
 import logging
-from typing import Optional, List
-from urllib.parse import parse_qs, unquote, urlparse
+import re
+import sys
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Mapping, Optional, List, Tuple, Type
+from urllib.parse import ParseResult, parse_qs, unquote, unquote_plus, urlparse
+
+try:  # pragma: no cover - optional speed-up
+    import orjson
+except Exception:  # pragma: no cover - fallback to stdlib
+    orjson = None  # type: ignore[assignment]
 
 from .models import Proxy
 
@@ -17,15 +25,54 @@ from .constants import (
 
 logger = logging.getLogger(__name__)
 
-VALID_B64_CHARS = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=\n\r \t")
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep
+# catching the stdlib exception with either implementation.
+_json_loads = orjson.loads if orjson is not None else json.loads
 
+VALID_B64_CHARS = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=\n\r \t"
+)
 
-def _validate_b64_input(data: str) -> Optional[str]:
-    """Validate base64 string before attempting decode."""
+# Byte-level tables for bytes.translate, which strips/validates in one C loop:
+# deleting every valid byte leaves exactly the invalid ones behind.
+_B64_WHITESPACE = b" \n\r\t"
+_B64_VALID_BYTES = "".join(sorted(VALID_B64_CHARS)).encode("ascii")
+_B64_ALPHABET_BYTES = _B64_VALID_BYTES.translate(None, _B64_WHITESPACE)
+# Inputs shorter than this that are already clean skip the full validator
+_B64_FAST_PATH_MAX = 4096
+_B64_INVALID_SAMPLE = 64
+_B64_WHITESPACE_SLACK = 1024
+_B64_PADDING_TAILS = (b"=", b"==")
+
+# Sources overlap heavily, so the same config string is usually parsed many
+# times per run. Results are immutable and cached; larger inputs bypass the
+# caches so a single hostile payload cannot pin megabytes of memory.
+_CACHE_MAX_INPUT = 4096
+
+
+# Protocol, cipher and obfs names repeat across nearly every proxy of a run
+_INTERN_MAX_LENGTH = 32
+
+
+def _intern(value: Any) -> Any:
+    """Return the shared copy of a short token string; other values pass through."""
+    if type(value) is str and len(value) <= _INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _clean_b64_bytes(data: str) -> Optional[bytes]:
+    """Validate base64 text and return it as whitespace-free, padded bytes."""
     if not isinstance(data, str):
         logger.warning(f"Expected string, got {type(data).__name__}")
         return None
 
+    # Reject clearly oversized input before strip() copies it; the slack
+    # leaves room for surrounding whitespace, the exact check follows below.
+    if len(data) > MAX_B64_INPUT_SIZE + _B64_WHITESPACE_SLACK:
+        logger.error(f"Base64 input too large: {len(data)} bytes (max: {MAX_B64_INPUT_SIZE})")
+        return None
+
     trimmed = data.strip()
     if not trimmed:
         logger.debug("Empty base64 input")
@@ -35,27 +82,59 @@ def _validate_b64_input(data: str) -> Optional[str]:
         logger.error(f"Base64 input too large: {len(trimmed)} bytes (max: {MAX_B64_INPUT_SIZE})")
         return None
 
-    invalid_chars = set(trimmed) - VALID_B64_CHARS
-    if invalid_chars:
-        logger.warning(f"Invalid base64 characters: {invalid_chars}")
+    # Non-ASCII characters become "?", which is never valid base64
+    encoded = trimmed.encode("ascii", "replace")
+    invalid = encoded.translate(None, _B64_VALID_BYTES)
+    if invalid:
+        # Only a bounded sample is reported; invalid may be most of a huge input
+        sample = set(invalid[:_B64_INVALID_SAMPLE].decode("ascii"))
+        logger.warning(f"Invalid base64 characters: {sample}")
         return None
 
-    cleaned = "".join(c for c in trimmed if c not in " \n\r\t")
+    cleaned = encoded.translate(None, _B64_WHITESPACE)
     padding_needed = (4 - len(cleaned) % 4) % 4
     if padding_needed > 0:
-        cleaned += "=" * padding_needed
+        cleaned += b"=" * padding_needed
 
     return cleaned
 
 
+def _validate_b64_input(data: str) -> Optional[str]:
+    """Validate base64 string before attempting decode."""
+    cleaned = _clean_b64_bytes(data)
+    if cleaned is None:
+        return None
+    return cleaned.decode("ascii")
+
+
 def _safe_b64_decode(data: str) -> str:
     """Safely decode base64 with comprehensive validation."""
-    validated = _validate_b64_input(data)
+    if isinstance(data, str) and len(data) <= _CACHE_MAX_INPUT:
+        return _safe_b64_decode_cached(data)
+    return _safe_b64_decode_uncached(data)
+
+
+def _safe_b64_decode_uncached(data: str) -> str:
+    validated: Optional[bytes] = None
+    if isinstance(data, str) and 0 < len(data) < _B64_FAST_PATH_MAX and data.isascii():
+        # Fast path: short, ASCII, no whitespace and only alphabet bytes.
+        # This is the common case for SS/SSR user info and needs no cleanup.
+        raw = data.encode("ascii")
+        if not raw.translate(None, _B64_ALPHABET_BYTES):
+            validated = raw + b"=" * (-len(raw) % 4)
+    if validated is None:
+        validated = _clean_b64_bytes(data)
     if validated is None:
         return data
 
+    # The alphabet was already checked with bytes.translate, so the decoder's
+    # own validation pass is only needed to reject misplaced "=" padding,
+    # which the lenient decoder would silently accept.
+    pad_start = validated.find(b"=")
+    strict = pad_start != -1 and validated[pad_start:] not in _B64_PADDING_TAILS
+
     try:
-        decoded_bytes = base64.b64decode(validated, validate=True)
+        decoded_bytes = base64.b64decode(validated, validate=strict)
 
         if len(decoded_bytes) > MAX_B64_OUTPUT_SIZE:
             logger.error(
@@ -79,6 +158,63 @@ def _safe_b64_decode(data: str) -> str:
         return data
 
 
+_safe_b64_decode_cached = lru_cache(maxsize=8192)(_safe_b64_decode_uncached)
+
+
+@lru_cache(maxsize=8192)
+def _urlparse_cached(url: str) -> ParseResult:
+    return urlparse(url)
+
+
+def _urlparse(url: str) -> ParseResult:
+    """``urlparse`` memoized for config-sized inputs."""
+    if len(url) <= _CACHE_MAX_INPUT:
+        return _urlparse_cached(url)
+    return urlparse(url)
+
+
+def cache_info() -> Dict[str, Any]:
+    """Return hit/miss statistics for the parser caches."""
+    return {
+        "b64_decode": _safe_b64_decode_cached.cache_info(),
+        "urlparse": _urlparse_cached.cache_info(),
+    }
+
+
+def cache_clear() -> None:
+    """Clear the parser caches."""
+    _safe_b64_decode_cached.cache_clear()
+    _urlparse_cached.cache_clear()
+
+
+# Anchored "<protocol>://" prefix, longest names first so the alternation
+# never stops at a shorter protocol ("ss" vs "ssr")
+_PROTOCOL_ALTERNATION = "(?:%s)://" % "|".join(
+    re.escape(name)
+    for name in sorted(
+        {p[:-3] if p.endswith("://") else p for p in VALID_PROTOCOLS}, key=len, reverse=True
+    )
+)
+
+# Line boundaries recognised by str.splitlines()
+_LINE_BREAK_CHARS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+# A whole line that, once stripped, starts with a known protocol prefix.
+# Leading whitespace is consumed by the pattern; trailing whitespace is
+# removed by the caller.
+_CONFIG_LINE_RE = re.compile(
+    f"(?:^|(?<=[{_LINE_BREAK_CHARS}]))[^\\S{_LINE_BREAK_CHARS}]*"
+    f"({_PROTOCOL_ALTERNATION}[^{_LINE_BREAK_CHARS}]*)"
+)
+
+
+_PLAUSIBLE_EXTRA_CHARS = ":-_./@#%?&="
+_PLAUSIBLE_SAMPLE_SIZE = 128
+# ASCII bytes that do not count as special characters in a config body
+_PLAUSIBLE_ALLOWED_BYTES = bytes(
+    i for i in range(128) if chr(i).isalnum() or chr(i) in _PLAUSIBLE_EXTRA_CHARS
+)
+
+
 def _is_plausible_proxy_config(config: str) -> bool:
     """Basic plausibility check for proxy configuration."""
     if "://" not in config:
@@ -86,8 +222,17 @@ def _is_plausible_proxy_config(config: str) -> bool:
     protocol, rest = config.split("://", 1)
     if len(protocol) > 20 or len(rest) < 4:
         return False
-    special_char_count = sum(1 for c in rest if not c.isalnum() and c not in ":-_./@#%?&=")
-    if special_char_count > len(rest) * 0.5:
+    # The decision is made from a fixed-size prefix so the cost does not grow
+    # with the config; parsers validate the full body later.
+    sample = rest[:_PLAUSIBLE_SAMPLE_SIZE]
+    if sample.isascii():
+        # Deleting the allowed bytes leaves exactly the special characters
+        special_char_count = len(sample.encode("ascii").translate(None, _PLAUSIBLE_ALLOWED_BYTES))
+    else:
+        special_char_count = sum(
+            1 for c in sample if not c.isalnum() and c not in _PLAUSIBLE_EXTRA_CHARS
+        )
+    if special_char_count > len(sample) * 0.5:
         return False
     return True
 
@@ -97,39 +242,51 @@ def _extract_config_lines(payload: str, max_lines: int = MAX_LINES_PER_SOURCE) -
     if not isinstance(payload, str) or not payload.strip():
         return []
 
-    lines = payload.splitlines()
-    if len(lines) > max_lines:
-        logger.warning(f"Payload has {len(lines)} lines, truncating to {max_lines}")
-        lines = lines[:max_lines]
-
-    valid_prefixes = {p for p in VALID_PROTOCOLS if not p.endswith("://")}
-    valid_prefixes.update({p + "://" for p in VALID_PROTOCOLS})
+    # Counting break characters over-estimates the line count (CRLF counts
+    # twice), so the exact split is only paid for payloads near the limit.
+    if sum(payload.count(c) for c in _LINE_BREAK_CHARS) >= max_lines:
+        lines = payload.splitlines()
+        if len(lines) > max_lines:
+            logger.warning(f"Payload has {len(lines)} lines, truncating to {max_lines}")
+            payload = "\n".join(lines[:max_lines])
 
+    # Only lines starting with a protocol prefix are materialised; comments,
+    # blanks and junk are skipped inside the regex engine.
     configs = []
-    for line in lines:
-        candidate = line.strip()
-        if not candidate or candidate.startswith("#") or len(candidate) > MAX_CONFIG_LINE_LENGTH:
-            continue
-
-        protocol = candidate.split("://", 1)[0]
-        if protocol in valid_prefixes and _is_plausible_proxy_config(candidate):
+    for match in _CONFIG_LINE_RE.finditer(payload):
+        candidate = match.group(1).rstrip()
+        if len(candidate) <= MAX_CONFIG_LINE_LENGTH and _is_plausible_proxy_config(candidate):
             configs.append(candidate)
     return configs
 
 
-def _parse_vmess(config: str) -> Optional[Proxy]:
+_VMESS_PREFIX = "vmess://"
+_VMESS_PREFIX_LEN = len(_VMESS_PREFIX)
+_SSR_PREFIX = "ssr://"
+_SSR_PREFIX_LEN = len(_SSR_PREFIX)
+
+
+def _parse_vmess(
+    config: str,
+    *,
+    _json_loads: Callable[..., Any] = _json_loads,
+    _b64decode: Callable[..., bytes] = base64.b64decode,
+    _int: Type[int] = int,
+    _Proxy: Type[Proxy] = Proxy,
+) -> Optional[Proxy]:
     try:
-        if not config.startswith("vmess://"):
+        if not config.startswith(_VMESS_PREFIX):
             return None
-        data = config[len("vmess://") :]
+        data = config[_VMESS_PREFIX_LEN:]
         if len(data) > 10000:
             logger.warning(f"VMess config too long: {len(data)} bytes")
             return None
-        vmess_data = json.loads(base64.b64decode(data).decode("utf-8"))
+        # The JSON decoder accepts the decoded bytes directly, skipping a str copy
+        vmess_data = _json_loads(_b64decode(data))
 
-        if not all(k in vmess_data for k in ["add", "port", "id"]):
+        if "add" not in vmess_data or "port" not in vmess_data or "id" not in vmess_data:
             return None
-        port = int(vmess_data["port"])
+        port = _int(vmess_data["port"])
         if not (1 <= port <= 65535):
             return None
         address = vmess_data["add"]
@@ -139,7 +296,7 @@ def _parse_vmess(config: str) -> Optional[Proxy]:
         if not uuid or len(uuid) > 100:
             return None
 
-        return Proxy(
+        return _Proxy(
             config=config,
             protocol="vmess",
             address=address,
@@ -153,9 +310,16 @@ def _parse_vmess(config: str) -> Optional[Proxy]:
         return None
 
 
-def _parse_vless(config: str) -> Optional[Proxy]:
+def _parse_vless(
+    config: str,
+    *,
+    _urlparse: Callable[[str], ParseResult] = _urlparse,
+    _unquote: Callable[[str], str] = unquote,
+    _parse_qs: Callable[[str], Dict[str, List[str]]] = parse_qs,
+    _Proxy: Type[Proxy] = Proxy,
+) -> Optional[Proxy]:
     try:
-        parsed = urlparse(config)
+        parsed = _urlparse(config)
         if not parsed.hostname or len(parsed.hostname) > 255:
             return None
         port = parsed.port or 443
@@ -165,34 +329,40 @@ def _parse_vless(config: str) -> Optional[Proxy]:
         if not uuid or len(uuid) > 100:
             return None
 
-        return Proxy(
+        return _Proxy(
             config=config,
             protocol="vless",
             address=parsed.hostname,
             port=port,
             uuid=uuid,
-            remarks=unquote(parsed.fragment or "")[:200],
-            details={k: v[0] for k, v in parse_qs(parsed.query).items()},
+            remarks=_unquote(parsed.fragment or "")[:200],
+            details={k: v[0] for k, v in _parse_qs(parsed.query).items()},
         )
     except (ValueError, IndexError) as e:
         logger.debug(f"Failed to parse VLESS: {e}")
         return None
 
 
-def _parse_ss(config: str) -> Optional[Proxy]:
+def _parse_ss(
+    config: str,
+    *,
+    _safe_b64_decode: Callable[[str], str] = _safe_b64_decode,
+    _unquote: Callable[[str], str] = unquote,
+    _int: Type[int] = int,
+    _Proxy: Type[Proxy] = Proxy,
+) -> Optional[Proxy]:
     """Parse a Shadowsocks (ss://) URL."""
     try:
         if not config.startswith("ss://"):
             return None
 
         # Separate remark from the main part
-        parts = config[5:].split("#", 1)
-        main_part = parts[0]
-        remark = unquote(parts[1]) if len(parts) > 1 else ""
+        main_part, has_remark, raw_remark = config[5:].partition("#")
+        remark = _unquote(raw_remark) if has_remark else ""
 
         # The part before the @ is either plain text or base64 encoded
         if "@" in main_part:
-            user_info, host_info = main_part.split("@", 1)
+            user_info, _, host_info = main_part.partition("@")
             # Potentially base64 encoded user_info
             try:
                 decoded_user_info = _safe_b64_decode(user_info)
@@ -205,29 +375,29 @@ def _parse_ss(config: str) -> Optional[Proxy]:
             decoded_main = _safe_b64_decode(main_part)
             if "@" not in decoded_main:
                 return None
-            user_info, host_info = decoded_main.split("@", 1)
+            user_info, _, host_info = decoded_main.partition("@")
 
         # Parse user_info
         if ":" not in user_info:
             return None
-        method, password = user_info.split(":", 1)
+        method, _, password = user_info.partition(":")
 
         # Parse host_info
         if ":" not in host_info:
             return None
-        host, port_str = host_info.rsplit(":", 1)
+        host, _, port_str = host_info.rpartition(":")
 
-        port = int(port_str)
+        port = _int(port_str)
         if not (1 <= port <= 65535) or not host:
             return None
 
-        return Proxy(
+        return _Proxy(
             config=config,
             protocol="shadowsocks",
             address=host.strip("[]"),  # Handle IPv6
             port=port,
             remarks=remark,
-            details={"method": method, "password": password},
+            details={"method": _intern(method), "password": password},
         )
     except (ValueError, IndexError, binascii.Error) as e:
         logger.debug(f"Failed to parse Shadowsocks: {e}")
@@ -255,9 +425,16 @@ def _parse_ss2022(config: str) -> Optional[Proxy]:
         return None
 
 
-def _parse_trojan(config: str) -> Optional[Proxy]:
+def _parse_trojan(
+    config: str,
+    *,
+    _urlparse: Callable[[str], ParseResult] = _urlparse,
+    _unquote: Callable[[str], str] = unquote,
+    _parse_qs: Callable[[str], Dict[str, List[str]]] = parse_qs,
+    _Proxy: Type[Proxy] = Proxy,
+) -> Optional[Proxy]:
     try:
-        parsed = urlparse(config)
+        parsed = _urlparse(config)
         if not parsed.hostname or len(parsed.hostname) > 255:
             return None
         port = parsed.port or 443
@@ -266,14 +443,14 @@ def _parse_trojan(config: str) -> Optional[Proxy]:
         uuid = parsed.username or ""
         # Trojan passwords can be empty
 
-        return Proxy(
+        return _Proxy(
             config=config,
             protocol="trojan",
             address=parsed.hostname,
             port=port,
             uuid=uuid,
-            remarks=unquote(parsed.fragment or "")[:200],
-            details=parse_qs(parsed.query),
+            remarks=_unquote(parsed.fragment or "")[:200],
+            details=_parse_qs(parsed.query),
         )
     except (ValueError, IndexError) as e:
         logger.debug(f"Failed to parse Trojan: {e}")
@@ -288,10 +465,10 @@ def _b64_normalize(s: str) -> str:
 
 def _parse_ssr(config: str) -> Optional[Proxy]:
     try:
-        if not config.startswith("ssr://"):
+        if not config.startswith(_SSR_PREFIX):
             return None
 
-        payload = config[len("ssr://") :]
+        payload = config[_SSR_PREFIX_LEN:]
         if len(payload) > 4096:
             return None
 
@@ -351,9 +528,9 @@ def _parse_ssr(config: str) -> Optional[Proxy]:
             port=port,
             remarks=remarks,
             details={
-                "protocol": protocol,
-                "cipher": cipher,
-                "obfs": obfs,
+                "protocol": _intern(protocol),
+                "cipher": _intern(cipher),
+                "obfs": _intern(obfs),
                 "password": password,
                 "params": params_decoded,
             },
@@ -366,7 +543,7 @@ def _parse_ssr(config: str) -> Optional[Proxy]:
 def _parse_generic_url_scheme(config: str) -> Optional[Proxy]:
     """Parse generic URL-based schemes like http, socks."""
     try:
-        parsed = urlparse(config)
+        parsed = _urlparse(config)
         if not parsed.hostname:
             return None
 
@@ -384,7 +561,7 @@ def _parse_generic_url_scheme(config: str) -> Optional[Proxy]:
 
         return Proxy(
             config=config,
-            protocol=parsed.scheme,
+            protocol=_intern(parsed.scheme),
             address=parsed.hostname,
             port=port,
             uuid=parsed.username or "",
@@ -398,7 +575,7 @@ def _parse_generic_url_scheme(config: str) -> Optional[Proxy]:
 
 def _parse_naive(config: str) -> Optional[Proxy]:
     try:
-        parsed = urlparse(config.replace("naive+", ""))
+        parsed = _urlparse(config.replace("naive+", ""))
         if not parsed.hostname:
             return None
         if not parsed.username or not parsed.password:
@@ -422,7 +599,7 @@ def _parse_v2ray_json(config: str) -> Optional[Proxy]:
     if not stripped.startswith("{"):
         return None
     try:
-        data = json.loads(stripped)
+        data = _json_loads(stripped)
     except json.JSONDecodeError:
         return None
 
@@ -456,7 +633,7 @@ def _parse_v2ray_json(config: str) -> Optional[Proxy]:
         uuid = users[0].get("id", "")
 
     metadata = {
-        "protocol": protocol,
+        "protocol": _intern(protocol),
         "settings": settings,
     }
     remarks = outbound.get("tag", data.get("remark", ""))
@@ -472,32 +649,105 @@ def _parse_v2ray_json(config: str) -> Optional[Proxy]:
     )
 
 
+def _parse_query(query: str) -> Dict[str, str]:
+    """Decode a query string into single values in one pass.
+
+    Equivalent to ``{k: v[0] for k, v in parse_qs(query).items()}``: the
+    first value wins, blank values are dropped and ``+`` means space.
+    """
+    params: Dict[str, str] = {}
+    for pair in query.split("&"):
+        key, _, value = pair.partition("=")
+        if key and value:
+            params.setdefault(unquote_plus(key), unquote_plus(value))
+    return params
+
+
+# (hostname, port, username, query, fragment)
+_UrlParts = Tuple[str, Optional[int], str, str, str]
+
+
+def _split_proxy_url(config: str) -> _UrlParts:
+    """Split ``scheme://user@host:port/path?query#fragment`` into its parts.
+
+    Returns ``(hostname, port, username, query, fragment)`` with the same
+    semantics as the corresponding ``urlparse`` attributes (lowercased
+    hostname, ``ValueError`` for a malformed port). Plain ASCII URLs are
+    split with ``str.partition``; IPv6 literals, control characters and
+    anything unusual fall back to ``urlparse``.
+    """
+    scheme, sep, rest = config.partition("://")
+    if sep and scheme.isalnum() and config.isascii() and config.isprintable():
+        rest, _, fragment = rest.partition("#")
+        cut = len(rest)
+        for delimiter in "/?":
+            index = rest.find(delimiter, 0, cut)
+            if index != -1:
+                cut = index
+        netloc = rest[:cut]
+        if "[" not in netloc and "]" not in netloc:
+            _, _, query = rest[cut:].partition("?")
+            userinfo, has_userinfo, hostinfo = netloc.rpartition("@")
+            hostname, _, port_str = hostinfo.partition(":")
+            port: Optional[int] = None
+            if port_str:
+                if not port_str.isdigit():
+                    raise ValueError(f"Port could not be cast to integer value as {port_str!r}")
+                port = int(port_str)
+                if port > 65535:
+                    raise ValueError("Port out of range 0-65535")
+            username = userinfo.partition(":")[0] if has_userinfo else ""
+            return hostname.lower(), port, username, query, fragment
+
+    parsed = _urlparse(config)
+    return (
+        parsed.hostname or "",
+        parsed.port,
+        parsed.username or "",
+        parsed.query,
+        parsed.fragment,
+    )
+
+
 # Generic parser for URL-based schemes
-def _parse_url_scheme(config: str, protocol: str, default_port: int) -> Optional[Proxy]:
+def _parse_url_scheme(
+    config: str,
+    protocol: str,
+    default_port: int,
+    *,
+    _split_proxy_url: Callable[[str], _UrlParts] = _split_proxy_url,
+    _unquote: Callable[[str], str] = unquote,
+    _parse_query: Callable[[str], Dict[str, str]] = _parse_query,
+    _Proxy: Type[Proxy] = Proxy,
+) -> Optional[Proxy]:
     try:
-        parsed = urlparse(config)
-        if not parsed.hostname or len(parsed.hostname) > 255:
+        hostname, parsed_port, username, query, fragment = _split_proxy_url(config)
+        if not hostname or len(hostname) > 255:
             return None
-        port = parsed.port or default_port
+        port = parsed_port or default_port
         if not (1 <= port <= 65535):
             return None
 
-        return Proxy(
+        return _Proxy(
             config=config,
             protocol=protocol,
-            address=parsed.hostname,
+            address=hostname,
             port=port,
-            uuid=parsed.username or "",
-            remarks=unquote(parsed.fragment or "")[:200],
-            details=parse_qs(parsed.query),
+            uuid=username,
+            remarks=_unquote(fragment)[:200],
+            details=_parse_query(query),
         )
     except (ValueError, IndexError) as e:
         logger.debug(f"Failed to parse {protocol.upper()}: {e}")
         return None
 
 
-def _parse_hysteria(c: str) -> Optional[Proxy]:
-    return _parse_url_scheme(c, "hysteria", 443)
+# Schemes with no checks beyond the shared URL parser are bound directly,
+# so dispatch does not pay for an extra wrapper frame.
+_parse_hysteria = partial(_parse_url_scheme, protocol="hysteria", default_port=443)
+_parse_tuic = partial(_parse_url_scheme, protocol="tuic", default_port=443)
+_parse_snell = partial(_parse_url_scheme, protocol="snell", default_port=443)
+_parse_brook = partial(_parse_url_scheme, protocol="brook", default_port=9999)
 
 
 def _parse_hysteria2(c: str) -> Optional[Proxy]:
@@ -508,10 +758,6 @@ def _parse_hysteria2(c: str) -> Optional[Proxy]:
     return proxy
 
 
-def _parse_tuic(c: str) -> Optional[Proxy]:
-    return _parse_url_scheme(c, "tuic", 443)
-
-
 def _parse_wireguard(c: str) -> Optional[Proxy]:
     proxy = _parse_url_scheme(c, "wireguard", 51820)
     if not proxy:
@@ -534,16 +780,6 @@ def _parse_xray(c: str) -> Optional[Proxy]:
     return proxy
 
 
-def _parse_snell(c: str) -> Optional[Proxy]:
-    """Parse Snell proxy configuration."""
-    return _parse_url_scheme(c, "snell", 443)
-
-
-def _parse_brook(c: str) -> Optional[Proxy]:
-    """Parse Brook proxy configuration."""
-    return _parse_url_scheme(c, "brook", 9999)
-
-
 def _parse_juicity(c: str) -> Optional[Proxy]:
     """Parse Juicity proxy configuration."""
     proxy = _parse_url_scheme(c, "juicity", 443)
@@ -551,3 +787,59 @@ def _parse_juicity(c: str) -> Optional[Proxy]:
         logger.debug("Juicity config missing UUID.")
         return None
     return proxy
+
+
+ParserFunc = Callable[[str], Optional[Proxy]]
+
+
+def _build_parser_dispatch() -> Dict[str, ParserFunc]:
+    """Create a mapping from URL scheme to parser function."""
+    return {
+        "vmess": _parse_vmess,
+        "vless": _parse_vless,
+        "ss": _parse_ss,
+        "ss2022": _parse_ss2022,
+        "ssr": _parse_ssr,
+        "trojan": _parse_trojan,
+        "hysteria": _parse_hysteria,
+        "hy2": _parse_hysteria2,
+        "hysteria2": _parse_hysteria2,
+        "tuic": _parse_tuic,
+        "wg": _parse_wireguard,
+        "wireguard": _parse_wireguard,
+        "naive+https": _parse_naive,
+        "xray": _parse_xray,
+        "xtls": _parse_xray,
+        "snell": _parse_snell,
+        "brook": _parse_brook,
+        "juicity": _parse_juicity,
+        "ssh": _parse_generic_url_scheme,
+        "http": _parse_generic_url_scheme,
+        "https": _parse_generic_url_scheme,
+        "socks": _parse_generic_url_scheme,
+        "socks4": _parse_generic_url_scheme,
+        "socks5": _parse_generic_url_scheme,
+    }
+
+
+PARSER_DISPATCH = _build_parser_dispatch()
+
+
+def parse_any(config: str, dispatch: Mapping[str, ParserFunc] = PARSER_DISPATCH) -> Optional[Proxy]:
+    """Parse a stripped config string with the parser registered for its scheme.
+
+    The scheme is everything before the first ``://`` and is looked up in
+    ``dispatch`` in one step. JSON (V2Ray outbound) configs have no scheme
+    and are recognised by their leading brace.
+    """
+    scheme, sep, _ = config.partition("://")
+    if sep:
+        parser = dispatch.get(scheme)
+        if parser is not None:
+            return parser(config)
+
+    if config.startswith("{"):
+        return _parse_v2ray_json(config)
+
+    logger.debug(f"Unknown protocol in config: {config[:50]}...")
+    return None
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from contextlib import contextmanager
-from time import perf_counter
+from time import perf_counter_ns
 from typing import Dict, Iterator
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceSnapshot:
     """Captured metrics for a pipeline execution."""
 
@@ -30,27 +30,75 @@ class PerformanceSnapshot:
 
     def to_dict(self) -> Dict[str, float]:
         """Serialize snapshot to a dictionary."""
-        data = asdict(self)
-        data["proxies_per_second"] = self.proxies_per_second
-        return data
+        # Every field is a scalar, so a literal avoids asdict's recursive copy
+        return {
+            "total_seconds": self.total_seconds,
+            "fetch_seconds": self.fetch_seconds,
+            "parse_seconds": self.parse_seconds,
+            "test_seconds": self.test_seconds,
+            "geo_seconds": self.geo_seconds,
+            "filter_seconds": self.filter_seconds,
+            "output_seconds": self.output_seconds,
+            "proxies_tested": self.proxies_tested,
+            "proxies_working": self.proxies_working,
+            "sources_processed": self.sources_processed,
+            "proxies_per_second": self.proxies_per_second,
+        }
+
+
+# Phases reported in PerformanceSnapshot, mapped to their tracker slots
+_PHASE_SLOTS = {
+    "fetch": "_fetch_ns",
+    "parse": "_parse_ns",
+    "test": "_test_ns",
+    "geo": "_geo_ns",
+    "filter": "_filter_ns",
+    "output": "_output_ns",
+}
+_NS_PER_SECOND = 1e9
 
 
 class PerformanceTracker:
     """Utility to record phase timings for the pipeline."""
 
+    __slots__ = (
+        "_start_ns",
+        "_fetch_ns",
+        "_parse_ns",
+        "_test_ns",
+        "_geo_ns",
+        "_filter_ns",
+        "_output_ns",
+        "_other_ns",
+    )
+
     def __init__(self) -> None:
-        self._start_time = perf_counter()
-        self._phase_durations: Dict[str, float] = {}
+        self._start_ns = perf_counter_ns()
+        self._fetch_ns = 0
+        self._parse_ns = 0
+        self._test_ns = 0
+        self._geo_ns = 0
+        self._filter_ns = 0
+        self._output_ns = 0
+        # Phases outside the snapshot (e.g. "read_files") are still accumulated
+        self._other_ns: Dict[str, int] = {}
 
     @contextmanager
     def phase(self, name: str) -> Iterator[None]:
         """Context manager to record the duration of a named phase."""
-        phase_start = perf_counter()
+        phase_start = perf_counter_ns()
         try:
             yield
         finally:
-            elapsed = perf_counter() - phase_start
-            self._phase_durations[name] = self._phase_durations.get(name, 0.0) + elapsed
+            self.add_time(name, perf_counter_ns() - phase_start)
+
+    def add_time(self, name: str, elapsed_ns: int) -> None:
+        """Add a duration measured by the caller to a named phase."""
+        slot = _PHASE_SLOTS.get(name)
+        if slot is not None:
+            setattr(self, slot, getattr(self, slot) + elapsed_ns)
+        else:
+            self._other_ns[name] = self._other_ns.get(name, 0) + elapsed_ns
 
     def snapshot(
         self,
@@ -60,15 +108,15 @@ class PerformanceTracker:
         sources_processed: int = 0,
     ) -> PerformanceSnapshot:
         """Produce a snapshot of collected metrics."""
-        total_seconds = perf_counter() - self._start_time
+        total_seconds = (perf_counter_ns() - self._start_ns) / _NS_PER_SECOND
         return PerformanceSnapshot(
             total_seconds=total_seconds,
-            fetch_seconds=self._phase_durations.get("fetch", 0.0),
-            parse_seconds=self._phase_durations.get("parse", 0.0),
-            test_seconds=self._phase_durations.get("test", 0.0),
-            geo_seconds=self._phase_durations.get("geo", 0.0),
-            filter_seconds=self._phase_durations.get("filter", 0.0),
-            output_seconds=self._phase_durations.get("output", 0.0),
+            fetch_seconds=self._fetch_ns / _NS_PER_SECOND,
+            parse_seconds=self._parse_ns / _NS_PER_SECOND,
+            test_seconds=self._test_ns / _NS_PER_SECOND,
+            geo_seconds=self._geo_ns / _NS_PER_SECOND,
+            filter_seconds=self._filter_ns / _NS_PER_SECOND,
+            output_seconds=self._output_ns / _NS_PER_SECOND,
             proxies_tested=proxies_tested,
             proxies_working=proxies_working,
             sources_processed=sources_processed,
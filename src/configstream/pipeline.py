@@ -3,35 +3,57 @@ from __future__ import annotations
 import asyncio
 import base64
 import binascii
-import json
+import copy
+import ipaddress
 import os
 import random
+import re
+import time
 import logging
+import mmap
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from dataclasses import replace
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from collections import deque
 from urllib.parse import urlparse
 
 import httpx
 import geoip2.database
 
-from .http_client import get_client
+try:  # pragma: no cover - optional SIMD speed-up
+    import pybase64 as _base64
+except Exception:  # pragma: no cover - fallback to stdlib
+    _base64 = base64  # type: ignore[no-redef]
+
+try:  # pragma: no cover - optional vectorised shuffle
+    import numpy as _np
+except Exception:  # pragma: no cover - fallback to random.shuffle
+    _np = None
+
+from .http_client import get_shared_client
 from rich.progress import Progress
 
 from .models import Proxy
-from .core import geolocate_proxy, parse_config
+from . import core
+from .core import apply_known_location, geolocate_proxy
 from .parsers import _extract_config_lines
 from .output import (
-    generate_base64_subscription,
+    generate_base64_subscription_bytes,
     generate_clash_config,
     generate_singbox_config,
-    generate_shadowrocket_subscription,
+    generate_shadowrocket_subscription_bytes,
     generate_quantumult_config,
     generate_surge_config,
     generate_categorized_outputs,
+    proxy_to_dict,
+    _json_bytes,
     format_proxy_names_with_rank,
+    write_output_bytes,
+    write_output_lines,
 )
 from .testers import SingBoxTester
 from .performance import PerformanceTracker
@@ -46,6 +68,7 @@ from .geoip import download_geoip_dbs
 from .constants import (
     FETCH_TIMEOUT as FETCH_TIMEOUT_SECONDS,
     MAX_SOURCE_URL_LENGTH,
+    POOL_START_METHOD,
 )
 
 logger = logging.getLogger(__name__)
@@ -56,6 +79,45 @@ PipelineResult = Dict[str, Any]
 CHUNK_SIZE = 15_000  # Increased from 10k for better throughput
 MAX_PIPELINE_PHASES = 40  # Increased from 30 for larger source lists
 FETCH_CONCURRENCY = 20  # Optimized concurrent fetching
+NUMPY_SHUFFLE_MIN_SIZE = 10_000  # Below this, random.shuffle beats the numpy round trip
+GEO_CONCURRENCY = 8  # Concurrent geolocation workers per phase
+GEOIP_CITY_DB_PATH = Path("data/GeoLite2-City.mmdb")
+PARSE_POOL_MIN_BATCH = 2_000  # Below this, pickling to worker processes costs more than parsing
+
+
+# Neighbouring addresses almost always share a location, so geolocation
+# results are cached per network rather than per address
+_GEO_CACHE_PREFIXLEN = {4: 24, 6: 48}
+
+
+@lru_cache(maxsize=65536)
+def _geo_cache_key(address: str) -> str:
+    """Return the /24 (IPv4) or /48 (IPv6) network of ``address``, or the hostname."""
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return address
+    network = ipaddress.ip_network((ip, _GEO_CACHE_PREFIXLEN[ip.version]), strict=False)
+    return str(network)
+
+
+def _warm_page_cache(path: Path) -> None:
+    """
+    Fault ``path`` into the page cache ahead of random-access lookups.
+
+    The GeoIP reader memory-maps its database, so every cold page costs a
+    major fault on the first lookup that lands on it. Reading one byte per
+    page up front turns those into page-cache hits for the rest of the run.
+    """
+    try:
+        with open(path, "rb") as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if hasattr(mmap, "MADV_WILLNEED"):
+                    view.madvise(mmap.MADV_WILLNEED)
+                # The strided slice copies one byte from, and so touches, every page
+                view[:: mmap.PAGESIZE]
+    except (OSError, ValueError) as exc:
+        logger.debug("Could not preload %s: %s", path, exc)
 
 
 class SourceValidationError(ValueError):
@@ -94,24 +156,21 @@ def _normalise_source_url(source_url: str) -> str:
 
 def _prepare_sources(raw_sources: Sequence[str]) -> List[str]:
     """Normalise source URLs and file paths, and remove duplicates."""
-    validated: List[str] = []
-    seen: set[str] = set()
 
-    for candidate in raw_sources:
-        try:
-            normalised = _normalise_source_url(candidate)
-        except SourceValidationError as exc:
-            logger.warning("Skipping invalid source %r: %s", candidate, exc)
-            continue
+    def _normalised() -> Iterator[str]:
+        for candidate in raw_sources:
+            try:
+                yield _normalise_source_url(candidate)
+            except SourceValidationError as exc:
+                logger.warning("Skipping invalid source %r: %s", candidate, exc)
 
-        if normalised in seen:
-            logger.debug("Skipping duplicate source %s", normalised)
-            continue
+    # dict.fromkeys de-duplicates in C while keeping first-seen order
+    return list(dict.fromkeys(_normalised()))
 
-        seen.add(normalised)
-        validated.append(normalised)
 
-    return validated
+# Strict base64 (as decoded below) never contains anything outside this set
+_B64_HEAD_PATTERN = re.compile(r"[A-Za-z0-9+/=]*")
+_B64_HEAD_LENGTH = 64
 
 
 def _maybe_decode_base64(payload: str) -> str:
@@ -121,9 +180,13 @@ def _maybe_decode_base64(payload: str) -> str:
         return ""
     if len(stripped) % 4 != 0:
         return payload
+    # Plain-text subscriptions ("vmess://...", one per line) give themselves
+    # away within the first few characters; skip the full decode attempt.
+    if not _B64_HEAD_PATTERN.fullmatch(stripped, 0, _B64_HEAD_LENGTH):
+        return payload
 
     try:
-        decoded_bytes = base64.b64decode(stripped, validate=True)
+        decoded_bytes: bytes = _base64.b64decode(stripped, validate=True)
         decoded_text = decoded_bytes.decode("utf-8")
     except (binascii.Error, UnicodeDecodeError):
         return payload
@@ -136,16 +199,40 @@ def _maybe_decode_base64(payload: str) -> str:
 
 
 # ==== BEGIN: de-dup + seeded shuffle helpers ====
-def _proxy_key(p: Any) -> Tuple[str, str, int, str, str]:
+def _proxy_key(p: Any) -> int:
     """
     Build a stable identity for a proxy. Adjust fields if your Proxy model differs.
+
+    Only the hash of the identity tuple is kept, so the key sets hold one small
+    int per proxy instead of a tuple of strings. Keys are process-local, and are
+    memoized on ``Proxy`` instances (and carried over by ``copy.copy``).
     """
+    key: Optional[int] = getattr(p, "_dedup_key", None)
+    if key is not None:
+        return key
     proto = (getattr(p, "protocol", "") or "").lower()
     addr = getattr(p, "address", "") or ""
     port = int(getattr(p, "port", 0) or 0)
     uuid = getattr(p, "uuid", "") or ""
     config = (getattr(p, "config", "") or "").strip()
-    return (proto, addr, port, uuid, config)
+    key = hash((proto, addr, port, uuid, config))
+    if isinstance(p, Proxy):
+        p._dedup_key = key
+    return key
+
+
+def _sort_by_latency(proxies: List[Proxy]) -> List[Proxy]:
+    """
+    Order proxies fastest first, with untimed (zero or missing latency) ones last.
+
+    Same order as ``sorted(proxies, key=lambda p: p.latency or inf)``, but the
+    timed proxies are sorted with a C-level ``attrgetter`` instead of calling a
+    Python lambda per element.
+    """
+    timed = [p for p in proxies if p.latency]
+    timed.sort(key=attrgetter("latency"))
+    timed.extend(p for p in proxies if not p.latency)
+    return timed
 
 
 def dedupe_and_shuffle(proxies: List[Proxy]) -> List[Proxy]:
@@ -154,7 +241,7 @@ def dedupe_and_shuffle(proxies: List[Proxy]) -> List[Proxy]:
     Shuffling is deterministic on push/PR events (if CONFIGSTREAM_SHUFFLE_SEED is set)
     for reproducibility, and random on scheduled or manual runs to ensure variety.
     """
-    seen = set()
+    seen: set[int] = set()
     unique: List[Proxy] = []
     for p in proxies:
         k = _proxy_key(p)
@@ -187,6 +274,10 @@ def dedupe_and_shuffle(proxies: List[Proxy]) -> List[Proxy]:
             rng_seed = seed_env
 
     rng = random.Random(rng_seed)
+    if _np is not None and len(unique) >= NUMPY_SHUFFLE_MIN_SIZE:
+        # Seeding numpy from ``rng`` keeps int, str and absent seeds deterministic
+        order = _np.random.default_rng(rng.getrandbits(64)).permutation(len(unique))
+        return list(map(unique.__getitem__, order.tolist()))
     rng.shuffle(unique)
     return unique
 
@@ -194,12 +285,45 @@ def dedupe_and_shuffle(proxies: List[Proxy]) -> List[Proxy]:
 # ==== END: de-dup + seeded shuffle helpers ====
 
 
+async def _parse_in_pool(
+    pool: ProcessPoolExecutor,
+    raw_configs: List[str],
+    on_slice_done: Optional[Callable[[int], None]] = None,
+) -> List[Optional[Proxy]]:
+    """
+    Parse ``raw_configs`` across ``pool`` in one slice per worker.
+
+    Slices rather than single configs keep pickling overhead to one round trip
+    per worker. The result holds one entry per raw config, in input order,
+    with ``None`` where parsing failed. ``on_slice_done`` receives each slice's
+    size as soon as that slice completes, whatever order workers finish in.
+    """
+    loop = asyncio.get_running_loop()
+    workers = os.cpu_count() or 1
+    slice_size = -(-len(raw_configs) // workers)
+
+    async def _parse_slice(config_slice: List[str]) -> List[Optional[Proxy]]:
+        # Looked up on the module so the pickled reference matches a reloaded core
+        parsed = await loop.run_in_executor(pool, core.parse_config_list, config_slice)
+        if on_slice_done is not None:
+            on_slice_done(len(config_slice))
+        return parsed
+
+    # gather keeps submission order, so slices are joined back in input order
+    parsed_slices = await asyncio.gather(
+        *(
+            _parse_slice(raw_configs[start : start + slice_size])
+            for start in range(0, len(raw_configs), slice_size)
+        )
+    )
+    return [proxy for parsed_slice in parsed_slices for proxy in parsed_slice]
+
+
 async def _fetch_source(client: httpx.AsyncClient, source_url: str) -> Tuple[List[str], int]:
-    """Fetch a proxy list from a single source."""
+    """Fetch a proxy list from a single source using the shared ``client``."""
     try:
-        async with get_client(retries=3) as client:
-            response = await client.get(source_url, timeout=FETCH_TIMEOUT_SECONDS)
-            response.raise_for_status()
+        response = await client.get(source_url, timeout=FETCH_TIMEOUT_SECONDS)
+        response.raise_for_status()
     except httpx.HTTPError as exc:
         logger.error("Failed to fetch %s: %s", source_url, exc)
         return [], 0
@@ -224,10 +348,17 @@ async def _process_sources(
     sources_to_fetch: List[str],
     progress: Optional[Progress],
     tracker: PerformanceTracker,
+    on_configs: Optional[Callable[[List[str]], None]] = None,
 ) -> Tuple[List[str], int]:
-    """Fetch and parse proxy configurations from sources."""
+    """Fetch and parse proxy configurations from sources.
+
+    When ``on_configs`` is given, each source's configs are handed to it as
+    soon as they arrive instead of being accumulated, and the returned list
+    is empty; only one source's lines are held at a time.
+    """
     gathered_configs: List[str] = []
     raw_fetch_total = 0
+    emit = on_configs or gathered_configs.extend
 
     local_sources = [s for s in sources_to_fetch if not s.startswith(("http://", "https://"))]
     remote_sources = [s for s in sources_to_fetch if s.startswith(("http://", "https://"))]
@@ -246,7 +377,7 @@ async def _process_sources(
                     continue
                 configs = _extract_config_lines(content)
                 if configs:
-                    gathered_configs.extend(configs)
+                    emit(configs)
                     raw_fetch_total += len(configs)
                 if progress and file_task is not None:
                     progress.update(file_task, advance=1)
@@ -258,19 +389,33 @@ async def _process_sources(
             else None
         )
         with tracker.phase("fetch"):
-            async with get_client() as client:
-                results = await asyncio.gather(
-                    *(_fetch_source(client, source) for source in remote_sources),
-                    return_exceptions=True,
-                )
-            for source, result in zip(remote_sources, results):
-                if isinstance(result, BaseException):
+            # Keep in-flight requests at FETCH_CONCURRENCY so large source
+            # lists do not flood the connection pool.
+            fetch_slots = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+            async def _guarded_fetch(
+                client: httpx.AsyncClient, source: str
+            ) -> Tuple[str, Tuple[List[str], int] | Exception]:
+                async with fetch_slots:
+                    try:
+                        return source, await _fetch_source(client, source)
+                    except Exception as exc:
+                        return source, exc
+
+            # One pooled client for every source; the transport retries
+            # connection failures so each fetch does not need its own client.
+            client = get_shared_client()
+            for next_done in asyncio.as_completed(
+                [_guarded_fetch(client, source) for source in remote_sources]
+            ):
+                source, result = await next_done
+                if isinstance(result, Exception):
                     logger.warning(f"Failed to fetch {source}: {result}")
-                    continue
-                configs, count = result
-                if configs:
-                    gathered_configs.extend(configs)
-                raw_fetch_total += count
+                else:
+                    configs, count = result
+                    if configs:
+                        emit(configs)
+                    raw_fetch_total += count
                 if progress and fetch_task is not None:
                     progress.update(fetch_task, advance=1)
 
@@ -320,9 +465,9 @@ async def run_full_pipeline(
     supplied_proxies: List[Proxy] = list(proxies or [])
     sources_to_fetch = _prepare_sources(sources)
     parse_cache: Dict[str, Proxy] = {}
+    parse_pool: ProcessPoolExecutor | None = None
     geo_cache: Dict[str, Dict[str, Optional[str]]] = {}
     geoip_reader: geoip2.database.Reader | None = None
-    geoip_lock = asyncio.Lock()  # Prevent race condition in reader initialization
     failure_reason: str | None = None
 
     if not sources_to_fetch and not supplied_proxies:
@@ -347,33 +492,50 @@ async def run_full_pipeline(
             len(supplied_proxies),
         )
 
-        gathered_configs, raw_fetch_total = await _process_sources(
-            sources_to_fetch, progress, tracker
+        # Opened once for the whole run (and closed in ``finally``) rather than
+        # re-checked for every phase
+        if GEOIP_CITY_DB_PATH.exists():
+            try:
+                geoip_reader = geoip2.database.Reader(str(GEOIP_CITY_DB_PATH))
+                _warm_page_cache(GEOIP_CITY_DB_PATH)
+                logger.info("Loaded GeoIP database from %s", GEOIP_CITY_DB_PATH)
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.warning("Could not open GeoIP database %s: %s", GEOIP_CITY_DB_PATH, exc)
+        else:
+            logger.warning("GeoIP database not found at %s", GEOIP_CITY_DB_PATH)
+
+        queue: deque[str] = deque()
+        # Only the 64-bit hash of each config is remembered, so a line can be
+        # freed once it leaves the queue; a collision would merely drop one
+        # config as a duplicate, which is negligible at these volumes.
+        seen_raw_configs: set[int] = set()
+
+        def _enqueue_configs(configs: List[str]) -> None:
+            eligible = [c for c in configs if not c.lstrip().startswith("ssr://")]
+            if len(eligible) != len(configs):
+                logger.debug("Skipping %d unsupported ssr:// proxies", len(configs) - len(eligible))
+            fresh = [c for c in dict.fromkeys(eligible) if hash(c) not in seen_raw_configs]
+            seen_raw_configs.update(map(hash, fresh))
+            queue.extend(fresh)
+            stats["duplicates_skipped"] += len(eligible) - len(fresh)
+
+        # Sources are de-duplicated into the queue as each one completes
+        leftover_configs, raw_fetch_total = await _process_sources(
+            sources_to_fetch, progress, tracker, on_configs=_enqueue_configs
         )
+        _enqueue_configs(leftover_configs)
 
         logger.info("PIPELINE: Fetched %d raw proxy configs.", raw_fetch_total)
 
         phase_summaries: List[Dict[str, Any]] = []
         stats["phases"] = phase_summaries
 
-        queue: deque[str] = deque()
-        seen_raw_configs: set[str] = set()
-        for raw_config in gathered_configs:
-            if raw_config.strip().startswith("ssr://"):
-                logger.debug("Skipping unsupported ssr:// proxy")
-                continue
-            if raw_config in seen_raw_configs:
-                stats["duplicates_skipped"] += 1
-                continue
-            seen_raw_configs.add(raw_config)
-            queue.append(raw_config)
-
-        gathered_configs.clear()
-
         logger.info("PIPELINE: Prepared %d unique configs for sequential processing.", len(queue))
 
-        processed_proxy_keys: set[Tuple[str, str, int, str, str]] = set()
-        written_proxy_keys: set[Tuple[str, str, int, str, str]] = set()
+        # Keys are small ints, so a lookup is one int hash and compare; a Bloom
+        # filter in front would cost more per check than it could ever skip
+        processed_proxy_keys: set[int] = set()
+        written_proxy_keys: set[int] = set()
         all_tested_proxies: List[Proxy] = []
         all_working_proxies: List[Proxy] = []
 
@@ -385,7 +547,7 @@ async def run_full_pipeline(
                 preparsed_batches.append(initial_batch)
                 for proxy in initial_batch:
                     if proxy.config:
-                        seen_raw_configs.add(proxy.config)
+                        seen_raw_configs.add(hash(proxy.config))
 
         batch_size = 1000  # Process proxies in batches for better memory management
         effective_timeout_sec = float(timeout)
@@ -399,20 +561,38 @@ async def run_full_pipeline(
         logger.info("Test cache initialized: %s", test_cache.get_stats())
 
         tester = SingBoxTester(timeout=effective_timeout_sec, cache=test_cache)
-        semaphore = asyncio.Semaphore(max(1, max_workers))
+        worker_count = max(1, max_workers)
 
-        async def _run_tests(batch: List[Proxy], label: str) -> List[Proxy]:
+        async def _run_tests(
+            batch: List[Proxy],
+            label: str,
+            on_tested: Optional[Callable[[Proxy], None]] = None,
+        ) -> List[Proxy]:
             if not batch:
                 return []
 
             task = progress.add_task(f"Testing {label}", total=len(batch)) if progress else None
 
-            async def test_single(proxy: Proxy) -> Proxy:
-                async with semaphore:
-                    tested_proxy = await tester.test(proxy)
-                if progress and task is not None:
-                    progress.update(task, advance=1)
-                return tested_proxy
+            async def _test_subset(subset: List[Proxy]) -> List[Proxy]:
+                # A fixed pool of workers drains the queue, so only worker_count
+                # coroutines exist at a time instead of one task per proxy.
+                # Results are written back by index to keep the input order.
+                results = list(subset)
+                pending: asyncio.Queue[Tuple[int, Proxy]] = asyncio.Queue()
+                for item in enumerate(subset):
+                    pending.put_nowait(item)
+
+                async def _worker() -> None:
+                    while not pending.empty():
+                        index, proxy = pending.get_nowait()
+                        results[index] = await tester.test(proxy)
+                        if on_tested is not None:
+                            on_tested(results[index])
+                        if progress and task is not None:
+                            progress.update(task, advance=1)
+
+                await asyncio.gather(*(_worker() for _ in range(min(worker_count, len(subset)))))
+                return results
 
             tested: List[Proxy] = []
             total_batches = (len(batch) + batch_size - 1) // batch_size
@@ -428,158 +608,135 @@ async def run_full_pipeline(
                             len(subset),
                             label,
                         )
-                    results = await asyncio.gather(*(test_single(p) for p in subset))
-                    tested.extend(results)
+                    tested.extend(await _test_subset(subset))
 
             if progress and task is not None:
                 progress.update(task, completed=len(batch))
 
             return tested
 
-        async def _geolocate_batch(batch: List[Proxy], label: str) -> None:
-            nonlocal geoip_reader
-            if not batch:
+        async def _geolocate_one(proxy: Proxy) -> None:
+            # A code the proxy carries or names in its remark describes that
+            # proxy only, so it is applied directly and never cached for the
+            # whole network; the cache holds GeoIP and ip-api answers
+            if apply_known_location(proxy):
                 return
 
-            geo_task = (
-                progress.add_task(f"Geolocating {label}", total=len(batch)) if progress else None
-            )
+            cache_key = _geo_cache_key(proxy.address)
+            cached_geo = geo_cache.get(cache_key)
+            if cached_geo:
+                proxy.country = cached_geo.get("country") or proxy.country
+                proxy.country_code = cached_geo.get("country_code") or proxy.country_code
+                proxy.city = cached_geo.get("city") or proxy.city
+                proxy.asn = cached_geo.get("asn") or proxy.asn
+                return
+
+            await geolocate_proxy(proxy, geoip_reader)
+            if proxy.country_code not in {"", "XX"} or proxy.country != "Unknown":
+                geo_cache[cache_key] = {
+                    "country": proxy.country,
+                    "country_code": proxy.country_code,
+                    "city": proxy.city,
+                    "asn": proxy.asn,
+                }
+
+        async def _geolocate_stream(
+            working: asyncio.Queue[Optional[Proxy]], total: int, label: str
+        ) -> None:
+            """Geolocate working proxies as testing yields them, until ``None``."""
+            geo_task = progress.add_task(f"Geolocating {label}", total=total) if progress else None
+            # Workers mostly wait for testing to yield proxies, so the geo phase
+            # only counts wall time while at least one lookup is in flight
+            in_flight = 0
+            busy_since = 0
+
+            async def _worker() -> None:
+                nonlocal in_flight, busy_since
+                while (proxy := await working.get()) is not None:
+                    if not in_flight:
+                        busy_since = time.perf_counter_ns()
+                    in_flight += 1
+                    try:
+                        await _geolocate_one(proxy)
+                    except Exception as exc:  # pragma: no cover - defensive
+                        logger.warning("GeoIP lookup failed during %s: %s", label, exc)
+                    finally:
+                        in_flight -= 1
+                        if not in_flight:
+                            tracker.add_time("geo", time.perf_counter_ns() - busy_since)
+                    if progress and geo_task is not None:
+                        progress.update(geo_task, advance=1)
+                # Pass the sentinel on so every sibling worker also stops
+                working.put_nowait(None)
+
             try:
-                geoip_db_path = Path("data/GeoLite2-City.mmdb")
-                # Use lock to prevent race condition when initializing reader
-                async with geoip_lock:
-                    if geoip_reader is None and geoip_db_path.exists():
-                        geoip_reader = geoip2.database.Reader(str(geoip_db_path))
-                        logger.info("Loaded GeoIP database from %s", geoip_db_path)
-                    elif geoip_reader is None:
-                        logger.warning("GeoIP database not found at %s", geoip_db_path)
-
-                working_items = [proxy for proxy in batch if proxy.is_working]
-                if working_items:
-                    with tracker.phase("geo"):
-                        for proxy in batch:
-                            if proxy.is_working:
-                                cached_geo = geo_cache.get(proxy.address)
-                                if cached_geo:
-                                    proxy.country = cached_geo.get("country") or proxy.country
-                                    proxy.country_code = (
-                                        cached_geo.get("country_code") or proxy.country_code
-                                    )
-                                    proxy.city = cached_geo.get("city") or proxy.city
-                                    proxy.asn = cached_geo.get("asn") or proxy.asn
-                                else:
-                                    await geolocate_proxy(
-                                        proxy,
-                                        geoip_reader,
-                                    )
-                                    if (
-                                        proxy.country_code not in {"", "XX"}
-                                        or proxy.country != "Unknown"
-                                    ):
-                                        geo_cache[proxy.address] = {
-                                            "country": proxy.country,
-                                            "country_code": proxy.country_code,
-                                            "city": proxy.city,
-                                            "asn": proxy.asn,
-                                        }
-                            if progress and geo_task is not None:
-                                progress.update(geo_task, advance=1)
-                elif progress and geo_task is not None:
-                    progress.update(geo_task, completed=len(batch))
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.warning("GeoIP lookup failed during %s: %s", label, exc)
+                # Local lookups are fast, but the ip-api fallback waits on the
+                # network; several workers keep those waits overlapping
+                await asyncio.gather(*(_worker() for _ in range(GEO_CONCURRENCY)))
             finally:
                 if progress and geo_task is not None:
-                    progress.update(geo_task, completed=len(batch))
+                    progress.update(geo_task, completed=total)
 
-        def _write_outputs() -> None:
+        async def _write_outputs() -> None:
             try:
                 with tracker.phase("output"):
+                    # Payloads are rendered first and written together at the end
+                    pending: Dict[Path, bytes] = {}
+
                     # Format proxy names with protocol rank, country flag, and original name
                     format_proxy_names_with_rank(all_working_proxies)
 
-                    sub_content = generate_base64_subscription(all_working_proxies)
+                    sub_content = generate_base64_subscription_bytes(all_working_proxies)
                     sub_path = output_path / "vpn_subscription_base64.txt"
-                    sub_path.write_text(sub_content)
+                    pending[sub_path] = sub_content
                     output_files["subscription"] = str(sub_path)
 
                     clash_content = generate_clash_config(all_working_proxies)
                     clash_path = output_path / "clash.yaml"
-                    clash_path.write_text(clash_content)
+                    pending[clash_path] = clash_content.encode("utf-8")
                     output_files["clash"] = str(clash_path)
 
                     try:
                         singbox_content = generate_singbox_config(all_working_proxies)
                         singbox_path = output_path / "singbox.json"
-                        singbox_path.write_text(singbox_content)
+                        pending[singbox_path] = singbox_content.encode("utf-8")
                         output_files["singbox"] = str(singbox_path)
                     except Exception as exc:  # pragma: no cover - defensive
                         logger.warning("Could not generate SingBox format: %s", exc)
 
-                    raw_content = "\n".join(p.config for p in all_working_proxies)
+                    # Streamed line by line in the write phase below
                     raw_path = output_path / "configs_raw.txt"
-                    raw_path.write_text(raw_content)
                     output_files["raw"] = str(raw_path)
 
-                    shadowrocket_content = generate_shadowrocket_subscription(all_working_proxies)
+                    shadowrocket_content = generate_shadowrocket_subscription_bytes(
+                        all_working_proxies
+                    )
                     shadowrocket_path = output_path / "shadowrocket.txt"
-                    shadowrocket_path.write_text(shadowrocket_content)
+                    pending[shadowrocket_path] = shadowrocket_content
                     output_files["shadowrocket"] = str(shadowrocket_path)
 
                     quantumult_content = generate_quantumult_config(all_working_proxies)
                     quantumult_path = output_path / "quantumult.conf"
-                    quantumult_path.write_text(quantumult_content)
+                    pending[quantumult_path] = quantumult_content.encode("utf-8")
                     output_files["quantumult"] = str(quantumult_path)
 
                     surge_content = generate_surge_config(all_working_proxies)
                     surge_path = output_path / "surge.conf"
-                    surge_path.write_text(surge_content)
+                    pending[surge_path] = surge_content.encode("utf-8")
                     output_files["surge"] = str(surge_path)
 
-                    proxies_json = [
-                        {
-                            "config": p.config,
-                            "protocol": p.protocol,
-                            "address": p.address,
-                            "port": p.port,
-                            "latency": p.latency,
-                            "country": p.country,
-                            "country_code": p.country_code,
-                            "city": p.city,
-                            "remarks": p.remarks,
-                            "is_working": p.is_working,
-                            "security_issues": p.security_issues,
-                            "tested_at": p.tested_at,
-                        }
-                        for p in all_working_proxies
-                    ]
+                    proxies_json = [proxy_to_dict(p) for p in all_working_proxies]
 
                     json_path = output_path / "proxies.json"
-                    json_path.write_text(json.dumps(proxies_json, indent=2))
+                    pending[json_path] = _json_bytes(proxies_json)
                     output_files["json"] = str(json_path)
 
                     full_dir = output_path / "full"
                     full_dir.mkdir(parents=True, exist_ok=True)
-                    full_payload = [
-                        {
-                            "config": p.config,
-                            "protocol": p.protocol,
-                            "address": p.address,
-                            "port": p.port,
-                            "latency": p.latency,
-                            "country": p.country,
-                            "country_code": p.country_code,
-                            "city": p.city,
-                            "remarks": p.remarks,
-                            "is_working": p.is_working,
-                            "security_issues": p.security_issues,
-                            "tested_at": p.tested_at,
-                        }
-                        for p in all_tested_proxies
-                    ]
+                    full_payload = [proxy_to_dict(p) for p in all_tested_proxies]
 
                     full_json_path = full_dir / "all.json"
-                    full_json_path.write_text(json.dumps(full_payload, indent=2))
+                    pending[full_json_path] = _json_bytes(full_payload)
                     output_files["full"] = str(full_json_path)
 
                     success_rate = (
@@ -588,22 +745,21 @@ async def run_full_pipeline(
                     protocol_counts: Dict[str, int] = {}
                     country_counts: Dict[str, int] = {}
                     asn_counts: Dict[str, int] = {}
+                    latency_total = 0.0
+                    latency_count = 0
 
+                    # One pass gathers every per-proxy aggregate for the stats file
                     for proxy in all_working_proxies:
                         protocol_counts[proxy.protocol] = protocol_counts.get(proxy.protocol, 0) + 1
                         country = proxy.country or "Unknown"
                         country_counts[country] = country_counts.get(country, 0) + 1
                         if proxy.asn:
                             asn_counts[proxy.asn] = asn_counts.get(proxy.asn, 0) + 1
+                        if proxy.latency is not None:
+                            latency_total += proxy.latency
+                            latency_count += 1
 
-                    working_with_latency = [
-                        proxy.latency for proxy in all_working_proxies if proxy.latency is not None
-                    ]
-                    average_latency = (
-                        sum(working_with_latency) / len(working_with_latency)
-                        if working_with_latency
-                        else 0.0
-                    )
+                    average_latency = latency_total / latency_count if latency_count else 0.0
 
                     stats_json = {
                         "generated_at": start_time.isoformat(),
@@ -623,7 +779,7 @@ async def run_full_pipeline(
                     }
 
                     stats_path = output_path / "statistics.json"
-                    stats_path.write_text(json.dumps(stats_json, indent=2))
+                    pending[stats_path] = _json_bytes(stats_json)
                     output_files["statistics"] = str(stats_path)
 
                     metadata = {
@@ -641,26 +797,39 @@ async def run_full_pipeline(
                     }
 
                     metadata_path = output_path / "metadata.json"
-                    metadata_path.write_text(json.dumps(metadata, indent=2))
+                    pending[metadata_path] = _json_bytes(metadata)
                     output_files["metadata"] = str(metadata_path)
 
                     stats_report = StatisticsEngine(all_working_proxies).generate_report()
                     report_path = output_path / "report.json"
-                    report_path.write_text(json.dumps(stats_report, indent=2))
+                    pending[report_path] = _json_bytes(stats_report)
                     output_files["report"] = str(report_path)
 
-                    # Generate categorized outputs for better organization
-                    try:
-                        categorized_files = generate_categorized_outputs(
-                            all_working_proxies, output_path
-                        )
-                        output_files.update(categorized_files)
-                        logger.info(
-                            "Generated %d categorized output files",
-                            len(categorized_files),
-                        )
-                    except Exception as exc:  # pragma: no cover - defensive
-                        logger.warning("Failed to generate categorized outputs: %s", exc)
+                    def _write_categorized() -> Dict[str, str]:
+                        try:
+                            files = generate_categorized_outputs(all_working_proxies, output_path)
+                        except Exception as exc:  # pragma: no cover - defensive
+                            logger.warning("Failed to generate categorized outputs: %s", exc)
+                            return {}
+                        logger.info("Generated %d categorized output files", len(files))
+                        return files
+
+                    # Files are independent, so overlap their blocking writes in threads
+                    writes = asyncio.gather(
+                        asyncio.to_thread(
+                            write_output_lines,
+                            raw_path,
+                            (p.config for p in all_working_proxies),
+                        ),
+                        *(
+                            asyncio.to_thread(write_output_bytes, path, payload)
+                            for path, payload in pending.items()
+                        ),
+                    )
+                    categorized_files, _ = await asyncio.gather(
+                        asyncio.to_thread(_write_categorized), writes
+                    )
+                    output_files.update(categorized_files)
             except Exception as exc:  # pragma: no cover - defensive
                 logger.error("Failed to generate outputs: %s", exc)
                 raise
@@ -697,22 +866,49 @@ async def run_full_pipeline(
                 else:
                     parse_task = None
 
-                parsed_from_sources: List[Proxy] = []
                 with tracker.phase("parse"):
-                    for raw_config in raw_batch:
-                        parsed: Optional[Proxy] = None
+                    # One slot per raw config, so cache hits and fresh parses
+                    # are merged back in source order
+                    slots: List[Optional[Proxy]] = [None] * chunk_fetched
+                    pending: List[str] = []
+                    pending_slots: List[int] = []
+                    for position, raw_config in enumerate(raw_batch):
                         cached_proxy = parse_cache.get(raw_config)
                         if cached_proxy is not None:
-                            parsed = replace(cached_proxy)
+                            slots[position] = copy.copy(cached_proxy)
                         else:
-                            candidate = parse_config(raw_config)
-                            if candidate is not None:
-                                parse_cache[raw_config] = replace(candidate)
-                                parsed = candidate
-                        if parsed is not None:
-                            parsed_from_sources.append(parsed)
+                            pending.append(raw_config)
+                            pending_slots.append(position)
+                    if progress and parse_task is not None:
+                        progress.update(parse_task, advance=chunk_fetched - len(pending))
+
+                    if len(pending) >= PARSE_POOL_MIN_BATCH:
+                        if parse_pool is None:
+                            # Threads are already running here, so workers
+                            # must not be forked from this process
+                            parse_pool = ProcessPoolExecutor(
+                                max_workers=os.cpu_count(),
+                                mp_context=multiprocessing.get_context(POOL_START_METHOD),
+                            )
+
+                        def _advance_parse(count: int) -> None:
+                            if progress and parse_task is not None:
+                                progress.update(parse_task, advance=count)
+
+                        fresh = await _parse_in_pool(parse_pool, pending, _advance_parse)
+                    else:
+                        fresh = core.parse_config_list(pending)
                         if progress and parse_task is not None:
-                            progress.update(parse_task, advance=1)
+                            progress.update(parse_task, advance=len(pending))
+
+                    for raw_config, position, candidate in zip(pending, pending_slots, fresh):
+                        if candidate is None:
+                            continue
+                        # Keyed before caching so later copies inherit the key
+                        _proxy_key(candidate)
+                        parse_cache[raw_config] = copy.copy(candidate)
+                        slots[position] = candidate
+                    parsed_from_sources = [proxy for proxy in slots if proxy is not None]
 
                 proxies_to_test = parsed_from_sources
                 parsed_count = len(parsed_from_sources)
@@ -726,7 +922,9 @@ async def run_full_pipeline(
 
                     policy = TEST_POLICY if leniency else STRICT_POLICY
                     insecure_before = len(proxies_to_test)
-                    proxies_to_test = validate_batch_configs(proxies_to_test, policy=policy)
+                    proxies_to_test = validate_batch_configs(
+                        proxies_to_test, policy=policy, pool=parse_pool
+                    )
                     insecure_removed = insecure_before - len(proxies_to_test)
                     if insecure_removed > 0:
                         logger.info("%d insecure proxies were filtered out", insecure_removed)
@@ -795,8 +993,22 @@ async def run_full_pipeline(
                     )
                     unique_batch = unique_batch[:remaining_slots]
 
-            tested_batch = await _run_tests(unique_batch, phase_label)
-            await _geolocate_batch(tested_batch, phase_label)
+            # Working proxies are geolocated while the rest of the phase is still
+            # being tested, so the two stages overlap instead of running back to back
+            geo_queue: asyncio.Queue[Optional[Proxy]] = asyncio.Queue()
+            geo_consumer = asyncio.create_task(
+                _geolocate_stream(geo_queue, len(unique_batch), phase_label)
+            )
+
+            def _queue_for_geo(proxy: Proxy) -> None:
+                if proxy.is_working:
+                    geo_queue.put_nowait(proxy)
+
+            try:
+                tested_batch = await _run_tests(unique_batch, phase_label, _queue_for_geo)
+            finally:
+                geo_queue.put_nowait(None)
+                await geo_consumer
 
             all_tested_proxies.extend(tested_batch)
             stats["tested"] += len(tested_batch)
@@ -807,57 +1019,52 @@ async def run_full_pipeline(
                 filter_task = None
 
             with tracker.phase("filter"):
-                working_batch = [p for p in tested_batch if p.is_working]
-
-                if country_filter:
-                    working_batch = [
-                        p
-                        for p in working_batch
-                        if p.country_code and p.country_code.upper() == country_filter.upper()
-                    ]
-                    logger.info(
-                        "Filtered %s to %d proxies in %s",
-                        phase_label,
-                        len(working_batch),
-                        country_filter,
-                    )
-
-                if min_latency is not None:
-                    working_batch = [
-                        p
-                        for p in working_batch
-                        if p.latency is not None and p.latency >= min_latency
-                    ]
-                    logger.info(
-                        "Filtered %s to %d proxies with latency >= %dms",
-                        phase_label,
-                        len(working_batch),
-                        min_latency,
-                    )
-
+                country_wanted = country_filter.upper() if country_filter else None
                 max_latency_limit = max_latency if max_latency is not None else 5000
-                if max_latency_limit and max_latency_limit > 0:
-                    working_batch = [
-                        p
-                        for p in working_batch
-                        if p.latency is None or p.latency <= max_latency_limit
-                    ]
-                    logger.info(
-                        "Filtered %s to %d proxies with latency <= %dms",
-                        phase_label,
-                        len(working_batch),
-                        max_latency_limit,
-                    )
+                latency_ceiling = (
+                    max_latency_limit if max_latency_limit and max_latency_limit > 0 else None
+                )
 
-            working_batch.sort(key=lambda p: p.latency or float("inf"))
+                # Every filter is applied in one pass over the tested batch
+                working_batch = []
+                for p in tested_batch:
+                    if not p.is_working:
+                        continue
+                    if country_wanted is not None and (
+                        not p.country_code or p.country_code.upper() != country_wanted
+                    ):
+                        continue
+                    latency = p.latency
+                    if latency is None:
+                        if min_latency is not None:
+                            continue
+                    elif (min_latency is not None and latency < min_latency) or (
+                        latency_ceiling is not None and latency > latency_ceiling
+                    ):
+                        continue
+                    working_batch.append(p)
+
+                logger.info(
+                    "Filtered %s to %d proxies (country: %s, latency: %s-%s ms)",
+                    phase_label,
+                    len(working_batch),
+                    country_filter or "any",
+                    min_latency if min_latency is not None else 0,
+                    latency_ceiling if latency_ceiling is not None else "unbounded",
+                )
 
-            newly_added: List[Proxy] = []
-            for proxy in working_batch:
-                key = _proxy_key(proxy)
-                if key in written_proxy_keys:
-                    continue
-                written_proxy_keys.add(key)
-                newly_added.append(proxy)
+            working_batch = _sort_by_latency(working_batch)
+
+            # Keys within a phase are already unique (processed_proxy_keys), so
+            # the membership test and the set update can each run as one bulk op.
+            # Cached copies carry the key memoized before testing
+            batch_keys = [_proxy_key(proxy) for proxy in working_batch]
+            newly_added: List[Proxy] = [
+                proxy
+                for proxy, key in zip(working_batch, batch_keys)
+                if key not in written_proxy_keys
+            ]
+            written_proxy_keys.update(batch_keys)
 
             if newly_added:
                 all_working_proxies.extend(newly_added)
@@ -887,7 +1094,7 @@ async def run_full_pipeline(
             phase_summaries.append(phase_summary)
             stats["phases"] = phase_summaries
 
-            _write_outputs()
+            await _write_outputs()
 
             if not queue and not preparsed_batches:
                 break
@@ -919,7 +1126,7 @@ async def run_full_pipeline(
             logger.warning("No proxies passed all filters across all phases")
 
         if not output_files:
-            _write_outputs()
+            await _write_outputs()
 
         elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
         logger.info("Pipeline completed successfully in %.1f seconds", elapsed)
@@ -953,6 +1160,11 @@ async def run_full_pipeline(
             "metrics": snapshot.to_dict(),
         }
     finally:
+        # The shared HTTP client may still serve other callers; whoever owns
+        # the event loop closes it, as the CLI does
+        if parse_pool is not None:
+            parse_pool.shutdown(wait=False, cancel_futures=True)
+
         # Ensure GeoIP reader is closed before leaving the pipeline
         if geoip_reader:
             try:
@@ -3,88 +3,344 @@ Proxy History Tracker.
 
 Tracks proxy performance metrics over time to enable
 trend analysis and reliability visualization.
+
+History is kept in SQLite so recording a result is a single INSERT rather
+than a rewrite of the whole history file.
 """
 
-import json
+import hashlib
 import logging
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, cast
-from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .models import Proxy
+from .output import _json_bytes
+from .parsers import _json_loads
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_HISTORY_PATH = Path("data/proxy_history.sqlite")
+DEFAULT_VIZ_SHARD_DIR = Path("data/viz")
+TRIM_INTERVAL = 100  # Inserts between flushes that also drop entries beyond max_entries
+FLUSH_EVERY = 256  # Results held in the open transaction before a commit
+
+_INSERT_PROXY_SQL = "INSERT OR IGNORE INTO proxies VALUES (?, ?, ?, ?)"
+_INSERT_ENTRY_SQL = "INSERT INTO entries VALUES (?, ?, ?, ?, ?)"
+
+# Rows for the proxies and entries tables, captured when a batch is recorded
+_WriteBatch = Tuple[List[Tuple[str, str, str, int]], List[Tuple[Any, ...]]]
+
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS proxies (
+    proxy_id TEXT PRIMARY KEY,
+    protocol TEXT NOT NULL,
+    address TEXT NOT NULL,
+    port INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    proxy_id TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    is_working INTEGER NOT NULL,
+    latency REAL,
+    country TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_proxy_idx ON entries(proxy_id);
+"""
+
+# Entries are ordered by rowid (insertion order); reads only ever look at the
+# newest max_entries rows, so results are exact even between trim sweeps
+_RECENT_SQL = """
+SELECT ts, is_working, latency, country FROM entries
+ WHERE proxy_id = ? ORDER BY rowid DESC LIMIT ?
+"""
+
+_TRIM_SQL = """
+DELETE FROM entries WHERE rowid IN (
+    SELECT rowid FROM (
+        SELECT rowid, ROW_NUMBER() OVER (PARTITION BY proxy_id ORDER BY rowid DESC) AS rn
+          FROM entries
+    ) WHERE rn > ?
+)
+"""
+
+
+@lru_cache(maxsize=4096)
+def _iso_timestamp(ts: int) -> str:
+    """Format epoch seconds as UTC ISO 8601; rows from one batch share a timestamp."""
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def _epoch_seconds(timestamp: str) -> int:
+    """Parse an ISO 8601 timestamp (``Z`` or offset suffix) into epoch seconds."""
+    return int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp())
+
+
+class _HistoryWriter:
+    """
+    Background thread applying queued batches to a history database.
+
+    Kept apart from :class:`ProxyHistoryTracker` so that neither the thread nor
+    the tracker's finalizer holds a reference to the tracker itself.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, max_entries: int):
+        self.conn = conn
+        self.max_entries = max_entries
+        self.flush_every = FLUSH_EVERY
+        self.dirty = 0
+        self.inserts_since_trim = 0
+        # Guards the connection and the counters above, shared with readers
+        self.lock = threading.Lock()
+        # First error the thread hit, raised from the next wait
+        self.error: Optional[Exception] = None
+        self.batches: "queue.Queue[Optional[_WriteBatch]]" = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="proxy-history-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        """Apply queued batches to the database until ``None`` is queued."""
+        while True:
+            batch = self.batches.get()
+            try:
+                if batch is None:
+                    return
+                self._write_batch(*batch)
+            except Exception as e:
+                # The thread keeps running so later batches and waits still work
+                logger.error("Failed to save proxy history: %s", e)
+                if self.error is None:
+                    self.error = e
+            finally:
+                self.batches.task_done()
+
+    def _write_batch(
+        self, proxy_rows: List[Tuple[str, str, str, int]], entry_rows: List[Tuple[Any, ...]]
+    ) -> None:
+        with self.lock:
+            self.conn.executemany(_INSERT_PROXY_SQL, proxy_rows)
+            self.conn.executemany(_INSERT_ENTRY_SQL, entry_rows)
+            self.dirty += len(entry_rows)
+            self.inserts_since_trim += len(entry_rows)
+            if self.dirty >= self.flush_every:
+                self._commit()
+
+    def wait(self) -> None:
+        """
+        Block until every queued batch has been applied.
+
+        Raises:
+            Exception: The first error the thread hit since the last wait
+        """
+        self.batches.join()
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def flush(self) -> None:
+        """Apply queued batches and commit every pending result."""
+        self.wait()
+        with self.lock:
+            self._commit()
+
+    def close(self) -> None:
+        """Flush, stop the thread, trim stale entries and close the database."""
+        try:
+            self.flush()
+        finally:
+            self.batches.put(None)
+            self.thread.join()
+            with self.lock:
+                self._trim()
+                self.conn.close()
+
+    def _commit(self) -> None:
+        """Commit pending results; the caller holds ``lock``."""
+        if not self.dirty:
+            return
+        try:
+            if self.inserts_since_trim >= TRIM_INTERVAL:
+                self._trim()
+            else:
+                self.conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Failed to save proxy history: %s", e)
+            return
+        self.dirty = 0
+
+    def _trim(self) -> None:
+        """Drop entries beyond the newest ``max_entries`` per proxy; the caller holds ``lock``."""
+        with self.conn:
+            self.conn.execute(_TRIM_SQL, (self.max_entries,))
+        # Leaving the ``with`` block committed any pending results too
+        self.inserts_since_trim = 0
+        self.dirty = 0
+
 
 class ProxyHistoryTracker:
-    """Tracks historical performance data for proxies."""
+    """Tracks historical performance data for proxies.
+
+    Recording only queues rows; a background writer thread performs the SQLite
+    inserts, so callers on an event loop never block on disk I/O. Every read
+    first waits for queued rows to be written.
+    """
 
-    def __init__(
-        self, history_path: Path = Path("data/proxy_history.json"), max_entries: int = 100
-    ):
+    def __init__(self, history_path: Path = DEFAULT_HISTORY_PATH, max_entries: int = 100):
         """
         Initialize history tracker.
 
         Args:
-            history_path: Path to store history data
+            history_path: Path of the SQLite history database; a legacy
+                ``.json`` history path opens its ``.sqlite`` sibling instead
+                and imports the JSON file into it
             max_entries: Maximum number of historical entries to keep per proxy
         """
-        self.history_path = Path(history_path)
+        history_path = Path(history_path)
+        # The JSON file stays untouched as the import source
+        if history_path.suffix == ".json":
+            history_path = history_path.with_suffix(".sqlite")
+        self.history_path = history_path
         self.max_entries = max_entries
         self.history_path.parent.mkdir(parents=True, exist_ok=True)
-        self.history_data = self._load_history()
 
-    def _load_history(self) -> Dict[str, Any]:
-        """Load history data from disk."""
-        if self.history_path.exists():
-            try:
-                data: Dict[str, Any] = json.loads(self.history_path.read_text())
-                return data
-            except Exception as e:
-                logger.warning("Failed to load proxy history: %s", e)
-        return {}
-
-    def _save_history(self) -> None:
-        """Save history data to disk."""
+        self._conn = sqlite3.connect(self.history_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(CREATE_SQL)
+        self._import_legacy_json()
+
+        self._writer = _HistoryWriter(self._conn, max_entries)
+        # Results still queued or in the open transaction are committed when the
+        # tracker is closed, collected or left alive at exit; the finalizer only
+        # references the writer, so it does not keep the tracker alive
+        self._finalizer = weakref.finalize(self, self._writer.close)
+
+    def _import_legacy_json(self) -> None:
+        """Import ``proxy_history.json`` from before the SQLite store, once."""
+        legacy_path = self.history_path.with_suffix(".json")
+        if legacy_path == self.history_path or not legacy_path.exists():
+            return
+        if self._conn.execute("SELECT 1 FROM proxies LIMIT 1").fetchone():
+            return
         try:
-            self.history_path.write_text(json.dumps(self.history_data, indent=2))
+            # Parsed straight from bytes; no str copy of the whole file
+            legacy: Dict[str, Any] = _json_loads(legacy_path.read_bytes())
         except Exception as e:
-            logger.error("Failed to save proxy history: %s", e)
+            logger.warning("Failed to load legacy proxy history: %s", e)
+            return
+
+        if not isinstance(legacy, dict):
+            logger.warning("Failed to load legacy proxy history: not a JSON object")
+            return
+
+        imported = 0
+        with self._conn:
+            for proxy_id, data in legacy.items():
+                try:
+                    # Rows are built before any insert, so a bad record adds nothing
+                    proxy_row = (proxy_id, data["protocol"], data["address"], data["port"])
+                    entry_rows = [
+                        (
+                            proxy_id,
+                            _epoch_seconds(e["timestamp"]),
+                            e["is_working"],
+                            e["latency"],
+                            e["country"],
+                        )
+                        for e in data["entries"][-self.max_entries :]
+                    ]
+                    self._conn.execute(_INSERT_PROXY_SQL, proxy_row)
+                    self._conn.executemany(_INSERT_ENTRY_SQL, entry_rows)
+                except Exception as e:
+                    logger.warning("Skipping malformed legacy history for %s: %s", proxy_id, e)
+                    continue
+                imported += 1
+        logger.info("Imported %d proxies from %s", imported, legacy_path)
+
+    def close(self) -> None:
+        """Write pending results, trim stale entries and close the database."""
+        self._finalizer()
+
+    def __enter__(self) -> "ProxyHistoryTracker":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _wait_for_writes(self) -> None:
+        """Block until queued results are written; raises the writer's last error."""
+        self._writer.wait()
+
+    def _fetchall(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        """Run a query once queued writes are applied and return every row."""
+        self._wait_for_writes()
+        with self._writer.lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _fetchone(self, sql: str, params: Tuple[Any, ...] = ()) -> Any:
+        """Run a query once queued writes are applied and return its first row, or None."""
+        self._wait_for_writes()
+        with self._writer.lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def flush(self) -> None:
+        """Write queued results and commit every result recorded since the last flush."""
+        self._writer.flush()
+
+    def _recent_entries(self, config: str, limit: int) -> List[Dict[str, Any]]:
+        rows = self._fetchall(_RECENT_SQL, (config, min(limit, self.max_entries)))
+        return [
+            {
+                "timestamp": _iso_timestamp(ts),
+                "is_working": bool(is_working),
+                "latency": latency,
+                "country": country,
+            }
+            for ts, is_working, latency, country in reversed(rows)
+        ]
 
     def record_test_result(self, proxy: Proxy) -> None:
         """
         Record a test result for a proxy.
 
+        Results are written in the background and committed in batches of
+        ``FLUSH_EVERY``; call :meth:`flush` (or :meth:`close`) to commit the
+        remainder.
+
         Args:
             proxy: Proxy with test results
         """
-        # Use config as unique identifier
-        proxy_id = proxy.config
-
-        if proxy_id not in self.history_data:
-            self.history_data[proxy_id] = {
-                "protocol": proxy.protocol,
-                "address": proxy.address,
-                "port": proxy.port,
-                "entries": [],
-            }
+        self.record_test_results((proxy,))
 
-        # Create entry
-        entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "is_working": proxy.is_working,
-            "latency": proxy.latency,
-            "country": proxy.country,
-        }
+    def record_test_results(self, proxies: Iterable[Proxy]) -> None:
+        """
+        Queue test results for many proxies, written with one statement per table.
 
-        # Add entry and trim if needed
-        self.history_data[proxy_id]["entries"].append(entry)
-        if len(self.history_data[proxy_id]["entries"]) > self.max_entries:
-            self.history_data[proxy_id]["entries"] = self.history_data[proxy_id]["entries"][
-                -self.max_entries :
-            ]
+        The rows are captured immediately, so later changes to the proxies do
+        not affect what is recorded.
 
-        self._save_history()
+        Args:
+            proxies: Proxies with test results
+        """
+        batch = list(proxies)
+        if not batch:
+            return
+        # One clock read stamps the whole batch
+        timestamp = int(time.time())
+        # Use config as unique identifier
+        self._writer.batches.put(
+            (
+                [(p.config, p.protocol, p.address, p.port) for p in batch],
+                [(p.config, timestamp, p.is_working, p.latency, p.country) for p in batch],
+            )
+        )
 
     def get_proxy_history(self, config: str) -> Optional[Dict[str, Any]]:
         """
@@ -96,8 +352,18 @@ class ProxyHistoryTracker:
         Returns:
             History data or None
         """
-        result = self.history_data.get(config)
-        return cast(Optional[Dict[str, Any]], result)
+        row = self._fetchone(
+            "SELECT protocol, address, port FROM proxies WHERE proxy_id = ?", (config,)
+        )
+        if row is None:
+            return None
+        protocol, address, port = row
+        return {
+            "protocol": protocol,
+            "address": address,
+            "port": port,
+            "entries": self._recent_entries(config, self.max_entries),
+        }
 
     def get_reliability_score(self, config: str, lookback_days: int = 7) -> float:
         """
@@ -110,15 +376,15 @@ class ProxyHistoryTracker:
         Returns:
             Reliability score 0.0-1.0
         """
-        history = self.get_proxy_history(config)
-        if not history or not history["entries"]:
+        total, working = self._fetchone(
+            "SELECT COUNT(*), SUM(is_working) FROM (" + _RECENT_SQL + ")",
+            (config, self.max_entries),
+        )
+        if not total:
             return 0.5  # Neutral for unknown
 
         # Calculate success rate from recent entries
-        entries = history["entries"]
-        working_count = sum(1 for e in entries if e["is_working"])
-
-        return working_count / len(entries) if entries else 0.5
+        return float(working / total)
 
     def get_trend_data(self, config: str, points: int = 30) -> Dict[str, Any]:
         """
@@ -131,12 +397,7 @@ class ProxyHistoryTracker:
         Returns:
             Dictionary with timestamps, latencies, and status
         """
-        history = self.get_proxy_history(config)
-        if not history or not history["entries"]:
-            return {"timestamps": [], "latencies": [], "status": []}
-
-        entries = history["entries"][-points:]
-
+        entries = self._recent_entries(config, points)
         return {
             "timestamps": [e["timestamp"] for e in entries],
             "latencies": [e["latency"] if e["latency"] else 0 for e in entries],
@@ -153,8 +414,12 @@ class ProxyHistoryTracker:
         Returns:
             Dictionary with summary statistics
         """
-        history = self.get_proxy_history(config)
-        if not history or not history["entries"]:
+        total, working, avg_latency, min_latency, max_latency = self._fetchone(
+            "SELECT COUNT(*), SUM(is_working), AVG(latency), MIN(latency), MAX(latency)"
+            " FROM (" + _RECENT_SQL + ")",
+            (config, self.max_entries),
+        )
+        if not total:
             return {
                 "total_tests": 0,
                 "success_rate": 0.0,
@@ -164,53 +429,172 @@ class ProxyHistoryTracker:
                 "uptime_percentage": 0.0,
             }
 
-        entries = history["entries"]
-        latencies = [e["latency"] for e in entries if e["latency"] is not None]
-        working = [e for e in entries if e["is_working"]]
+        return {
+            "total_tests": total,
+            "success_rate": working / total,
+            "avg_latency": avg_latency or 0,
+            "min_latency": min_latency or 0,
+            "max_latency": max_latency or 0,
+            "uptime_percentage": working / total * 100,
+        }
 
+    def _summarize(self, config: str, points: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Build :meth:`get_trend_data` and :meth:`get_summary_stats` output together.
+
+        The recent entries are read once and walked in a single loop instead of
+        being queried and scanned separately for each.
+        """
+        rows = self._fetchall(_RECENT_SQL, (config, self.max_entries))
+        trend_start = len(rows) - min(points, self.max_entries)
+
+        timestamps: List[str] = []
+        latencies: List[Any] = []
+        status: List[int] = []
+        working = 0
+        latency_sum = 0.0
+        latency_count = 0
+        min_latency: Optional[float] = None
+        max_latency: Optional[float] = None
+        for index, (ts, is_working, latency, _country) in enumerate(reversed(rows)):
+            working += is_working
+            if latency is not None:
+                latency_sum += latency
+                latency_count += 1
+                if min_latency is None or latency < min_latency:
+                    min_latency = latency
+                if max_latency is None or latency > max_latency:
+                    max_latency = latency
+            if index >= trend_start:
+                timestamps.append(_iso_timestamp(ts))
+                latencies.append(latency if latency else 0)
+                status.append(1 if is_working else 0)
+
+        trend = {"timestamps": timestamps, "latencies": latencies, "status": status}
+        total = len(rows)
+        if not total:
+            return trend, self.get_summary_stats(config)
+        stats = {
+            "total_tests": total,
+            "success_rate": working / total,
+            "avg_latency": latency_sum / latency_count if latency_count else 0,
+            "min_latency": min_latency or 0,
+            "max_latency": max_latency or 0,
+            "uptime_percentage": working / total * 100,
+        }
+        return trend, stats
+
+    def _viz_record(self, config: str, protocol: str, address: str, port: int) -> Dict[str, Any]:
+        """Build the visualization record (trend and stats) for one proxy."""
+        # Get trend data and summary stats from one pass over the entries
+        trend, stats = self._summarize(config, points=50)
         return {
-            "total_tests": len(entries),
-            "success_rate": len(working) / len(entries) if entries else 0.0,
-            "avg_latency": sum(latencies) / len(latencies) if latencies else 0,
-            "min_latency": min(latencies) if latencies else 0,
-            "max_latency": max(latencies) if latencies else 0,
-            "uptime_percentage": (len(working) / len(entries) * 100) if entries else 0.0,
+            "protocol": protocol,
+            "address": address,
+            "port": port,
+            "trend": trend,
+            "stats": stats,
+            "last_test": trend["timestamps"][-1],
         }
 
     def export_for_visualization(
-        self, output_path: Path = Path("data/proxy_history_viz.json")
+        self, output_path: Path = Path("data/proxy_history_viz.json"), pretty: bool = False
     ) -> None:
         """
         Export history data in format optimized for web visualization.
 
         Args:
             output_path: Path to output file
+            pretty: Indent the JSON; the web UI only needs the compact form
         """
-        viz_data = {}
-
-        # Process each proxy
-        for config, data in self.history_data.items():
-            if not data["entries"]:
-                continue
-
-            # Get trend data and summary stats
-            trend = self.get_trend_data(config, points=50)
-            stats = self.get_summary_stats(config)
-
-            viz_data[config] = {
-                "protocol": data["protocol"],
-                "address": data["address"],
-                "port": data["port"],
-                "trend": trend,
-                "stats": stats,
-                "last_test": data["entries"][-1]["timestamp"] if data["entries"] else None,
-            }
+        # Process each proxy that has at least one entry
+        rows = self._fetchall(
+            "SELECT proxy_id, protocol, address, port FROM proxies p"
+            " WHERE EXISTS (SELECT 1 FROM entries e WHERE e.proxy_id = p.proxy_id)"
+        )
 
         # Save
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(json.dumps(viz_data, indent=2))
+        if pretty:
+            viz_data = {row[0]: self._viz_record(*row) for row in rows}
+            output_path.write_bytes(_json_bytes(viz_data, indent=True))
+        else:
+            # Each record is serialized and written as it is built, so no dict
+            # holding every record (nor its repeated resizing) is needed
+            with output_path.open("wb") as handle:
+                handle.write(b"{")
+                for index, row in enumerate(rows):
+                    if index:
+                        handle.write(b",")
+                    handle.write(_json_bytes(row[0], indent=False))
+                    handle.write(b":")
+                    handle.write(_json_bytes(self._viz_record(*row), indent=False))
+                handle.write(b"}")
         logger.info("Exported history visualization data to %s", output_path)
 
+    def export_viz_shards(self, output_dir: Path = DEFAULT_VIZ_SHARD_DIR) -> int:
+        """
+        Export visualization data as one shard per proxy, rewriting only changed ones.
+
+        Each proxy's record goes to ``<output_dir>/<sha256[:2]>/<sha256>.json``.
+        ``index.json`` maps every config to its shard, stats and last test time,
+        plus a version (newest entry rowid and entry count) it was built from;
+        shards whose proxy gained or lost no entries since the last export are
+        left untouched.
+
+        Args:
+            output_dir: Directory holding the shards and index
+
+        Returns:
+            Number of shards written
+        """
+        index_path = output_dir / "index.json"
+        try:
+            index: Dict[str, Any] = _json_loads(index_path.read_bytes())
+        except (OSError, ValueError):
+            index = {}
+
+        current = dict(
+            self._fetchall(
+                "SELECT proxy_id, MAX(rowid) || ':' || COUNT(*) FROM entries GROUP BY proxy_id"
+            )
+        )
+
+        # Drop shards of proxies that are no longer in the history
+        stale = index.keys() - current.keys()
+        for config in stale:
+            (output_dir / index.pop(config)["shard"]).unlink(missing_ok=True)
+
+        written = 0
+        for config, version in current.items():
+            indexed = index.get(config)
+            if indexed is not None and indexed["version"] == version:
+                continue
+            protocol, address, port = self._fetchone(
+                "SELECT protocol, address, port FROM proxies WHERE proxy_id = ?", (config,)
+            )
+            record = self._viz_record(config, protocol, address, port)
+
+            digest = hashlib.sha256(config.encode("utf-8")).hexdigest()
+            shard = f"{digest[:2]}/{digest}.json"
+            shard_path = output_dir / shard
+            shard_path.parent.mkdir(parents=True, exist_ok=True)
+            shard_path.write_bytes(_json_bytes(record, indent=False))
+
+            index[config] = {
+                "shard": shard,
+                "version": version,
+                "stats": record["stats"],
+                "last_test": record["last_test"],
+            }
+            written += 1
+
+        if written or stale or not index_path.exists():
+            output_dir.mkdir(parents=True, exist_ok=True)
+            index_path.write_bytes(_json_bytes(index, indent=False))
+        logger.info("Exported %d history visualization shards to %s", written, output_dir)
+        return written
+
     def cleanup_old_data(self, days: int = 30) -> int:
         """
         Remove history data older than specified days.
@@ -221,30 +605,16 @@ class ProxyHistoryTracker:
         Returns:
             Number of proxies removed
         """
-        from datetime import timedelta
+        self._wait_for_writes()
+        cutoff = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
 
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        removed = 0
-
-        for config in list(self.history_data.keys()):
-            entries = self.history_data[config]["entries"]
-
-            # Filter out old entries
-            recent = [
-                e
-                for e in entries
-                if datetime.fromisoformat(e["timestamp"].replace("Z", "+00:00")) > cutoff
-            ]
-
-            if not recent:
-                # Remove proxy if no recent data
-                del self.history_data[config]
-                removed += 1
-            else:
-                self.history_data[config]["entries"] = recent
+        with self._writer.lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE ts <= ?", (cutoff,))
+            removed = self._conn.execute(
+                "DELETE FROM proxies WHERE proxy_id NOT IN (SELECT proxy_id FROM entries)"
+            ).rowcount
 
         if removed > 0:
-            self._save_history()
             logger.info("Cleaned up history for %d proxies", removed)
 
         return removed
@@ -1,16 +1,39 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from dataclasses import dataclass
 from datetime import timedelta
+from itertools import chain
 from pathlib import Path
-from typing import List
+from typing import Any, Iterable, List
 
 from .models import Proxy
+from .parsers import _json_loads
 from .pipeline import run_full_pipeline
 
 
+def _read_proxies(path: Path) -> List[Proxy]:
+    """Read proxies from a JSON array file or from newline-delimited JSON objects.
+
+    JSONL input is decoded one line at a time, so only the resulting ``Proxy``
+    objects are held in memory, never a copy of the whole file.
+    """
+    with path.open("rb") as handle:
+        for line in handle:
+            first = line.strip()
+            if not first:
+                continue
+            items: Iterable[Any]
+            if first.startswith(b"["):
+                # A JSON array (such as the pipeline's proxies.json) is parsed whole
+                items = _json_loads(line + handle.read())
+            else:
+                rest = (_json_loads(row) for row in handle if row.strip())
+                items = chain((_json_loads(first),), rest)
+            return [Proxy(**item) for item in items if isinstance(item, dict)]
+    return []
+
+
 @dataclass
 class RetestJobResult:
     success: bool
@@ -37,9 +60,8 @@ class RetestScheduler:
     async def _load_proxies(self) -> List[Proxy]:
         if not self.proxies_file.exists():
             return []
-        data = self.proxies_file.read_text(encoding="utf-8")
-        items = json.loads(data)
-        return [Proxy(**item) for item in items if isinstance(item, dict)]
+        # File I/O and decoding run off the event loop
+        return await asyncio.to_thread(_read_proxies, self.proxies_file)
 
     async def run_once(self) -> RetestJobResult:
         proxies = await self._load_proxies()
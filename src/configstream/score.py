@@ -3,22 +3,94 @@
 from __future__ import annotations
 
 import math
-from typing import Mapping, Optional, TYPE_CHECKING
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, List, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from .config import AppSettings
-from .models import Proxy
+from .models import SECURITY_AEAD, SECURITY_DOH, SECURITY_ENCRYPTION, SECURITY_TLS, Proxy
+
+try:  # pragma: no cover - optional vectorised scoring
+    import numpy as _np
+except Exception:  # pragma: no cover - fallback to per-proxy scoring
+    _np = None
 
 if TYPE_CHECKING:
     from .test_cache import TestResultCache
 
+# Per-proxy inputs of the vectorised health score, fetched in one C-level call
+_HEALTH_FIELDS = attrgetter("latency", "is_working", "security_flags")
+
+VECTORIZE_MIN_BATCH = 256  # Below this, the scalar loop beats building numpy arrays
+LATENCY_TABLE_MAX_MS = 10_000  # Latencies from 0 up to this use the precomputed table
+
+
+def _security_points(
+    tls: float, aead: float, encryption: float, doh: float, cap: float = math.inf
+) -> Tuple[float, ...]:
+    """Capped security points for every value of ``Proxy.security_flags``."""
+    return tuple(
+        min(
+            0.0
+            + (tls if flags & SECURITY_TLS else 0.0)
+            + (aead if flags & SECURITY_AEAD else 0.0)
+            + (encryption if flags & SECURITY_ENCRYPTION else 0.0)
+            + (doh if flags & SECURITY_DOH else 0.0),
+            cap,
+        )
+        for flags in range(16)
+    )
+
+
+_HEALTH_SECURITY_POINTS = _security_points(10.0, 5.0, 3.0, 2.0, cap=20.0)
+_BALANCED_PRIVACY_POINTS = _security_points(2.0, 2.0, 0.0, 1.0)
+_PRIVACY_BASE_POINTS = _security_points(35.0, 25.0, 0.0, 10.0)
+
+
+def _sigmoid_points(lat_ms: float, soft_cap: int, max_points: float) -> float:
+    center = max(1.0, soft_cap * 0.6)
+    slope = max(50.0, soft_cap * 0.2)
+    return max_points * (1.0 / (1.0 + math.exp((lat_ms - center) / slope)))
+
+
+@lru_cache(maxsize=None)
+def _sigmoid_table(soft_cap: int, max_points: float) -> Tuple[float, ...]:
+    """Sigmoid points for every whole millisecond up to ``LATENCY_TABLE_MAX_MS``."""
+    return tuple(
+        _sigmoid_points(ms, soft_cap, max_points) for ms in range(LATENCY_TABLE_MAX_MS + 1)
+    )
+
 
 def _latency_points(lat_ms: float | None, soft_cap: int, max_points: float) -> float:
     """Calculate score points based on latency using sigmoid function."""
     if lat_ms is None or soft_cap <= 0:
         return 0.0
-    center = max(1.0, soft_cap * 0.6)
-    slope = max(50.0, soft_cap * 0.2)
-    return max_points * (1.0 / (1.0 + math.exp((lat_ms - center) / slope)))
+    if not 0.0 <= lat_ms < LATENCY_TABLE_MAX_MS:
+        return _sigmoid_points(lat_ms, soft_cap, max_points)
+    # The slope is at least 50 ms, so interpolating between whole milliseconds
+    # stays within 1e-3 points of the exact sigmoid
+    table = _sigmoid_table(soft_cap, max_points)
+    index = int(lat_ms)
+    low = table[index]
+    return low + (table[index + 1] - low) * (lat_ms - index)
+
+
+def _latency_points_array(latency: Any, soft_cap: int, max_points: float) -> Any:
+    """
+    :func:`_latency_points` over a float array of latencies without NaNs.
+
+    Runs the same table interpolation with the same float operations, so every
+    element equals the scalar result exactly.
+    """
+    table = _np.asarray(_sigmoid_table(soft_cap, max_points))
+    in_table = (latency >= 0.0) & (latency < LATENCY_TABLE_MAX_MS)
+    index = _np.where(in_table, latency, 0.0).astype(_np.intp)
+    low = table[index]
+    points = low + (table[index + 1] - low) * (latency - index)
+    # Latencies outside the table are rare; math.exp keeps them identical too
+    for i in _np.flatnonzero(~in_table).tolist():
+        points[i] = _sigmoid_points(float(latency[i]), soft_cap, max_points)
+    return points
 
 
 def calculate_health_score(
@@ -41,6 +113,16 @@ def calculate_health_score(
     Returns:
         Health score between 0.0 and 100.0
     """
+    # An untested proxy only earns the neutral history and latency defaults
+    if (
+        not cache
+        and proxy.latency is None
+        and not proxy.details
+        and not proxy.dns_over_https_ok
+        and not proxy.is_working
+    ):
+        return 35.0
+
     if settings is None:
         settings = AppSettings()
 
@@ -62,17 +144,7 @@ def calculate_health_score(
         score += 15.0
 
     # Security features (20 points)
-    security_score = 0.0
-    if proxy.details:
-        if proxy.details.get("tls"):
-            security_score += 10.0
-        if proxy.details.get("aead"):
-            security_score += 5.0
-        if proxy.details.get("encryption"):
-            security_score += 3.0
-    if proxy.dns_over_https_ok:
-        security_score += 2.0
-    score += min(security_score, 20.0)
+    score += _HEALTH_SECURITY_POINTS[proxy.security_flags]
 
     # Current working status (10 points)
     if proxy.is_working:
@@ -82,6 +154,62 @@ def calculate_health_score(
     return round(min(max(score, 0.0), 100.0), 2)
 
 
+def calculate_health_scores_batch(
+    proxies: Sequence[Proxy],
+    cache: Optional["TestResultCache"] = None,
+    settings: Optional[AppSettings] = None,
+) -> List[float]:
+    """
+    Calculate :func:`calculate_health_score` for many proxies at once.
+
+    With numpy installed, large batches are scored column-wise in one
+    vectorised pass; otherwise each proxy is scored individually.
+
+    Args:
+        proxies: Proxies to score
+        cache: Optional test result cache for historical data
+        settings: Optional app settings
+
+    Returns:
+        Health scores in the same order as ``proxies``
+    """
+    if settings is None:
+        settings = AppSettings()
+    count = len(proxies)
+    if _np is None or count < VECTORIZE_MIN_BATCH:
+        return [calculate_health_score(p, cache, settings) for p in proxies]
+
+    # Every field is fetched in one C-level call per proxy and transposed into
+    # columns by zip, instead of one Python-level pass per column
+    latencies, working, flags = zip(*map(_HEALTH_FIELDS, proxies))
+
+    # Component sums are added in the same order as the scalar version
+    if cache:
+        historical = (cache.get_health_score(p) for p in proxies)
+        score = _np.fromiter(historical, dtype=_np.float64, count=count) * 40.0
+    else:
+        score = _np.full(count, 20.0)
+
+    # None becomes NaN in a float array; missing latencies score 0 in the
+    # lookup and are replaced by the neutral 15 points below
+    latency = _np.array(latencies, dtype=_np.float64)
+    missing = _np.isnan(latency)
+    soft_cap = settings.LAT_SOFT_CAP_MS
+    if soft_cap <= 0:
+        latency_score = _np.zeros(count)
+    else:
+        latency_score = _latency_points_array(_np.where(missing, 0.0, latency), soft_cap, 30.0)
+    score += _np.where(missing, 15.0, latency_score)
+
+    score += _np.asarray(_HEALTH_SECURITY_POINTS)[_np.array(flags, dtype=_np.intp)]
+
+    score += _np.array(working, dtype=bool) * 10.0
+
+    # Each component is computed and added exactly as in the scalar path, and
+    # Python's round on the resulting floats keeps the scores identical
+    return [round(value, 2) for value in _np.clip(score, 0.0, 100.0).tolist()]
+
+
 def score_speed(
     proxy: Proxy, history: Mapping[str, Mapping[str, float]], settings: AppSettings
 ) -> float:
@@ -102,15 +230,7 @@ def score_balanced(
     hist = history.get(proxy.id) or {}
     score += hist.get("success_rate", 0.0) * 25.0
     score += max(0.0, 1.0 - (proxy.age_seconds or 0) / 86400.0) * 10.0
-    details = proxy.details or {}
-    privacy = 0.0
-    if details.get("tls"):
-        privacy += 2.0
-    if details.get("aead"):
-        privacy += 2.0
-    if proxy.dns_over_https_ok:
-        privacy += 1.0
-    score += privacy
+    score += _BALANCED_PRIVACY_POINTS[proxy.security_flags]
     return round(score, 2)
 
 
@@ -118,14 +238,7 @@ def score_privacy(
     proxy: Proxy, history: Mapping[str, Mapping[str, float]], settings: AppSettings
 ) -> float:
     """Legacy scoring function prioritizing privacy features."""
-    details = proxy.details or {}
-    base = 0.0
-    if details.get("tls"):
-        base += 35.0
-    if details.get("aead"):
-        base += 25.0
-    if proxy.dns_over_https_ok:
-        base += 10.0
+    base = _PRIVACY_BASE_POINTS[proxy.security_flags]
     hist = history.get(proxy.id) or {}
     base += hist.get("success_rate", 0.0) * 15.0
     base += _latency_points(proxy.latency_ms, settings.LAT_SOFT_CAP_MS, 15.0)
@@ -1,5 +1,5 @@
 from collections import defaultdict
-from time import time
+from time import monotonic as _now
 from typing import DefaultDict, Dict
 
 
@@ -9,26 +9,43 @@ class RateLimiter:
     def __init__(self, requests_per_second: float = 10) -> None:
         self.rate = requests_per_second
         self.buckets: DefaultDict[str, Dict[str, float]] = defaultdict(
-            lambda: {"tokens": 0.0, "last_update": time()}
+            lambda: {"tokens": 0.0, "last_update": _now()}
         )
 
     def is_allowed(self, identifier: str) -> bool:
         """Check if request is allowed"""
-        current_time = time()
+        current_time = _now()
         bucket = self.buckets[identifier]
+        rate = self.rate
 
-        # Add tokens based on time elapsed
-        time_passed = current_time - bucket["last_update"]
-        bucket["tokens"] += time_passed * self.rate
-        bucket["tokens"] = min(bucket["tokens"], self.rate)  # Cap at rate
+        # Add tokens based on time elapsed, capped at rate; each bucket key is
+        # read and written once
+        tokens = bucket["tokens"] + (current_time - bucket["last_update"]) * rate
+        if tokens > rate:
+            tokens = rate
         bucket["last_update"] = current_time
 
-        if bucket["tokens"] >= 1:
-            bucket["tokens"] -= 1
+        if tokens >= 1:
+            bucket["tokens"] = tokens - 1
             return True
 
+        bucket["tokens"] = tokens
         return False
 
+    def is_allowed_many(self, identifier: str, n: int = 1) -> int:
+        """Admit up to ``n`` requests with one clock read; return how many were allowed"""
+        current_time = _now()
+        bucket = self.buckets[identifier]
+        rate = self.rate
+
+        tokens = bucket["tokens"] + (current_time - bucket["last_update"]) * rate
+        if tokens > rate:
+            tokens = rate
+        admitted = max(0, min(n, int(tokens)))
+        bucket["tokens"] = tokens - admitted
+        bucket["last_update"] = current_time
+        return admitted
+
     def get_wait_time(self, identifier: str) -> float:
         """Get seconds to wait before next allowed request"""
         bucket = self.buckets[identifier]
@@ -1,9 +1,17 @@
 """Enhanced security validation for proxy configurations."""
 
+import ipaddress
+import os
 import re
 import logging
+import multiprocessing
+import socket
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass, replace
-from typing import Optional, List, Tuple, Dict, FrozenSet
+from functools import lru_cache
+from itertools import repeat
+from typing import Any, Optional, List, Tuple, Dict, FrozenSet, Iterable, Sequence, Union
 from urllib.parse import urlparse
 
 from .models import Proxy
@@ -13,10 +21,19 @@ from .constants import (
     MAX_PORT,
     VALID_PROTOCOLS,
     MAX_CONFIG_LINE_LENGTH,
+    POOL_START_METHOD,
 )
 
+try:  # pragma: no cover - optional multi-pattern matcher
+    import hyperscan as _hyperscan
+except Exception:  # pragma: no cover - fall back to the combined regex
+    _hyperscan = None
+
 logger = logging.getLogger(__name__)
 
+# Smaller batches validate faster inline than a process pool can start
+PARALLEL_VALIDATION_MIN_BATCH = 5000
+
 
 # RFC 2606 reserved names + localhost: safe for tests and docs
 RESERVED_DOMAINS: FrozenSet[str] = frozenset(
@@ -49,6 +66,153 @@ TEST_POLICY = replace(
 )
 
 
+# Shell, script, SQL and path injection markers in config strings
+_SUSPICIOUS_PATTERNS = (
+    r"\$\(",  # Command substitution
+    r"`",  # Backtick command execution
+    r";\s*rm\s",  # Dangerous commands
+    r"&&\s*rm\s",
+    r"\|\s*sh",
+    r"eval\s*\(",
+    r"exec\s*\(",
+    r"<script",  # XSS attempts
+    r"javascript:",  # JavaScript protocol
+    r"data:text/html",  # Data URI XSS
+    r"\bDROP\s+TABLE\b",  # SQL injection
+    r"\bDELETE\s+FROM\b",
+    r"\.\.\/",  # Path traversal
+    r"file:\/\/",  # File protocol
+    r"%00",  # Null byte in URL encoding
+)
+_SUSPICIOUS_RE = re.compile("|".join(_SUSPICIOUS_PATTERNS), re.IGNORECASE)
+
+# Lowercase literals, at least one of which occurs in any match of _SUSPICIOUS_RE
+_INJECTION_TRIGGERS = (
+    "$(",
+    "`",
+    ";",
+    "&&",
+    "|",
+    "eval",
+    "exec",
+    "<script",
+    "javascript:",
+    "data:text/html",
+    "drop",
+    "delete",
+    "../",
+    "file://",
+    "%00",
+)
+
+# Sensitive log content; kept as three passes, since each pattern alone keeps
+# the regex engine's literal-prefix search that a fused alternation loses
+_UUID_RE = re.compile(
+    r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE
+)
+_URL_PASSWORD_RE = re.compile(r":[^@\s]+@")
+_BASE64_RE = re.compile(r"\b[A-Za-z0-9+/]{20,}={0,2}\b")  # Runs of 20+ base64 chars
+
+# Ends the authority of a URL after its "scheme://"
+_NETLOC_END_RE = re.compile(r"[/?#]")
+
+# Hostnames that name the local machine; IP literals are classified by ipaddress
+_SPECIAL_HOSTNAMES: FrozenSet[str] = frozenset({"localhost"})
+
+_OCTAL_IP_RE = re.compile(r"0[0-7]{1,11}\.")
+_DOTTED_NUMBER_RE = re.compile(r"[0-9.]+")
+
+
+def _may_contain_injection(config: str) -> bool:
+    """Cheap necessary condition for ``_SUSPICIOUS_RE`` to match ``config``.
+
+    Non-ASCII configs always go to the regex, because IGNORECASE also folds
+    letters such as "ſ" that ``str.lower`` leaves alone.
+    """
+    if not config.isascii():
+        return True
+    lowered = config.lower()
+    for trigger in _INJECTION_TRIGGERS:
+        if trigger in lowered:
+            return True
+    return False
+
+
+def _compile_suspicious_database() -> Any:
+    """All suspicious patterns in one Hyperscan database, or None without Hyperscan."""
+    if _hyperscan is None:
+        return None
+    # Python's \s also matches the \x1c-\x1f separators, which PCRE's does not
+    expressions = [p.replace(r"\s", r"[\s\x1c-\x1f]").encode() for p in _SUSPICIOUS_PATTERNS]
+    flags = _hyperscan.HS_FLAG_CASELESS | _hyperscan.HS_FLAG_SINGLEMATCH
+    try:
+        database = _hyperscan.Database(mode=_hyperscan.HS_MODE_BLOCK)
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            flags=[flags] * len(expressions),
+        )
+    except Exception as exc:  # pragma: no cover - fall back to the combined regex
+        logger.warning(f"Hyperscan unavailable, using regex injection checks: {exc}")
+        return None
+    return database
+
+
+_SUSPICIOUS_DB = _compile_suspicious_database()
+# Hyperscan scratch space may not be shared between concurrent scans
+_scan_state = threading.local()
+
+
+def _on_injection_match(pattern_id: int, start: int, end: int, flags: int, found: Any) -> bool:
+    found.append(pattern_id)
+    return True  # Stop at the first match
+
+
+def _find_injection(config: str) -> Optional[str]:
+    """
+    Describe the first injection pattern found in ``config``, or None.
+
+    ASCII configs are scanned by the Hyperscan database when it is available.
+    Otherwise configs without a trigger literal skip ``_SUSPICIOUS_RE``.
+    """
+    if _SUSPICIOUS_DB is not None and config.isascii():
+        scratch = getattr(_scan_state, "scratch", None)
+        if scratch is None:
+            scratch = _scan_state.scratch = _hyperscan.Scratch(_SUSPICIOUS_DB)
+        found: List[int] = []
+        try:
+            _SUSPICIOUS_DB.scan(
+                config.encode(),
+                match_event_handler=_on_injection_match,
+                context=found,
+                scratch=scratch,
+            )
+        except _hyperscan.ScanTerminated:
+            pass
+        return _SUSPICIOUS_PATTERNS[found[0]] if found else None
+
+    if not _may_contain_injection(config):
+        return None
+    match = _SUSPICIOUS_RE.search(config)
+    return repr(match.group(0)) if match else None
+
+
+def _is_suspicious_domain(address_lower: str) -> bool:
+    """Whether the address or any parent domain of it is a suspicious domain.
+
+    Probes the set once per label suffix (``a.b.c`` tries ``a.b.c``, ``b.c``
+    and ``c``), so the cost does not grow with ``SUSPICIOUS_DOMAINS``.
+    """
+    suffix = address_lower
+    while True:
+        if suffix in SUSPICIOUS_DOMAINS:
+            return True
+        dot = suffix.find(".")
+        if dot < 0:
+            return False
+        suffix = suffix[dot + 1 :]
+
+
 # Security issue categories for better classification
 SECURITY_CATEGORIES = {
     "PORT_UNSAFE": "port_security",
@@ -61,6 +225,269 @@ SECURITY_CATEGORIES = {
 }
 
 
+def _is_special_address(address_lower: str) -> bool:
+    """Whether the address is localhost or a private, reserved or special-use IP."""
+    # A trailing root dot resolves to the same host
+    address_lower = address_lower.rstrip(".")
+    # IPv6 literals contain a colon and IPv4 literals end in a digit, while
+    # hostnames end in an alphabetic TLD and skip the ValueError round trip
+    if ":" not in address_lower and not address_lower[-1:].isdigit():
+        return address_lower in _SPECIAL_HOSTNAMES
+    try:
+        ip: Union[ipaddress.IPv4Address, ipaddress.IPv6Address] = ipaddress.ip_address(
+            address_lower
+        )
+    except ValueError:
+        # Resolvers still accept shorthand such as "127.1" or "2130706433",
+        # so normalize it the way they do before classifying
+        if not _DOTTED_NUMBER_RE.fullmatch(address_lower):
+            return False
+        try:
+            ip = ipaddress.IPv4Address(socket.inet_aton(address_lower))
+        except OSError:
+            return False
+    return (
+        ip.is_private
+        or ip.is_loopback
+        or ip.is_link_local
+        or ip.is_reserved
+        or ip.is_unspecified
+        or ip.is_multicast
+    )
+
+
+def _validate_port(port: int) -> Optional[str]:
+    """Check if port is safe and return issue if not."""
+    if port < 1 or port > MAX_PORT:
+        return f"Port out of valid range (1-{MAX_PORT}): {port}"
+    if port in DANGEROUS_PORTS:
+        logger.warning(f"Dangerous port detected: {port}")
+        return f"Dangerous port: {port}"
+    return None
+
+
+def _validate_address(address: str, suspicious_domain_allowlist: FrozenSet[str]) -> Dict[str, str]:
+    """Check address safety and return categorized issues."""
+    return dict(_address_issues(address, suspicious_domain_allowlist))
+
+
+@lru_cache(maxsize=8192)
+def _address_issues(
+    address: str, suspicious_domain_allowlist: FrozenSet[str]
+) -> Tuple[Tuple[str, str], ...]:
+    """Categorized issues of ``address`` as pairs, memoized since hosts repeat across ports."""
+    if not address:
+        return ((SECURITY_CATEGORIES["ADDRESS_SUSPICIOUS"], "Empty address"),)
+
+    address_lower = address.lower()
+
+    # Allow bypass for reserved or test-specific domains
+    if address_lower in suspicious_domain_allowlist or address_lower.endswith(".test"):
+        pass
+    # Check for suspicious patterns (exact or subdomain match)
+    if _is_suspicious_domain(address_lower):
+        logger.warning(f"Suspicious address pattern found: {address}")
+        return (
+            (SECURITY_CATEGORIES["ADDRESS_SUSPICIOUS"], f"Suspicious address pattern: {address}"),
+        )
+
+    # DNS rebinding protection - check for hex notation or octal notation
+    if address_lower.startswith("0x") or _OCTAL_IP_RE.match(address_lower):
+        logger.warning(f"Non-standard IP notation: {address}")
+        return ((SECURITY_CATEGORIES["ADDRESS_SUSPICIOUS"], f"Non-standard notation: {address}"),)
+
+    # Combined check for private, reserved, and special-use addresses
+    if _is_special_address(address_lower):
+        logger.warning(f"Special or private address detected: {address}")
+        return ((SECURITY_CATEGORIES["ADDRESS_PRIVATE"], f"Special address: {address}"),)
+
+    return ()
+
+
+def _validate_protocol(protocol: str) -> Optional[str]:
+    """Validate protocol is recognized."""
+    # Parsed protocols are already lowercase, so lower() only runs on a miss
+    if protocol not in VALID_PROTOCOLS and protocol.lower() not in VALID_PROTOCOLS:
+        return f"Unknown protocol: {protocol}"
+    return None
+
+
+def _validate_config_string(config: str) -> Dict[str, str]:
+    """Check config string for injection attempts and return categorized issues."""
+    issues = {}
+
+    if not config:
+        issues[SECURITY_CATEGORIES["CONFIG_TOO_LONG"]] = "Suspicious: Empty config"
+        return issues
+
+    # Check for null bytes first, a single memchr scan
+    if "\x00" in config:
+        logger.error("Null byte detected in config")
+        issues[SECURITY_CATEGORIES["CONFIG_NULL_BYTE"]] = "Suspicious: Contains null byte"
+        return issues
+
+    # Check for suspicious shell patterns and injection attempts
+    found = _find_injection(config)
+    if found:
+        logger.error(f"Suspicious pattern detected: {found}")
+        issues[SECURITY_CATEGORIES["INJECTION_RISK"]] = (
+            "Suspicious: Potential injection pattern detected"
+        )
+        return issues
+
+    # Check length
+    if len(config) > MAX_CONFIG_LINE_LENGTH:
+        logger.warning(f"Config too long: {len(config)} chars")
+        issues[SECURITY_CATEGORIES["CONFIG_TOO_LONG"]] = (
+            f"Config exceeds max length: {len(config)} chars"
+        )
+        return issues
+
+    return issues
+
+
+def _categorize_issues(
+    port: int, address: str, protocol: str, config: str, policy: ValidationPolicy
+) -> Dict[str, List[str]]:
+    """Security issues of one proxy's fields, grouped by category."""
+    categorized_issues: Dict[str, List[str]] = {}
+
+    # Port validation
+    if policy.check_ports:
+        port_issue = _validate_port(port)
+        if port_issue:
+            categorized_issues.setdefault(SECURITY_CATEGORIES["PORT_UNSAFE"], []).append(port_issue)
+
+    # Address validation
+    if policy.check_suspicious_domains:
+        for category, issue in _address_issues(address, policy.suspicious_domain_allowlist):
+            categorized_issues.setdefault(category, []).append(issue)
+
+    # Protocol validation
+    if policy.check_protocols:
+        protocol_issue = _validate_protocol(protocol)
+        if protocol_issue:
+            categorized_issues.setdefault(SECURITY_CATEGORIES["PROTOCOL_UNKNOWN"], []).append(
+                protocol_issue
+            )
+
+    # Config string validation
+    if policy.check_config_string:
+        config_issues = _validate_config_string(config)
+        for category, issue in config_issues.items():
+            categorized_issues.setdefault(category, []).append(issue)
+
+    return categorized_issues
+
+
+def _validate_proxy_config(
+    proxy: Proxy, policy: ValidationPolicy
+) -> Tuple[bool, Dict[str, List[str]]]:
+    """Validate one proxy; see :meth:`SecurityValidator.validate_proxy_config`."""
+    categorized_issues = _categorize_issues(
+        proxy.port, proxy.address, proxy.protocol, proxy.config, policy
+    )
+    return len(categorized_issues) == 0, categorized_issues
+
+
+def _issue_dict(category: str, issue: Optional[str]) -> Dict[str, str]:
+    return {category: issue} if issue else {}
+
+
+def _categorize_columns(
+    ports: Sequence[int],
+    addresses: Sequence[str],
+    protocols: Sequence[str],
+    configs: Sequence[str],
+    policy: ValidationPolicy,
+) -> List[Dict[str, List[str]]]:
+    """
+    Issues for each proxy given its fields as parallel columns.
+
+    Hosts, ports and protocols repeat heavily within a batch, and whole configs
+    repeat across sources before dedup, so every enabled check runs once per
+    distinct value of its column and each proxy only looks its issues up.
+    Also runs in pool workers.
+    """
+    allowlist = policy.suspicious_domain_allowlist
+
+    # (column, issues per distinct value) in the order validate_proxy_config reports;
+    # the issue dicts are shared between rows and only read
+    checks: List[Tuple[Sequence[Any], Dict[Any, Dict[str, str]]]] = []
+    if policy.check_ports:
+        category = SECURITY_CATEGORIES["PORT_UNSAFE"]
+        checks.append((ports, {p: _issue_dict(category, _validate_port(p)) for p in set(ports)}))
+    if policy.check_suspicious_domains:
+        checks.append((addresses, {a: _validate_address(a, allowlist) for a in set(addresses)}))
+    if policy.check_protocols:
+        category = SECURITY_CATEGORIES["PROTOCOL_UNKNOWN"]
+        checks.append(
+            (protocols, {p: _issue_dict(category, _validate_protocol(p)) for p in set(protocols)})
+        )
+    if policy.check_config_string:
+        checks.append((configs, {c: _validate_config_string(c) for c in set(configs)}))
+    if not checks:
+        return [{} for _ in ports]
+
+    results: List[Dict[str, List[str]]] = []
+    for row in zip(*(map(issues.__getitem__, column) for column, issues in checks)):
+        categorized_issues: Dict[str, List[str]] = {}
+        if any(row):
+            for issues in row:
+                for category, issue in issues.items():
+                    categorized_issues.setdefault(category, []).append(issue)
+        results.append(categorized_issues)
+    return results
+
+
+def _proxy_columns(proxies: Sequence[Proxy]) -> Tuple[List[int], List[str], List[str], List[str]]:
+    """The port, address, protocol and config columns of ``proxies``."""
+    return (
+        [p.port for p in proxies],
+        [p.address for p in proxies],
+        [p.protocol for p in proxies],
+        [p.config for p in proxies],
+    )
+
+
+def _categorize_columns_quietly(
+    ports: Sequence[int],
+    addresses: Sequence[str],
+    protocols: Sequence[str],
+    configs: Sequence[str],
+    policy: ValidationPolicy,
+) -> List[Dict[str, List[str]]]:
+    """:func:`_categorize_columns` for pool workers, whose records never reach the parent."""
+    logger.disabled = True
+    try:
+        return _categorize_columns(ports, addresses, protocols, configs, policy)
+    finally:
+        logger.disabled = False
+
+
+def _categorize_in_pool(
+    proxies: List[Proxy], policy: ValidationPolicy, pool: Executor, workers: int
+) -> List[Dict[str, List[str]]]:
+    """
+    Categorize the issues of ``proxies`` across a process pool, in order.
+
+    Only the four validated columns are pickled, in one slice per worker, so
+    each worker costs a single round trip.
+    """
+    slice_size = -(-len(proxies) // workers)
+    slices = [
+        _proxy_columns(proxies[start : start + slice_size])
+        for start in range(0, len(proxies), slice_size)
+    ]
+    return [
+        issues
+        for chunk in pool.map(
+            _categorize_columns_quietly, *zip(*slices), repeat(policy, len(slices))
+        )
+        for issues in chunk
+    ]
+
+
 class SecurityValidator:
     """Validates proxy configurations for security issues with detailed categorization."""
 
@@ -78,178 +505,29 @@ class SecurityValidator:
         Returns:
             Tuple of (is_secure, categorized_issues_dict)
         """
-        categorized_issues: Dict[str, List[str]] = {}
-
-        # Port validation
-        if policy.check_ports:
-            port_issue = SecurityValidator._validate_port(proxy.port)
-            if port_issue:
-                category = SECURITY_CATEGORIES["PORT_UNSAFE"]
-                if category not in categorized_issues:
-                    categorized_issues[category] = []
-                categorized_issues[category].append(port_issue)
-
-        # Address validation
-        if policy.check_suspicious_domains:
-            address_issues = SecurityValidator._validate_address(
-                proxy.address, policy.suspicious_domain_allowlist
-            )
-            for category, issue in address_issues.items():
-                if category not in categorized_issues:
-                    categorized_issues[category] = []
-                categorized_issues[category].append(issue)
-
-        # Protocol validation
-        if policy.check_protocols:
-            protocol_issue = SecurityValidator._validate_protocol(proxy.protocol)
-            if protocol_issue:
-                category = SECURITY_CATEGORIES["PROTOCOL_UNKNOWN"]
-                if category not in categorized_issues:
-                    categorized_issues[category] = []
-                categorized_issues[category].append(protocol_issue)
-
-        # Config string validation
-        if policy.check_config_string:
-            config_issues = SecurityValidator._validate_config_string(proxy.config)
-            for category, issue in config_issues.items():
-                if category not in categorized_issues:
-                    categorized_issues[category] = []
-                categorized_issues[category].append(issue)
-
-        is_secure = len(categorized_issues) == 0
-        return is_secure, categorized_issues
+        return _validate_proxy_config(proxy, policy)
 
     @staticmethod
     def _validate_port(port: int) -> Optional[str]:
         """Check if port is safe and return issue if not."""
-        if port < 1 or port > MAX_PORT:
-            return f"Port out of valid range (1-{MAX_PORT}): {port}"
-        if port in DANGEROUS_PORTS:
-            logger.warning(f"Dangerous port detected: {port}")
-            return f"Dangerous port: {port}"
-        return None
+        return _validate_port(port)
 
     @staticmethod
     def _validate_address(
         address: str, suspicious_domain_allowlist: FrozenSet[str]
     ) -> Dict[str, str]:
         """Check address safety and return categorized issues."""
-        issues = {}
-
-        if not address:
-            issues[SECURITY_CATEGORIES["ADDRESS_SUSPICIOUS"]] = "Empty address"
-            return issues
-
-        address_lower = address.lower()
-
-        # Allow bypass for reserved or test-specific domains
-        if address_lower in suspicious_domain_allowlist or address_lower.endswith(".test"):
-            pass
-        # Check for suspicious patterns (exact or subdomain match)
-        for suspicious in SUSPICIOUS_DOMAINS:
-            if address_lower == suspicious or address_lower.endswith("." + suspicious):
-                logger.warning(f"Suspicious address pattern found: {address}")
-                issues[SECURITY_CATEGORIES["ADDRESS_SUSPICIOUS"]] = (
-                    f"Suspicious address pattern: {address}"
-                )
-                return issues
-
-        # DNS rebinding protection - check for hex notation or octal notation
-        if address_lower.startswith("0x") or re.match(r"^0[0-7]{1,11}\.", address_lower):
-            logger.warning(f"Non-standard IP notation: {address}")
-            issues[SECURITY_CATEGORIES["ADDRESS_SUSPICIOUS"]] = f"Non-standard notation: {address}"
-            return issues
-
-        # Combined check for private, reserved, and special-use addresses
-        # This is more robust and covers more edge cases.
-        special_address_patterns = [
-            # Loopback
-            r"^127\.",
-            r"^::1$",
-            r"^localhost$",
-            # Private ranges
-            r"^10\.",
-            r"^172\.(1[6-9]|2[0-9]|3[0-1])\.",
-            r"^192\.168\.",
-            # Link-local
-            r"^169\.254\.",
-            r"^fe80:",
-            # Unique local
-            r"^fc00:",
-            r"^fd00:",
-            # Unspecified
-            r"^0\.0\.0\.0$",
-            r"^0\.",  # "This network"
-            # Broadcast
-            r"^255\.255\.255\.255$",
-        ]
-
-        for pattern in special_address_patterns:
-            if re.match(pattern, address_lower):
-                logger.warning(f"Special or private address detected: {address}")
-                issues[SECURITY_CATEGORIES["ADDRESS_PRIVATE"]] = f"Special address: {address}"
-                return issues
-
-        return issues
+        return _validate_address(address, suspicious_domain_allowlist)
 
     @staticmethod
     def _validate_protocol(protocol: str) -> Optional[str]:
         """Validate protocol is recognized."""
-        if protocol.lower() not in VALID_PROTOCOLS:
-            return f"Unknown protocol: {protocol}"
-        return None
+        return _validate_protocol(protocol)
 
     @staticmethod
     def _validate_config_string(config: str) -> Dict[str, str]:
         """Check config string for injection attempts and return categorized issues."""
-        issues = {}
-
-        if not config:
-            issues[SECURITY_CATEGORIES["CONFIG_TOO_LONG"]] = "Suspicious: Empty config"
-            return issues
-
-        # Check for null bytes
-        if "\x00" in config:
-            logger.error("Null byte detected in config")
-            issues[SECURITY_CATEGORIES["CONFIG_NULL_BYTE"]] = "Suspicious: Contains null byte"
-            return issues
-
-        # Check for suspicious shell patterns and injection attempts
-        suspicious_patterns = [
-            r"\$\(",  # Command substitution
-            r"`",  # Backtick command execution
-            r";\s*rm\s",  # Dangerous commands
-            r"&&\s*rm\s",
-            r"\|\s*sh",
-            r"eval\s*\(",
-            r"exec\s*\(",
-            r"<script",  # XSS attempts
-            r"javascript:",  # JavaScript protocol
-            r"data:text/html",  # Data URI XSS
-            r"\bDROP\s+TABLE\b",  # SQL injection
-            r"\bDELETE\s+FROM\b",
-            r"\.\.\/",  # Path traversal
-            r"file:\/\/",  # File protocol
-            r"%00",  # Null byte in URL encoding
-        ]
-
-        for pattern in suspicious_patterns:
-            if re.search(pattern, config, re.IGNORECASE):
-                logger.error(f"Suspicious pattern detected: {pattern}")
-                issues[SECURITY_CATEGORIES["INJECTION_RISK"]] = (
-                    "Suspicious: Potential injection pattern detected"
-                )
-                return issues
-
-        # Check length
-        if len(config) > MAX_CONFIG_LINE_LENGTH:
-            logger.warning(f"Config too long: {len(config)} chars")
-            issues[SECURITY_CATEGORIES["CONFIG_TOO_LONG"]] = (
-                f"Config exceeds max length: {len(config)} chars"
-            )
-            return issues
-
-        return issues
+        return _validate_config_string(config)
 
     # Backward compatibility methods
     @staticmethod
@@ -287,29 +565,49 @@ class SecurityValidator:
         if not url:
             return False, "Empty URL"
 
-        try:
-            parsed = urlparse(url)
+        # Plain printable http(s) URLs are split by hand; anything else,
+        # including bracketed IPv6 hosts, goes through urlparse
+        scheme, separator, rest = url.partition("://")
+        if (
+            separator
+            and scheme in ("http", "https")
+            and url.isascii()
+            and url.isprintable()
+            and "[" not in rest
+            and "]" not in rest
+        ):
+            netloc = _NETLOC_END_RE.split(rest, 1)[0]
+            if not netloc:
+                return False, "Missing domain"
+            hostname = netloc.rpartition("@")[2].partition(":")[0].lower()
+        else:
+            try:
+                parsed = urlparse(url)
 
-            # Must have scheme
-            if not parsed.scheme:
-                return False, "Missing URL scheme"
+                # Must have scheme
+                if not parsed.scheme:
+                    return False, "Missing URL scheme"
 
-            # Must be http or https
-            if parsed.scheme not in ["http", "https"]:
-                return False, f"Invalid scheme: {parsed.scheme}"
+                # Must be http or https
+                if parsed.scheme not in ["http", "https"]:
+                    return False, f"Invalid scheme: {parsed.scheme}"
 
-            # Must have netloc
-            if not parsed.netloc:
-                return False, "Missing domain"
+                # Must have netloc
+                if not parsed.netloc:
+                    return False, "Missing domain"
 
-            # Check for suspicious domains
-            if not SecurityValidator._is_address_safe(parsed.netloc):
-                return False, f"Suspicious domain: {parsed.netloc}"
+                netloc = parsed.netloc
+                hostname = parsed.hostname or ""
 
-            return True, None
+            except Exception as e:
+                return False, f"URL parsing error: {str(e)}"
 
-        except Exception as e:
-            return False, f"URL parsing error: {str(e)}"
+        # Check for suspicious domains; the host alone, since a port or
+        # credentials in the netloc would hide an IP literal from ipaddress
+        if _address_issues(hostname, frozenset()):
+            return False, f"Suspicious domain: {netloc}"
+
+        return True, None
 
     @staticmethod
     def sanitize_log_message(message: str, mask_patterns: bool = True) -> str:
@@ -326,25 +624,16 @@ class SecurityValidator:
         if not mask_patterns:
             return message
 
-        sanitized = message
-
-        # Mask UUIDs
-        uuid_pattern = r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"
-        sanitized = re.sub(uuid_pattern, "[UUID]", sanitized, flags=re.IGNORECASE)
-
-        # Mask passwords in URLs
-        password_pattern = r":([^@\s]+)@"
-        sanitized = re.sub(password_pattern, r":[MASKED]@", sanitized)
-
-        # Mask base64 encoded data (if > 20 chars)
-        base64_pattern = r"\b[A-Za-z0-9+/]{20,}={0,2}\b"
-        sanitized = re.sub(base64_pattern, "[BASE64]", sanitized)
-
-        return sanitized
+        # Mask UUIDs, then passwords in URLs, then base64 encoded data
+        sanitized = _UUID_RE.sub("[UUID]", message)
+        sanitized = _URL_PASSWORD_RE.sub(":[MASKED]@", sanitized)
+        return _BASE64_RE.sub("[BASE64]", sanitized)
 
 
 def validate_batch_configs(
-    proxies: List[Proxy], policy: ValidationPolicy = STRICT_POLICY
+    proxies: List[Proxy],
+    policy: ValidationPolicy = STRICT_POLICY,
+    pool: Optional[Executor] = None,
 ) -> List[Proxy]:
     """
     Validate a batch of proxy configurations and filter out insecure ones.
@@ -352,23 +641,38 @@ def validate_batch_configs(
     Args:
         proxies: List of proxy objects
         policy: The validation policy to apply.
+        pool: Process pool for large batches; without one, a pool is started
+            for the batch and shut down after it.
 
     Returns:
         List of secure proxy objects
     """
-    validator = SecurityValidator()
     secure_proxies = []
 
-    for proxy in proxies:
-        is_secure, categorized_issues = validator.validate_proxy_config(proxy, policy=policy)
-
-        if not is_secure:
+    workers = os.cpu_count() or 1
+    results: Iterable[Dict[str, List[str]]]
+    if workers > 1 and len(proxies) >= PARALLEL_VALIDATION_MIN_BATCH:
+        if pool is not None:
+            results = _categorize_in_pool(proxies, policy, pool, workers)
+        else:
+            # Callers may already run threads, so workers are not forked
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(POOL_START_METHOD)
+            ) as batch_pool:
+                results = _categorize_in_pool(proxies, policy, batch_pool, workers)
+    else:
+        results = _categorize_columns(*_proxy_columns(proxies), policy)
+
+    for proxy, categorized_issues in zip(proxies, results):
+        if categorized_issues:
             all_issues = []
             for category, issues_list in categorized_issues.items():
                 all_issues.extend(issues_list)
 
-            logger.warning(f"Insecure proxy filtered: {proxy.address}:{proxy.port}")
-            logger.debug(f"Security issues: {', '.join(all_issues)}")
+            # Pool workers cannot log, so the issues are reported here
+            logger.warning(
+                f"Insecure proxy filtered: {proxy.address}:{proxy.port} ({', '.join(all_issues)})"
+            )
             proxy.is_secure = False
             proxy.security_issues = categorized_issues
         else:
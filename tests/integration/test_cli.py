@@ -29,6 +29,19 @@ def test_cli_merge_failure(runner, mocker):
     assert "Pipeline failed" in result.output
 
 
+def test_cli_closes_shared_client_after_failed_command(runner, mocker):
+    mocker.patch(
+        "configstream.cli.pipeline.run_full_pipeline",
+        return_value={"success": False, "error": "Test error"},
+    )
+    close = mocker.patch("configstream.cli.close_shared_client")
+    result = runner.invoke(
+        cli, ["merge", "--sources", "tests/fixtures/sources.txt", "--output", "/tmp/"]
+    )
+    assert result.exit_code != 0
+    close.assert_awaited_once()
+
+
 def test_cli_retest_success(runner, mocker, tmp_path):
     mocker.patch("configstream.cli.pipeline.run_full_pipeline", return_value={"success": True})
     proxies_file = tmp_path / "proxies.json"
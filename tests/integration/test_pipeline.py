@@ -114,6 +114,12 @@ class TestMaybeDecodeBase64:
             base64.b64decode(payload, validate=True)  # Ensure it's actually invalid
         assert _maybe_decode_base64(payload) == payload
 
+    def test_plain_subscription_skips_decode(self, mocker):
+        payload = "vmess://abcdefg\ntrojan://pw@host:443\n"
+        decode = mocker.patch("configstream.pipeline._base64.b64decode")
+        assert _maybe_decode_base64(payload) == payload
+        decode.assert_not_called()
+
     def test_base64_decoding_to_invalid_utf8(self):
         invalid_utf8_bytes = b"\xff\xfe"
         encoded = base64.b64encode(invalid_utf8_bytes).decode()
@@ -414,3 +420,121 @@ async def test_run_full_pipeline_multiple_batches(mocker, tmp_path, caplog, no_p
         # Check for log messages indicating multiple batches
         assert "Testing batch 1/2" in caplog.text
         assert "Testing batch 2/2" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_run_full_pipeline_times_geo_stage_once(mocker, tmp_path, no_pool_shutdown):
+    """Test that concurrent geo lookups are not summed into geo_seconds."""
+    import asyncio
+
+    configs = [create_valid_vmess_config(f"geo{i}", add=f"geo{i}.example.com") for i in range(8)]
+    mocker.patch(
+        "configstream.pipeline._process_sources",
+        new_callable=AsyncMock,
+        return_value=(configs, len(configs)),
+    )
+    mocker.patch(
+        "configstream.pipeline.SingBoxTester.test",
+        new_callable=AsyncMock,
+        side_effect=lambda p: Proxy(
+            config=p.config, protocol=p.protocol, address=p.address, port=p.port, is_working=True
+        ),
+    )
+
+    async def slow_lookup(proxy, reader):
+        await asyncio.sleep(0.2)
+
+    mocker.patch("configstream.pipeline.geolocate_proxy", side_effect=slow_lookup)
+
+    result = await run_full_pipeline(
+        sources=["source.txt"], output_dir=str(tmp_path), leniency=True
+    )
+
+    assert result["stats"]["working"] == 8
+    # Eight overlapping 0.2 s lookups; summing them per worker would report 1.6 s
+    assert 0.2 <= result["metrics"]["geo_seconds"] < 0.8
+
+
+@pytest.mark.asyncio
+async def test_run_full_pipeline_leaves_shared_client_open(mocker, tmp_path, no_pool_shutdown):
+    """Test that a run does not close the process-wide client under other users."""
+    from configstream.http_client import close_shared_client, get_shared_client
+
+    configs = [create_valid_vmess_config("shared")]
+    mocker.patch(
+        "configstream.pipeline._process_sources",
+        new_callable=AsyncMock,
+        return_value=(configs, len(configs)),
+    )
+    mocker.patch("configstream.pipeline.SingBoxTester.test", new_callable=AsyncMock)
+    client = get_shared_client()
+
+    await run_full_pipeline(sources=["source.txt"], output_dir=str(tmp_path), leniency=True)
+
+    assert not client.is_closed
+    assert get_shared_client() is client
+    await close_shared_client()
+
+
+@pytest.mark.asyncio
+async def test_run_full_pipeline_caches_only_looked_up_locations(
+    mocker, tmp_path, no_pool_shutdown, mock_geo_lookup
+):
+    """Test that a remark's country is not reused for its network neighbours."""
+    configs = [
+        create_valid_vmess_config("DE node", add="93.184.216.5"),
+        create_valid_vmess_config("plain", add="93.184.216.6"),
+    ]
+    mocker.patch(
+        "configstream.pipeline._process_sources",
+        new_callable=AsyncMock,
+        return_value=(configs, len(configs)),
+    )
+    tested: list[Proxy] = []
+
+    async def record_test(proxy):
+        proxy.is_working = True
+        tested.append(proxy)
+        return proxy
+
+    mocker.patch("configstream.pipeline.SingBoxTester.test", side_effect=record_test)
+
+    await run_full_pipeline(sources=["source.txt"], output_dir=str(tmp_path), leniency=True)
+
+    codes = {proxy.address: proxy.country_code for proxy in tested}
+    assert codes == {"93.184.216.5": "DE", "93.184.216.6": "US"}
+    mock_geo_lookup.assert_awaited_once_with("93.184.216.6")
+
+
+@pytest.mark.asyncio
+async def test_run_full_pipeline_geo_time_excludes_testing(mocker, tmp_path, no_pool_shutdown):
+    """Test that geo workers waiting on slow tests do not count as geo time."""
+    import asyncio
+
+    configs = [create_valid_vmess_config(f"geo{i}", add=f"geo{i}.example.com") for i in range(4)]
+    mocker.patch(
+        "configstream.pipeline._process_sources",
+        new_callable=AsyncMock,
+        return_value=(configs, len(configs)),
+    )
+
+    async def slow_test(proxy):
+        await asyncio.sleep(0.3)
+        return Proxy(
+            config=proxy.config,
+            protocol=proxy.protocol,
+            address=proxy.address,
+            port=proxy.port,
+            is_working=True,
+        )
+
+    mocker.patch("configstream.pipeline.SingBoxTester.test", side_effect=slow_test)
+    mocker.patch("configstream.pipeline.geolocate_proxy", new_callable=AsyncMock)
+
+    result = await run_full_pipeline(
+        sources=["source.txt"], output_dir=str(tmp_path), leniency=True
+    )
+
+    assert result["stats"]["working"] == 4
+    # The geo stage spans the 0.3 s of testing, but no lookup waits on anything
+    assert result["metrics"]["geo_seconds"] < 0.1
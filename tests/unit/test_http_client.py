@@ -25,3 +25,39 @@ async def test_get_client_http2_unavailable():
                 pass
             _, kwargs = mock_client.call_args
             assert kwargs.get("http2") is False
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_until_closed():
+    """Test that the shared client is built once and rebuilt after closing."""
+    from configstream.http_client import close_shared_client, get_shared_client
+
+    first = get_shared_client()
+    assert get_shared_client() is first
+
+    await close_shared_client()
+    assert first.is_closed
+
+    second = get_shared_client()
+    assert second is not first
+    await close_shared_client()
+
+
+@pytest.mark.asyncio
+async def test_shared_client_from_another_loop_is_closed():
+    """Test that a loop change closes the client built on the previous loop."""
+    import asyncio
+
+    from configstream import http_client
+
+    old_loop = asyncio.new_event_loop()
+    old_loop.close()
+    stale = http_client._build_client(0)
+    http_client._shared_client, http_client._shared_client_loop = stale, old_loop
+
+    fresh = http_client.get_shared_client()
+    assert fresh is not stale
+    await asyncio.gather(*http_client._retiring)
+
+    assert stale.is_closed
+    await http_client.close_shared_client()
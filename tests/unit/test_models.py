@@ -112,3 +112,53 @@ def test_proxy_path_property():
 
     proxy2 = Proxy(config="test", protocol="vmess", address="1.2.3.4", port=443)
     assert proxy2.path == ""
+
+
+def test_proxy_copy_is_shallow_and_independent():
+    """Test that copy.copy duplicates every field without sharing the instance."""
+    import copy
+    from dataclasses import astuple
+
+    from configstream.models import Proxy
+
+    proxy = Proxy(
+        config="test",
+        protocol="vmess",
+        address="1.2.3.4",
+        port=443,
+        latency=12.5,
+        is_working=True,
+        details={"sni": "example.com"},
+    )
+
+    clone = copy.copy(proxy)
+
+    assert clone is not proxy
+    assert clone == proxy
+    assert astuple(clone) == astuple(proxy)
+    clone.latency = 99.0
+    assert proxy.latency == 12.5
+    assert clone.details is proxy.details
+
+
+def test_proxy_security_flags_follow_details():
+    """Test that security_flags reflects the current details and DoH status."""
+    from configstream.models import (
+        SECURITY_AEAD,
+        SECURITY_DOH,
+        SECURITY_ENCRYPTION,
+        SECURITY_TLS,
+        Proxy,
+    )
+
+    proxy = Proxy(config="test", protocol="vmess", address="1.2.3.4", port=443)
+    assert proxy.security_flags == 0
+
+    proxy.details = {"tls": True, "encryption": "auto", "aead": False}
+    assert proxy.security_flags == SECURITY_TLS | SECURITY_ENCRYPTION
+
+    proxy.details["aead"] = True
+    proxy.dns_over_https_ok = True
+    assert proxy.security_flags == (
+        SECURITY_TLS | SECURITY_AEAD | SECURITY_ENCRYPTION | SECURITY_DOH
+    )
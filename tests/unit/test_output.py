@@ -2,9 +2,11 @@ import pytest
 from configstream.models import Proxy
 from configstream.output import (
     generate_base64_subscription,
+    generate_base64_subscription_bytes,
     generate_clash_config,
     generate_singbox_config,
     generate_shadowrocket_subscription,
+    generate_shadowrocket_subscription_bytes,
     generate_quantumult_config,
     generate_surge_config,
 )
@@ -94,3 +96,47 @@ def test_generate_surge_config(sample_proxies):
     """Test the Surge config generation."""
     result = generate_surge_config(sample_proxies)
     assert "[Proxy]" in result
+
+
+def test_generate_shadowrocket_subscription_reuses_buffer_cleanly(sample_proxies):
+    """Test that consecutive calls do not leak lines through the shared buffer."""
+    import base64
+
+    first = generate_shadowrocket_subscription(sample_proxies)
+    second = generate_shadowrocket_subscription(sample_proxies[:1])
+
+    assert base64.b64decode(first).decode("utf-8").count("\n") == 1
+    assert base64.b64decode(second).decode("utf-8") == (
+        f"{sample_proxies[0].remarks} = {sample_proxies[0].config}"
+    )
+    assert generate_shadowrocket_subscription([]) == ""
+
+
+def test_protocol_case_is_normalised_for_unknown_protocols():
+    """Test that cached case folding also covers protocols outside VALID_PROTOCOLS."""
+    import json
+
+    proxy = Proxy(
+        config="Custom://example",
+        protocol="Custom",
+        address="example.com",
+        port=443,
+        remarks="custom",
+        is_working=True,
+    )
+
+    outbound = json.loads(generate_singbox_config([proxy]))["outbounds"][0]
+    assert outbound["type"] == "custom"
+    assert "custom = CUSTOM, example.com, 443" in generate_surge_config([proxy])
+    assert "custom = custom, example.com, 443" in generate_quantumult_config([proxy])
+
+
+def test_subscription_bytes_variants_match_str_variants(sample_proxies):
+    """Test that the bytes variants carry exactly the str payloads, encoded."""
+    assert generate_base64_subscription_bytes(sample_proxies) == (
+        generate_base64_subscription(sample_proxies).encode("utf-8")
+    )
+    assert generate_shadowrocket_subscription_bytes(sample_proxies) == (
+        generate_shadowrocket_subscription(sample_proxies).encode("ascii")
+    )
+    assert generate_base64_subscription_bytes([]) == b""
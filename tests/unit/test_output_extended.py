@@ -191,6 +191,11 @@ def test_generate_categorized_outputs_empty_list():
         assert summary_data["total_tested"] == 0
         assert summary_data["passed"] == 0
 
+        # Category directories are only created when a file is written into them
+        assert not (output_dir / "by_protocol").exists()
+        assert not (output_dir / "by_country").exists()
+        assert not (output_dir / "rejected").exists()
+
 
 def test_generate_categorized_outputs_all_working():
     """Test output generation with all working proxies."""
@@ -239,3 +244,115 @@ def test_generate_categorized_outputs_all_working():
         assert summary_data["passed"] == 1
         assert summary_data["rejected"]["total_security_issues"] == 0
         assert summary_data["rejected"]["no_response"] == 0
+
+
+def test_generate_categorized_outputs_parallel_writes_are_complete():
+    """Test that concurrently written files are complete and colliding paths are last-wins."""
+    protocols = ["vmess", "vless", "trojan", "ss", "hysteria2", "tuic"]
+    proxies = [
+        Proxy(
+            config=f"{protocol}://test{index}",
+            protocol=protocol,
+            address=f"1.2.3.{index}",
+            port=443,
+            country_code="US" if index % 2 else "us",
+            latency=100.0 + index,
+            is_working=True,
+        )
+        for index, protocol in enumerate(protocols)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = Path(tmpdir)
+        output_files = generate_categorized_outputs(proxies, output_dir)
+
+        for protocol in protocols:
+            data = json.loads(Path(output_files[f"protocol_{protocol}"]).read_text())
+            assert [entry["protocol"] for entry in data] == [protocol]
+
+        # "US" and "us" share us.json; the later category must win, as before
+        country_data = json.loads((output_dir / "by_country" / "us.json").read_text())
+        assert {entry["country_code"] for entry in country_data} == {"US"}
+
+
+def test_write_output_bytes_truncates_existing_file(tmp_path):
+    """Test that raw writes replace, rather than append to, existing content."""
+    from configstream.output import write_output_bytes
+
+    target = tmp_path / "summary.json"
+    target.write_bytes(b"x" * 64)
+
+    write_output_bytes(target, b'{"ok": true}')
+
+    assert target.read_bytes() == b'{"ok": true}'
+
+
+def test_generate_categorized_outputs_compact_unless_pretty(tmp_path):
+    """Test that proxy lists are compact by default while the summary stays indented."""
+    proxy = Proxy(
+        config="vmess://test1",
+        protocol="vmess",
+        address="1.2.3.4",
+        port=443,
+        country_code="US",
+        is_working=True,
+    )
+
+    compact_files = generate_categorized_outputs([proxy], tmp_path / "compact")
+    assert "\n" not in Path(compact_files["protocol_vmess"]).read_text()
+    assert "\n" in Path(compact_files["summary"]).read_text()
+
+    pretty_files = generate_categorized_outputs([proxy], tmp_path / "pretty", pretty=True)
+    pretty_text = Path(pretty_files["protocol_vmess"]).read_text()
+    assert "\n" in pretty_text
+    assert json.loads(pretty_text) == json.loads(Path(compact_files["protocol_vmess"]).read_text())
+
+
+def test_write_output_bytes_large_payload_uses_mmap(tmp_path, monkeypatch):
+    """Test that payloads above the threshold are written intact via mmap."""
+    from configstream import output
+
+    monkeypatch.setattr(output, "MMAP_WRITE_THRESHOLD", 1024)
+    target = tmp_path / "large.json"
+    target.write_bytes(b"x" * 8192)
+    payload = bytes(range(256)) * 8
+
+    output.write_output_bytes(target, payload)
+
+    assert target.read_bytes() == payload
+
+
+def test_generate_categorized_outputs_recreates_removed_directories(tmp_path):
+    """Test that cached directory creation recovers when a directory is deleted."""
+    import shutil
+
+    proxy = Proxy(
+        config="vmess://test1",
+        protocol="vmess",
+        address="1.2.3.4",
+        port=443,
+        country_code="US",
+        is_working=True,
+    )
+
+    generate_categorized_outputs([proxy], tmp_path)
+    shutil.rmtree(tmp_path / "by_protocol")
+
+    output_files = generate_categorized_outputs([proxy], tmp_path)
+
+    assert Path(output_files["protocol_vmess"]).exists()
+
+
+def test_write_output_lines_matches_newline_join(tmp_path):
+    """Test that streamed lines produce exactly the bytes of a newline join."""
+    from configstream.output import write_output_lines
+
+    target = tmp_path / "configs_raw.txt"
+    target.write_bytes(b"x" * 64)
+    lines = ["vmess://a", "trojan://pw@héllo:443", "ss://c"]
+
+    write_output_lines(target, iter(lines))
+    assert target.read_bytes() == "\n".join(lines).encode("utf-8")
+
+    write_output_lines(target, [])
+    assert target.read_bytes() == b""
@@ -53,12 +53,31 @@ class TestBase64Validation:
         assert result.endswith("=")
         assert len(result) % 4 == 0
 
+    def test_validate_strips_embedded_whitespace(self):
+        """Test that whitespace inside the payload is removed before decoding"""
+        assert _validate_b64_input(" SGVs\nbG8g\r\nV29y\tbGQ= ") == "SGVsbG8gV29ybGQ="
+
+    def test_validate_rejects_non_ascii(self):
+        """Test that non-ASCII characters are treated as invalid base64"""
+        assert _validate_b64_input("SGVsbG8é") is None
+
     def test_safe_decode_valid(self):
         """Test decoding valid base64"""
         b64 = "SGVsbG8gV29ybGQ="
         result = _safe_b64_decode(b64)
         assert result == "Hello World"
 
+    def test_safe_decode_fast_path_matches_validated_path(self):
+        """Test that clean short input and whitespace-wrapped input decode identically"""
+        assert _safe_b64_decode("SGVsbG8") == "Hello"
+        assert _safe_b64_decode("SGVs\nbG8") == "Hello"
+        assert _safe_b64_decode("SGVsbG8é") == "SGVsbG8é"
+
+    def test_safe_decode_rejects_misplaced_padding(self):
+        """Test that padding inside or after the data is still rejected"""
+        for bad in ("SG=VsbG8=", "SGVsbG8=====", "SGVsbA==SGVsbA=="):
+            assert _safe_b64_decode(bad) == bad
+
     def test_safe_decode_returns_original_on_failure(self):
         """Test that invalid base64 returns original string"""
         invalid = "Not base64 at all!"
@@ -171,6 +190,18 @@ class TestPlausibilityCheck:
         bad_config = "vmess://" + "!@#$%^&*()" * 100
         assert _is_plausible_proxy_config(bad_config) is False
 
+    def test_plausible_counts_unicode_letters_as_alphanumeric(self):
+        """Test that the ASCII and non-ASCII paths agree on the threshold"""
+        assert _is_plausible_proxy_config("vless://ab!!") is True
+        assert _is_plausible_proxy_config("vless://ab!!!") is False
+        assert _is_plausible_proxy_config("vless://éé!!") is True
+        assert _is_plausible_proxy_config("vless://éé!!!") is False
+
+    def test_plausible_decides_from_prefix(self):
+        """Test that only the first 128 characters of the body are sampled"""
+        assert _is_plausible_proxy_config("vless://" + "a" * 128 + "!" * 1000) is True
+        assert _is_plausible_proxy_config("vless://" + "!" * 128 + "a" * 1000) is False
+
 
 class TestVMessParser:
     """Tests for VMess configuration parsing with validation"""
@@ -200,6 +231,13 @@ class TestVMessParser:
         assert result.port == 443
         assert result.uuid == "uuid-goes-here"
 
+    def test_parse_rejects_non_utf8_payload(self):
+        """Test that a payload that is not UTF-8 JSON is rejected without raising"""
+        import base64
+
+        b64_data = base64.b64encode(b'{"add": "\xff\xfe"}').decode()
+        assert _parse_vmess(f"vmess://{b64_data}") is None
+
     def test_parse_rejects_invalid_port(self):
         """Test that invalid port numbers are rejected"""
         import base64
@@ -293,6 +331,22 @@ class TestConfigExtractionEdgeCases:
         result = _extract_config_lines(payload)
         assert len(result) == 2
 
+    def test_extract_requires_exact_protocol_prefix(self):
+        """Test that prefixes sharing a protocol's first letters are not accepted."""
+        payload = "ssr://abcdef\nssx://abcdef\nvmessx://abcdef\nVMESS://abcdef\nhy2://abcdef"
+        assert _extract_config_lines(payload) == ["ssr://abcdef", "hy2://abcdef"]
+
+    def test_extract_splits_on_all_line_boundaries(self):
+        """Test that every str.splitlines boundary separates configs."""
+        payload = "  vmess://abcdef \r\nss://abcdef\x85trojan://abcdef\u2028\tssr://abcdef\r"
+        assert _extract_config_lines(payload) == [
+            "vmess://abcdef",
+            "ss://abcdef",
+            "trojan://abcdef",
+            "ssr://abcdef",
+        ]
+        assert _extract_config_lines(payload, max_lines=2) == ["vmess://abcdef", "ss://abcdef"]
+
     def test_extract_handles_non_string_payload(self):
         """Test that non-string input is handled gracefully."""
         result = _extract_config_lines(12345)
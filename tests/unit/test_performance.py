@@ -17,3 +17,40 @@ def test_performance_tracker_records_phases() -> None:
     assert snapshot.fetch_seconds > 0
     assert snapshot.test_seconds > snapshot.fetch_seconds / 2
     assert snapshot.proxies_per_second == snapshot.proxies_tested / snapshot.total_seconds
+
+
+def test_performance_snapshot_to_dict_includes_every_field() -> None:
+    from dataclasses import fields
+
+    from configstream.performance import PerformanceSnapshot
+
+    snapshot = PerformanceSnapshot(total_seconds=2.0, proxies_tested=4, sources_processed=1)
+    data = snapshot.to_dict()
+
+    assert set(data) == {f.name for f in fields(snapshot)} | {"proxies_per_second"}
+    assert data["proxies_per_second"] == 2.0
+    assert data["sources_processed"] == 1
+
+
+def test_performance_tracker_accepts_unreported_phases() -> None:
+    tracker = PerformanceTracker()
+
+    with tracker.phase("read_files"):
+        pass
+    with tracker.phase("parse"):
+        time.sleep(0.001)
+
+    snapshot = tracker.snapshot()
+
+    assert snapshot.parse_seconds > 0
+    assert snapshot.fetch_seconds == 0.0
+
+
+def test_performance_tracker_adds_measured_time() -> None:
+    tracker = PerformanceTracker()
+
+    tracker.add_time("geo", 250_000_000)
+    tracker.add_time("geo", 250_000_000)
+    tracker.add_time("read_files", 1_000)
+
+    assert tracker.snapshot().geo_seconds == 0.5
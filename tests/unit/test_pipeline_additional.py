@@ -75,3 +75,181 @@ def test_prepare_sources_filters_invalid():
     # Should only include valid URL
     assert len(result) == 1
     assert "http://example.com/valid" in result
+
+
+async def test_fetch_source_uses_the_supplied_client():
+    """Test that fetches go through the caller's pooled client."""
+    import httpx
+
+    from configstream.pipeline import _fetch_source
+
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return httpx.Response(200, text="vmess://abcdef\ntrojan://pw@host:443\n")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        configs, count = await _fetch_source(client, "https://example.com/sub")
+
+    assert requested == ["https://example.com/sub"]
+    assert configs == ["vmess://abcdef", "trojan://pw@host:443"]
+    assert count == 2
+
+
+async def test_process_sources_bounds_concurrent_fetches(monkeypatch):
+    """Test that remote fetches never exceed FETCH_CONCURRENCY in flight."""
+    import asyncio
+
+    from configstream import pipeline
+    from configstream.performance import PerformanceTracker
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch(client, source):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if source.endswith("/bad"):
+            raise RuntimeError("boom")
+        return [f"vmess://{source[-1]}abcd"], 1
+
+    monkeypatch.setattr(pipeline, "FETCH_CONCURRENCY", 2)
+    monkeypatch.setattr(pipeline, "_fetch_source", fake_fetch)
+
+    sources = [f"https://example.com/{i}" for i in range(6)] + ["https://example.com/bad"]
+    configs, total = await pipeline._process_sources(sources, None, PerformanceTracker())
+
+    assert peak == 2
+    assert total == 6
+    assert sorted(configs) == sorted(f"vmess://{i}abcd" for i in range(6))
+
+
+async def test_process_sources_streams_to_callback(monkeypatch):
+    """Test that on_configs receives each source's configs instead of the return value."""
+    from configstream import pipeline
+    from configstream.performance import PerformanceTracker
+
+    async def fake_fetch(client, source):
+        return [f"vmess://{source[-1]}abcd"], 1
+
+    monkeypatch.setattr(pipeline, "_fetch_source", fake_fetch)
+
+    received = []
+    configs, total = await pipeline._process_sources(
+        ["https://example.com/1", "https://example.com/2"],
+        None,
+        PerformanceTracker(),
+        on_configs=received.append,
+    )
+
+    assert configs == []
+    assert total == 2
+    assert sorted(received) == [["vmess://1abcd"], ["vmess://2abcd"]]
+
+
+async def test_parse_in_pool_keeps_input_order(monkeypatch):
+    """Test that pooled parsing returns one result per config in input order."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from configstream import pipeline
+    from configstream.constants import POOL_START_METHOD
+
+    monkeypatch.setattr(pipeline.os, "cpu_count", lambda: 4)
+    raw = [f"trojan://pw@host{i}.example.com:443" for i in range(9)]
+    raw.insert(5, "not-a-config")
+    done = []
+
+    context = multiprocessing.get_context(POOL_START_METHOD)
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+        results = await pipeline._parse_in_pool(pool, raw, done.append)
+
+    assert sorted(done) == [1, 3, 3, 3]
+    assert results[5] is None
+    addresses = [proxy.address for proxy in results if proxy is not None]
+    assert addresses == [f"host{i}.example.com" for i in range(9)]
+
+
+def test_warm_page_cache_tolerates_unmappable_files(tmp_path):
+    """Test that preloading reads real files and skips empty or missing ones."""
+    from configstream.pipeline import _warm_page_cache
+
+    database = tmp_path / "city.mmdb"
+    database.write_bytes(b"\x00" * 10_000)
+    empty = tmp_path / "empty.mmdb"
+    empty.write_bytes(b"")
+
+    _warm_page_cache(database)
+    _warm_page_cache(empty)
+    _warm_page_cache(tmp_path / "missing.mmdb")
+
+
+def test_geo_cache_key_groups_addresses_by_network():
+    """Test that addresses in one /24 (or IPv6 /48) share a geolocation cache key."""
+    from configstream.pipeline import _geo_cache_key
+
+    assert _geo_cache_key("203.0.113.7") == _geo_cache_key("203.0.113.250") == "203.0.113.0/24"
+    assert _geo_cache_key("203.0.114.7") != _geo_cache_key("203.0.113.7")
+    assert _geo_cache_key("2001:db8:1:2::1") == "2001:db8:1::/48"
+    assert _geo_cache_key("proxy.example.com") == "proxy.example.com"
+
+
+def test_dedupe_and_shuffle_large_lists_use_numpy(monkeypatch):
+    """Test that the numpy shuffle path is a deterministic permutation for a fixed seed."""
+    pytest.importorskip("numpy")
+    from configstream import pipeline
+    from configstream.models import Proxy
+
+    monkeypatch.setenv("CONFIGSTREAM_SHUFFLE_SEED", "seed")
+    monkeypatch.delenv("GITHUB_EVENT_NAME", raising=False)
+    monkeypatch.setattr(pipeline, "NUMPY_SHUFFLE_MIN_SIZE", 10)
+    proxies = [
+        Proxy(config=f"vmess://{i}", protocol="vmess", address=f"h{i}", port=443) for i in range(50)
+    ]
+
+    first = pipeline.dedupe_and_shuffle(proxies)
+    second = pipeline.dedupe_and_shuffle(proxies)
+
+    assert [p.config for p in first] == [p.config for p in second]
+    assert sorted(p.config for p in first) == sorted(p.config for p in proxies)
+
+
+def test_sort_by_latency_matches_lambda_sort():
+    """Test that the latency sort keeps untimed proxies last in their original order."""
+    from configstream.pipeline import _sort_by_latency
+    from configstream.models import Proxy
+
+    latencies = [120.0, None, 35.5, 0.0, 120.0, 80.0, None]
+    proxies = [
+        Proxy(config=f"vmess://{i}", protocol="vmess", address=f"h{i}", port=443, latency=latency)
+        for i, latency in enumerate(latencies)
+    ]
+
+    expected = sorted(proxies, key=lambda p: p.latency or float("inf"))
+    assert _sort_by_latency(proxies) == expected
+    assert [p.config for p in _sort_by_latency(proxies)][-3:] == [
+        "vmess://1",
+        "vmess://3",
+        "vmess://6",
+    ]
+
+
+def test_proxy_key_is_memoized_and_survives_copy():
+    """Test that the dedup key is cached on the proxy and inherited by copies."""
+    import copy
+
+    from configstream.models import Proxy
+    from configstream.pipeline import _proxy_key
+
+    proxy = Proxy(config="vmess://memo", protocol="vmess", address="h", port=443)
+    key = _proxy_key(proxy)
+
+    assert proxy._dedup_key == key
+    clone = copy.copy(proxy)
+    assert clone._dedup_key == key
+    assert _proxy_key(clone) == key
+    assert _proxy_key(Proxy(config="vmess://memo", protocol="vmess", address="h", port=443)) == key
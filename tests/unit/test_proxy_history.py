@@ -10,7 +10,22 @@ from configstream.models import Proxy
 @pytest.fixture
 def temp_history_path(tmp_path):
     """Create a temporary history path."""
-    return tmp_path / "proxy_history.json"
+    return tmp_path / "proxy_history.sqlite"
+
+
+@pytest.fixture
+def make_tracker():
+    """Create trackers that are closed when the test ends."""
+    trackers = []
+
+    def make(**kwargs):
+        tracker = ProxyHistoryTracker(**kwargs)
+        trackers.append(tracker)
+        return tracker
+
+    yield make
+    for tracker in trackers:
+        tracker.close()
 
 
 @pytest.fixture
@@ -27,64 +42,85 @@ def sample_proxy():
     )
 
 
-def test_tracker_initialization(temp_history_path):
+def test_tracker_initialization(temp_history_path, make_tracker):
     """Test tracker initialization."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path, max_entries=50)
+    tracker = make_tracker(history_path=temp_history_path, max_entries=50)
     assert tracker.history_path == temp_history_path
     assert tracker.max_entries == 50
     assert temp_history_path.parent.exists()
 
 
-def test_record_test_result(temp_history_path, sample_proxy):
+def test_record_test_result(temp_history_path, sample_proxy, make_tracker):
     """Test recording a test result."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     tracker.record_test_result(sample_proxy)
 
     # Verify data was saved
     assert temp_history_path.exists()
-    data = json.loads(temp_history_path.read_text())
+    history = tracker.get_proxy_history(sample_proxy.config)
 
-    assert sample_proxy.config in data
-    assert data[sample_proxy.config]["protocol"] == "vmess"
-    assert len(data[sample_proxy.config]["entries"]) == 1
-    assert data[sample_proxy.config]["entries"][0]["is_working"] is True
-    assert data[sample_proxy.config]["entries"][0]["latency"] == 100
+    assert history is not None
+    assert history["protocol"] == "vmess"
+    assert len(history["entries"]) == 1
+    assert history["entries"][0]["is_working"] is True
+    assert history["entries"][0]["latency"] == 100
 
 
-def test_multiple_test_results(temp_history_path, sample_proxy):
+def test_multiple_test_results(temp_history_path, sample_proxy, make_tracker):
     """Test recording multiple test results."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     # Record 5 test results
     for i in range(5):
         sample_proxy.latency = 100 + i * 10
         tracker.record_test_result(sample_proxy)
 
-    data = json.loads(temp_history_path.read_text())
-    assert len(data[sample_proxy.config]["entries"]) == 5
+    history = tracker.get_proxy_history(sample_proxy.config)
+    assert len(history["entries"]) == 5
 
 
-def test_max_entries_limit(temp_history_path, sample_proxy):
+def test_max_entries_limit(temp_history_path, sample_proxy, make_tracker):
     """Test that max_entries limit is enforced."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path, max_entries=3)
+    tracker = make_tracker(history_path=temp_history_path, max_entries=3)
 
     # Record 5 results
     for i in range(5):
         sample_proxy.latency = 100 + i * 10
         tracker.record_test_result(sample_proxy)
 
-    data = json.loads(temp_history_path.read_text())
+    entries = tracker.get_proxy_history(sample_proxy.config)["entries"]
     # Should only keep last 3 entries
-    assert len(data[sample_proxy.config]["entries"]) == 3
+    assert len(entries) == 3
     # Should be the most recent ones
-    assert data[sample_proxy.config]["entries"][0]["latency"] == 120
-    assert data[sample_proxy.config]["entries"][2]["latency"] == 140
+    assert entries[0]["latency"] == 120
+    assert entries[2]["latency"] == 140
+
+
+def test_trim_removes_entries_beyond_max(temp_history_path, sample_proxy, make_tracker):
+    """Test that flushing deletes rows beyond max_entries from disk."""
+    from configstream.proxy_history import TRIM_INTERVAL
 
+    tracker = make_tracker(history_path=temp_history_path, max_entries=3)
+
+    for i in range(TRIM_INTERVAL):
+        sample_proxy.latency = i
+        tracker.record_test_result(sample_proxy)
+    tracker.flush()
+
+    (count,) = tracker._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+    assert count == 3
+    entries = tracker.get_proxy_history(sample_proxy.config)["entries"]
+    assert [e["latency"] for e in entries] == [
+        TRIM_INTERVAL - 3,
+        TRIM_INTERVAL - 2,
+        TRIM_INTERVAL - 1,
+    ]
 
-def test_get_proxy_history(temp_history_path, sample_proxy):
+
+def test_get_proxy_history(temp_history_path, sample_proxy, make_tracker):
     """Test retrieving proxy history."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     tracker.record_test_result(sample_proxy)
 
@@ -94,17 +130,17 @@ def test_get_proxy_history(temp_history_path, sample_proxy):
     assert len(history["entries"]) == 1
 
 
-def test_get_proxy_history_not_found(temp_history_path):
+def test_get_proxy_history_not_found(temp_history_path, make_tracker):
     """Test retrieving history for non-existent proxy."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     history = tracker.get_proxy_history("nonexistent://config")
     assert history is None
 
 
-def test_get_reliability_score_all_working(temp_history_path, sample_proxy):
+def test_get_reliability_score_all_working(temp_history_path, sample_proxy, make_tracker):
     """Test reliability score with all working tests."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     # Record 5 successful tests
     for _ in range(5):
@@ -114,9 +150,9 @@ def test_get_reliability_score_all_working(temp_history_path, sample_proxy):
     assert score == 1.0
 
 
-def test_get_reliability_score_mixed(temp_history_path, sample_proxy):
+def test_get_reliability_score_mixed(temp_history_path, sample_proxy, make_tracker):
     """Test reliability score with mixed results."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     # Record 3 successful, 2 failed
     for i in range(5):
@@ -127,17 +163,17 @@ def test_get_reliability_score_mixed(temp_history_path, sample_proxy):
     assert score == 0.6  # 3/5 = 0.6
 
 
-def test_get_reliability_score_unknown_proxy(temp_history_path):
+def test_get_reliability_score_unknown_proxy(temp_history_path, make_tracker):
     """Test reliability score for unknown proxy."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     score = tracker.get_reliability_score("unknown://proxy")
     assert score == 0.5  # Neutral score
 
 
-def test_get_trend_data(temp_history_path, sample_proxy):
+def test_get_trend_data(temp_history_path, sample_proxy, make_tracker):
     """Test getting trend data for charting."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     # Record some test results
     for i in range(10):
@@ -156,9 +192,9 @@ def test_get_trend_data(temp_history_path, sample_proxy):
     assert trend["status"][1] == 0  # Not working
 
 
-def test_get_trend_data_limits_points(temp_history_path, sample_proxy):
+def test_get_trend_data_limits_points(temp_history_path, sample_proxy, make_tracker):
     """Test that trend data respects points limit."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     # Record 20 results
     for i in range(20):
@@ -170,9 +206,9 @@ def test_get_trend_data_limits_points(temp_history_path, sample_proxy):
     assert len(trend["timestamps"]) == 5
 
 
-def test_get_summary_stats(temp_history_path, sample_proxy):
+def test_get_summary_stats(temp_history_path, sample_proxy, make_tracker):
     """Test getting summary statistics."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     # Record 10 results: 7 working, 3 failed
     for i in range(10):
@@ -190,9 +226,9 @@ def test_get_summary_stats(temp_history_path, sample_proxy):
     assert stats["max_latency"] == 160
 
 
-def test_get_summary_stats_unknown_proxy(temp_history_path):
+def test_get_summary_stats_unknown_proxy(temp_history_path, make_tracker):
     """Test summary stats for unknown proxy."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     stats = tracker.get_summary_stats("unknown://proxy")
 
@@ -201,9 +237,9 @@ def test_get_summary_stats_unknown_proxy(temp_history_path):
     assert stats["uptime_percentage"] == 0.0
 
 
-def test_export_for_visualization(temp_history_path, sample_proxy):
+def test_export_for_visualization(temp_history_path, sample_proxy, make_tracker):
     """Test exporting data for visualization."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     # Record some results
     for i in range(5):
@@ -219,19 +255,38 @@ def test_export_for_visualization(temp_history_path, sample_proxy):
     assert "trend" in viz_data[sample_proxy.config]
     assert "stats" in viz_data[sample_proxy.config]
     assert viz_data[sample_proxy.config]["protocol"] == "vmess"
+    assert b"\n" not in output_path.read_bytes()
+
+    compact = output_path.read_bytes()
+    tracker.export_for_visualization(output_path, pretty=True)
+    assert json.loads(output_path.read_text()) == viz_data
+    assert b"\n  " in output_path.read_bytes()
+    assert compact == json.dumps(viz_data, separators=(",", ":")).encode()
+
+
+def test_summarize_matches_trend_and_stats(temp_history_path, sample_proxy, make_tracker):
+    """Test that the fused export summary equals the separate trend and stats."""
+    tracker = make_tracker(history_path=temp_history_path, max_entries=8)
+    for i in range(12):
+        sample_proxy.is_working = i % 3 != 0
+        sample_proxy.latency = None if i % 4 == 0 else 100.0 + i * 10
+        tracker.record_test_result(sample_proxy)
+
+    trend, stats = tracker._summarize(sample_proxy.config, points=5)
 
+    assert trend == tracker.get_trend_data(sample_proxy.config, points=5)
+    assert stats == pytest.approx(tracker.get_summary_stats(sample_proxy.config))
+    assert tracker._summarize("unknown://proxy", points=5)[1]["total_tests"] == 0
 
-def test_export_skips_empty_entries(temp_history_path, sample_proxy):
+
+def test_export_skips_empty_entries(temp_history_path, sample_proxy, make_tracker):
     """Test that export skips proxies with no entries."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     # Manually add proxy with empty entries
-    tracker.history_data["empty://proxy"] = {
-        "protocol": "vmess",
-        "address": "0.0.0.0",
-        "port": 1,
-        "entries": [],
-    }
+    tracker._conn.execute(
+        "INSERT INTO proxies VALUES (?, ?, ?, ?)", ("empty://proxy", "vmess", "0.0.0.0", 1)
+    )
 
     output_path = temp_history_path.parent / "viz.json"
     tracker.export_for_visualization(output_path)
@@ -240,15 +295,16 @@ def test_export_skips_empty_entries(temp_history_path, sample_proxy):
     assert "empty://proxy" not in viz_data
 
 
-def test_cleanup_old_data(temp_history_path, sample_proxy):
+def test_cleanup_old_data(temp_history_path, sample_proxy, make_tracker):
     """Test cleaning up old historical data."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     # Record some current data
     tracker.record_test_result(sample_proxy)
+    tracker.flush()
 
     # Manually add old data
-    old_timestamp = (datetime.now(timezone.utc) - timedelta(days=40)).isoformat()
+    old_timestamp = int((datetime.now(timezone.utc) - timedelta(days=40)).timestamp())
     old_proxy = Proxy(
         config="vmess://old",
         protocol="vmess",
@@ -257,46 +313,85 @@ def test_cleanup_old_data(temp_history_path, sample_proxy):
         is_working=True,
     )
 
-    tracker.history_data[old_proxy.config] = {
-        "protocol": "vmess",
-        "address": "5.6.7.8",
-        "port": 443,
-        "entries": [
-            {
-                "timestamp": old_timestamp,
-                "is_working": True,
-                "latency": 100,
-                "country": "US",
-            }
-        ],
-    }
-    tracker._save_history()
+    with tracker._conn:
+        tracker._conn.execute(
+            "INSERT INTO proxies VALUES (?, ?, ?, ?)", (old_proxy.config, "vmess", "5.6.7.8", 443)
+        )
+        tracker._conn.execute(
+            "INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+            (old_proxy.config, old_timestamp, True, 100, "US"),
+        )
 
     # Cleanup old data (keep 30 days)
     removed = tracker.cleanup_old_data(days=30)
 
     assert removed == 1  # Should remove the old proxy
-    assert sample_proxy.config in tracker.history_data
-    assert old_proxy.config not in tracker.history_data
+    assert tracker.get_proxy_history(sample_proxy.config) is not None
+    assert tracker.get_proxy_history(old_proxy.config) is None
 
 
-def test_data_persistence(temp_history_path, sample_proxy):
+def test_data_persistence(temp_history_path, sample_proxy, make_tracker):
     """Test that data persists across tracker instances."""
     # First instance
-    tracker1 = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker1 = make_tracker(history_path=temp_history_path)
     tracker1.record_test_result(sample_proxy)
+    tracker1.close()
 
     # Second instance (should load existing data)
-    tracker2 = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker2 = make_tracker(history_path=temp_history_path)
 
     history = tracker2.get_proxy_history(sample_proxy.config)
     assert history is not None
     assert len(history["entries"]) == 1
 
 
-def test_handles_null_latency(temp_history_path, sample_proxy):
+def test_results_are_committed_in_batches(temp_history_path, make_tracker):
+    """Test that results stay in one transaction until flush or the batch limit."""
+    import sqlite3
+
+    tracker = make_tracker(history_path=temp_history_path)
+    tracker._writer.flush_every = 4
+    proxies = [
+        Proxy(config=f"vmess://batch{i}", protocol="vmess", address=f"h{i}", port=443)
+        for i in range(3)
+    ]
+
+    def committed() -> int:
+        with sqlite3.connect(temp_history_path) as reader:
+            return reader.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    tracker.record_test_results(proxies)
+    tracker._wait_for_writes()
+    assert committed() == 0
+    assert tracker.get_reliability_score(proxies[0].config) == 0.0
+
+    tracker.record_test_result(proxies[0])
+    tracker._wait_for_writes()
+    assert committed() == 4
+
+    tracker.record_test_result(proxies[1])
+    tracker.flush()
+    assert committed() == 5
+    tracker.close()
+
+
+def test_recorded_rows_are_snapshots(temp_history_path, sample_proxy, make_tracker):
+    """Test that changing a proxy after recording does not alter the queued row."""
+    tracker = make_tracker(history_path=temp_history_path)
+
+    sample_proxy.latency = 50.0
+    tracker.record_test_result(sample_proxy)
+    sample_proxy.latency = 999.0
+
+    entries = tracker.get_proxy_history(sample_proxy.config)["entries"]
+    assert [e["latency"] for e in entries] == [50.0]
+    tracker.close()
+    assert not tracker._writer.thread.is_alive()
+
+
+def test_handles_null_latency(temp_history_path, sample_proxy, make_tracker):
     """Test handling of proxies with no latency."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     sample_proxy.latency = None
     tracker.record_test_result(sample_proxy)
@@ -305,9 +400,9 @@ def test_handles_null_latency(temp_history_path, sample_proxy):
     assert trend["latencies"][0] == 0  # Should convert None to 0
 
 
-def test_multiple_proxies(temp_history_path):
+def test_multiple_proxies(temp_history_path, make_tracker):
     """Test tracking multiple different proxies."""
-    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker = make_tracker(history_path=temp_history_path)
 
     proxies = [
         Proxy(
@@ -324,8 +419,166 @@ def test_multiple_proxies(temp_history_path):
     for proxy in proxies:
         tracker.record_test_result(proxy)
 
-    assert len(tracker.history_data) == 5
-
     # Verify each proxy has its own entry
     for proxy in proxies:
-        assert proxy.config in tracker.history_data
+        history = tracker.get_proxy_history(proxy.config)
+        assert history is not None
+        assert len(history["entries"]) == 1
+
+
+def test_imports_legacy_json_history(tmp_path, make_tracker):
+    """Test that an existing proxy_history.json is imported into a new database."""
+    legacy = {
+        "vmess://legacy": {
+            "protocol": "vmess",
+            "address": "1.2.3.4",
+            "port": 443,
+            "entries": [
+                {
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "is_working": True,
+                    "latency": 80,
+                    "country": "US",
+                }
+            ],
+        }
+    }
+    (tmp_path / "proxy_history.json").write_text(json.dumps(legacy))
+
+    tracker = make_tracker(history_path=tmp_path / "proxy_history.sqlite")
+
+    history = tracker.get_proxy_history("vmess://legacy")
+    assert history["address"] == "1.2.3.4"
+    assert history["entries"][0]["latency"] == 80
+    assert tracker.get_reliability_score("vmess://legacy") == 1.0
+
+
+def test_json_history_path_opens_sqlite_sibling(tmp_path, make_tracker):
+    """Test that the old proxy_history.json path imports into a sibling database."""
+    legacy_path = tmp_path / "proxy_history.json"
+    legacy = {
+        "vmess://legacy": {
+            "protocol": "vmess",
+            "address": "1.2.3.4",
+            "port": 443,
+            "entries": [
+                {
+                    "timestamp": "2024-05-01T12:30:00Z",
+                    "is_working": False,
+                    "latency": None,
+                    "country": None,
+                }
+            ],
+        }
+    }
+    legacy_path.write_text(json.dumps(legacy))
+
+    tracker = make_tracker(history_path=legacy_path)
+
+    assert tracker.history_path == tmp_path / "proxy_history.sqlite"
+    history = tracker.get_proxy_history("vmess://legacy")
+    assert history["entries"][0]["timestamp"] == "2024-05-01T12:30:00+00:00"
+    assert json.loads(legacy_path.read_text()) == legacy
+
+
+def test_malformed_legacy_records_skipped(tmp_path, make_tracker):
+    """Test that bad legacy records are skipped without failing the import."""
+    entry = {"timestamp": "2024-05-01T12:30:00Z", "is_working": True, "latency": 1, "country": ""}
+    legacy = {
+        "vmess://good": {"protocol": "vmess", "address": "h", "port": 443, "entries": [entry]},
+        "vmess://no-protocol": {"address": "h", "port": 443, "entries": [entry]},
+        "vmess://bad-entry": {
+            "protocol": "vmess",
+            "address": "h",
+            "port": 443,
+            "entries": [entry, {"timestamp": 5}],
+        },
+        "vmess://not-a-dict": ["vmess"],
+    }
+    (tmp_path / "proxy_history.json").write_text(json.dumps(legacy))
+
+    tracker = make_tracker(history_path=tmp_path / "proxy_history.sqlite")
+
+    assert tracker.get_proxy_history("vmess://good") is not None
+    for config in ("vmess://no-protocol", "vmess://bad-entry", "vmess://not-a-dict"):
+        assert tracker.get_proxy_history(config) is None
+
+
+def test_batch_shares_one_timestamp(temp_history_path, make_tracker):
+    """Test that every result in a batch is stamped with the same time."""
+    tracker = make_tracker(history_path=temp_history_path)
+    proxies = [
+        Proxy(config=f"vmess://ts{i}", protocol="vmess", address=f"h{i}", port=443)
+        for i in range(50)
+    ]
+
+    tracker.record_test_results(proxies)
+
+    stamps = {tracker.get_trend_data(p.config)["timestamps"][0] for p in proxies}
+    assert len(stamps) == 1
+    assert datetime.fromisoformat(stamps.pop()).tzinfo is not None
+
+
+def test_export_viz_shards_rewrites_only_changed_proxies(temp_history_path, make_tracker):
+    """Test that shard export skips unchanged proxies and drops removed ones."""
+    tracker = make_tracker(history_path=temp_history_path)
+    first = Proxy(config="vmess://shard1", protocol="vmess", address="h1", port=443)
+    second = Proxy(config="vmess://shard2", protocol="vmess", address="h2", port=443)
+    output_dir = temp_history_path.parent / "viz"
+
+    tracker.record_test_results([first, second])
+    assert tracker.export_viz_shards(output_dir) == 2
+    assert tracker.export_viz_shards(output_dir) == 0
+
+    first.is_working = True
+    first.latency = 42.0
+    tracker.record_test_result(first)
+    assert tracker.export_viz_shards(output_dir) == 1
+
+    index = json.loads((output_dir / "index.json").read_text())
+    shard = json.loads((output_dir / index[first.config]["shard"]).read_text())
+    assert shard["trend"]["latencies"] == [0, 42.0]
+    assert index[first.config]["stats"]["total_tests"] == 2
+
+    with tracker._conn:
+        tracker._conn.execute("DELETE FROM entries WHERE proxy_id = ?", (second.config,))
+    second_shard = output_dir / index[second.config]["shard"]
+    assert tracker.export_viz_shards(output_dir) == 0
+    assert second.config not in json.loads((output_dir / "index.json").read_text())
+    assert not second_shard.exists()
+
+
+def test_writer_error_raised_on_next_read(temp_history_path, sample_proxy, make_tracker):
+    """Test that a failed write surfaces on the next read and the writer keeps running."""
+    tracker = make_tracker(history_path=temp_history_path)
+    # SQLite integers are 64-bit, so binding this port raises OverflowError
+    huge_port = Proxy(config="vmess://huge", protocol="vmess", address="h", port=2**64)
+
+    tracker.record_test_result(huge_port)
+    with pytest.raises(OverflowError):
+        tracker.get_proxy_history(huge_port.config)
+
+    tracker.record_test_result(sample_proxy)
+    assert tracker.get_proxy_history(sample_proxy.config) is not None
+    assert tracker._writer.thread.is_alive()
+
+
+def test_tracker_closes_on_exit_and_collection(temp_history_path, sample_proxy):
+    """Test that leaving the context or dropping the tracker commits and stops the writer."""
+    import gc
+    import sqlite3
+
+    with ProxyHistoryTracker(history_path=temp_history_path) as tracker:
+        tracker.record_test_result(sample_proxy)
+    assert not tracker._writer.thread.is_alive()
+
+    tracker = ProxyHistoryTracker(history_path=temp_history_path)
+    tracker.record_test_result(sample_proxy)
+    thread = tracker._writer.thread
+    del tracker
+    gc.collect()
+    assert not thread.is_alive()
+
+    with sqlite3.connect(temp_history_path) as reader:
+        assert reader.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 2
+    reader.close()
@@ -6,14 +6,14 @@ from configstream.security.rate_limiter import RateLimiter
 def test_rate_limiter_allows_initial_requests():
     limiter = RateLimiter(requests_per_second=10)
     # The bucket is initialized with a full set of tokens
-    limiter.buckets["test"] = {"tokens": 10, "last_update": time.time()}
+    limiter.buckets["test"] = {"tokens": 10, "last_update": time.monotonic()}
     for _ in range(10):
         assert limiter.is_allowed("test")
 
 
 def test_rate_limiter_denies_exceeded_requests():
     limiter = RateLimiter(requests_per_second=10)
-    limiter.buckets["test"] = {"tokens": 10, "last_update": time.time()}
+    limiter.buckets["test"] = {"tokens": 10, "last_update": time.monotonic()}
     for _ in range(10):
         limiter.is_allowed("test")
     assert not limiter.is_allowed("test")
@@ -21,7 +21,7 @@ def test_rate_limiter_denies_exceeded_requests():
 
 def test_rate_limiter_refills_tokens():
     limiter = RateLimiter(requests_per_second=1)
-    limiter.buckets["test"] = {"tokens": 1, "last_update": time.time()}
+    limiter.buckets["test"] = {"tokens": 1, "last_update": time.monotonic()}
     assert limiter.is_allowed("test")
     assert not limiter.is_allowed("test")
     time.sleep(1.1)
@@ -30,13 +30,13 @@ def test_rate_limiter_refills_tokens():
 
 def test_get_wait_time_full_bucket():
     limiter = RateLimiter(requests_per_second=10)
-    limiter.buckets["test"] = {"tokens": 10, "last_update": time.time()}
+    limiter.buckets["test"] = {"tokens": 10, "last_update": time.monotonic()}
     assert limiter.get_wait_time("test") <= 0
 
 
 def test_get_wait_time_partial_bucket():
     limiter = RateLimiter(requests_per_second=10)
-    limiter.buckets["test"] = {"tokens": 5, "last_update": time.time()}
+    limiter.buckets["test"] = {"tokens": 5, "last_update": time.monotonic()}
     # Consume some tokens
     for _ in range(5):
         limiter.is_allowed("test")
@@ -46,3 +46,21 @@ def test_get_wait_time_partial_bucket():
     # Expected wait time for 1 token at a rate of 10/sec is 0.1s
     # After consuming 5 tokens, we have 0 left. The next one should be available in ~0.1s
     assert 0.09 < wait_time < 0.11
+
+
+def test_rate_limiter_caps_refill_at_rate():
+    limiter = RateLimiter(requests_per_second=2)
+    limiter.buckets["test"] = {"tokens": 0, "last_update": time.monotonic() - 60}
+    assert limiter.is_allowed("test")
+    assert limiter.buckets["test"]["tokens"] == 1
+    assert limiter.is_allowed("test")
+    assert not limiter.is_allowed("test")
+
+
+def test_is_allowed_many_admits_available_tokens():
+    limiter = RateLimiter(requests_per_second=10)
+    limiter.buckets["test"] = {"tokens": 4.5, "last_update": time.monotonic()}
+    assert limiter.is_allowed_many("test", 3) == 3
+    assert limiter.is_allowed_many("test", 3) == 1
+    assert limiter.is_allowed_many("test", 3) == 0
+    assert limiter.buckets["test"]["tokens"] < 1
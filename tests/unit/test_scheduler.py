@@ -71,6 +71,23 @@ async def test_retest_scheduler_empty_proxies_file(mock_run_full_pipeline, tmp_p
     assert result.proxies_working == 0
 
 
+@pytest.mark.asyncio
+async def test_retest_scheduler_reads_jsonl_and_pretty_json(tmp_path):
+    """Test that proxies load from newline-delimited JSON and from indented arrays."""
+    records = [
+        {"config": f"vmess://config{i}", "protocol": "vmess", "address": "test.com", "port": 443}
+        for i in range(3)
+    ]
+    jsonl_file = tmp_path / "proxies.jsonl"
+    jsonl_file.write_text("\n" + "\n".join(json.dumps(r) for r in records) + "\n\n")
+    array_file = tmp_path / "proxies.json"
+    array_file.write_text(json.dumps(records, indent=2))
+
+    for path in (jsonl_file, array_file):
+        proxies = await RetestScheduler(str(path))._load_proxies()
+        assert [p.config for p in proxies] == [r["config"] for r in records]
+
+
 @pytest.mark.asyncio
 async def test_retest_scheduler_start_and_stop(mock_run_full_pipeline, proxies_file):
     """Test that the scheduler can be started and stopped."""
@@ -63,6 +63,18 @@ def test_calculate_health_score_not_working():
     assert score < 50.0
 
 
+def test_calculate_health_score_untested_proxy():
+    """Test the untested-proxy shortcut matches the full calculation."""
+    untested = Proxy(config="test", protocol="vmess", address="1.2.3.4", port=443)
+    # Falsy details force the full calculation with the same inputs
+    scored = Proxy(
+        config="test", protocol="vmess", address="1.2.3.4", port=443, details={"tls": False}
+    )
+
+    assert calculate_health_score(untested) == 35.0
+    assert calculate_health_score(scored) == 35.0
+
+
 def test_calculate_health_score_with_security():
     """Test scoring considers security features."""
     # Proxy with TLS
@@ -181,3 +193,93 @@ def test_legacy_score_stability(sample_proxy):
 
     assert isinstance(score, float)
     assert score > 0.0
+
+
+def test_latency_points_table_matches_sigmoid():
+    """Test that the latency lookup table tracks the exact sigmoid."""
+    from configstream.score import _sigmoid_points
+
+    for soft_cap in (100, 1000, 4000):
+        for lat_ms in (0.0, 0.5, 99.0, 123.456, 599.9, 2500.25, 9999.99, 10_000.0, 25_000.0):
+            assert _latency_points(lat_ms, soft_cap, 30.0) == pytest.approx(
+                _sigmoid_points(lat_ms, soft_cap, 30.0), abs=1e-3
+            )
+    assert _latency_points(250.0, 1000, 30.0) == _sigmoid_points(250.0, 1000, 30.0)
+
+
+@pytest.mark.parametrize("vectorize_min_batch", [1, 10_000])
+def test_calculate_health_scores_batch_matches_scalar(monkeypatch, vectorize_min_batch):
+    """Test that batch scoring agrees with per-proxy scoring on both code paths."""
+    from configstream import score
+
+    monkeypatch.setattr(score, "VECTORIZE_MIN_BATCH", vectorize_min_batch)
+    proxies = [
+        Proxy(
+            config=f"vmess://batch{i}",
+            protocol="vmess",
+            address=f"10.0.0.{i}",
+            port=443,
+            is_working=i % 2 == 0,
+            latency=None if i % 5 == 0 else i * 137.0,
+            details={"tls": i % 3 == 0, "aead": i % 4 == 0, "encryption": "auto" if i % 7 else ""},
+            dns_over_https_ok=i % 6 == 0,
+        )
+        for i in range(40)
+    ]
+
+    expected = [calculate_health_score(p) for p in proxies]
+    assert score.calculate_health_scores_batch(proxies) == expected
+
+
+def test_vectorized_health_scores_match_scalar_exactly(monkeypatch):
+    """Test that the numpy path reproduces every scalar score, table edges included."""
+    pytest.importorskip("numpy")
+    import random
+
+    from configstream import score
+
+    class _History:
+        def get_health_score(self, proxy):
+            return (hash(proxy.config) % 101) / 100
+
+    monkeypatch.setattr(score, "VECTORIZE_MIN_BATCH", 1)
+    rng = random.Random(7)
+    latencies = [None, -5.0, 0.0, 0.5, 99.999, 9999.99, 10_000.0, 25_000.0, 250]
+    latencies += [rng.uniform(0, 12_000) for _ in range(2000)]
+    proxies = [
+        Proxy(
+            config=f"vmess://vector{i}",
+            protocol="vmess",
+            address="example.com",
+            port=443,
+            is_working=rng.random() < 0.5,
+            latency=latency,
+            details={"tls": rng.random() < 0.5, "aead": rng.random() < 0.5},
+            dns_over_https_ok=rng.random() < 0.5,
+        )
+        for i, latency in enumerate(latencies)
+    ]
+
+    # Scores the exact sigmoid used to round differently from the table
+    settings = AppSettings()
+    settings.LAT_SOFT_CAP_MS = 1800
+    edges = [
+        Proxy(
+            config=f"vmess://edge{i}",
+            protocol="vmess",
+            address="e",
+            port=443,
+            is_working=True,
+            latency=latency,
+        )
+        for i, latency in enumerate((1823.564, 2082.426, 1266.716, 2244.959))
+    ]
+    expected = [calculate_health_score(p, None, settings) for p in edges]
+    assert score.calculate_health_scores_batch(edges, None, settings) == expected
+
+    for cache in (None, _History()):
+        for soft_cap in (0, 300, 1000, 4000):
+            settings = AppSettings()
+            settings.LAT_SOFT_CAP_MS = soft_cap
+            expected = [calculate_health_score(p, cache, settings) for p in proxies]
+            assert score.calculate_health_scores_batch(proxies, cache, settings) == expected
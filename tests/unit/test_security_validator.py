@@ -1,5 +1,7 @@
 """Tests for security validation functionality."""
 
+import pytest
+
 from configstream.security_validator import (
     SecurityValidator,
     validate_batch_configs,
@@ -9,6 +11,7 @@ from configstream.security_validator import (
     STRICT_POLICY,
     TEST_POLICY,
 )
+from configstream import security_validator
 from configstream.models import Proxy
 
 
@@ -32,7 +35,7 @@ class TestSecurityValidator:
 
     def test_dangerous_port_detected(self):
         """Test that dangerous ports are detected."""
-        for port in DANGEROUS_PORTS[:3]:  # Test first 3
+        for port in sorted(DANGEROUS_PORTS)[:3]:  # Test first 3
             proxy = Proxy(
                 config="vmess://test",
                 protocol="vmess",
@@ -91,6 +94,14 @@ class TestSecurityValidator:
             )
             assert any("address" in issue.lower() for issue in issues[category])
 
+    def test_suspicious_domain_subdomains_rejected(self):
+        """Test that subdomains of suspicious domains are rejected, lookalikes are not."""
+        for address in ["proxy.localhost", "a.b.localhost"]:
+            issues = SecurityValidator._validate_address(address, frozenset())
+            assert "address_suspicious" in issues, address
+
+        assert SecurityValidator._validate_address("notlocalhost", frozenset()) == {}
+
     def test_private_ip_ranges_rejected(self):
         """Test that private IP ranges are rejected."""
         private_ips = [
@@ -116,6 +127,48 @@ class TestSecurityValidator:
             assert "address_private_ip" in issues
             assert any("address" in issue.lower() for issue in issues["address_private_ip"])
 
+    def test_special_address_classification(self):
+        """Test that IP literals are classified numerically, not by prefix."""
+        special = [
+            "fd12:3456::1",
+            "224.0.0.1",
+            "::ffff:192.168.1.1",
+            "255.255.255.255",
+            # Shorthand and fully qualified forms that resolvers still accept
+            "127.1",
+            "10.1",
+            "2130706433",
+            "127.0.0.1.",
+            "localhost.",
+        ]
+        public = [
+            "8.8.8.8",
+            "8.8.8.8.",
+            "134744072",
+            "100.1.2.3",
+            "2606:4700::1111",
+            "10.example.com",
+            "172.32.0.1",
+            "999.1.1.1",
+        ]
+
+        for address in special:
+            issues = SecurityValidator._validate_address(address, frozenset())
+            assert "address_private_ip" in issues, address
+        for address in public:
+            assert SecurityValidator._validate_address(address, frozenset()) == {}, address
+
+    def test_address_issues_memoized(self):
+        """Test that repeated addresses reuse the cached result without sharing dicts."""
+        security_validator._address_issues.cache_clear()
+
+        first = SecurityValidator._validate_address("10.0.0.1", frozenset())
+        first.clear()
+        second = SecurityValidator._validate_address("10.0.0.1", frozenset())
+
+        assert "address_private_ip" in second
+        assert security_validator._address_issues.cache_info().hits == 1
+
     def test_empty_address_rejected(self):
         """Test that empty addresses are rejected."""
         proxy = Proxy(
@@ -224,6 +277,18 @@ class TestSecurityValidator:
             assert is_secure is True, f"Protocol {protocol} should be safe"
             assert len(issues) == 0
 
+    def test_lookup_constants_are_frozensets(self):
+        """Test that the membership-checked constants stay hashed sets."""
+        assert isinstance(DANGEROUS_PORTS, frozenset)
+        assert isinstance(VALID_PROTOCOLS, frozenset)
+        assert isinstance(security_validator.SUSPICIOUS_DOMAINS, frozenset)
+
+    def test_protocol_check_is_case_insensitive(self):
+        """Test that protocols match regardless of case."""
+        assert SecurityValidator._validate_protocol("VLESS") is None
+        assert SecurityValidator._validate_protocol("Trojan") is None
+        assert SecurityValidator._validate_protocol("vlessx") is not None
+
     def test_null_byte_in_config_rejected(self):
         """Test that configs with null bytes are rejected."""
         proxy = Proxy(
@@ -264,6 +329,50 @@ class TestSecurityValidator:
             assert is_secure is False
             assert "suspicious_injection_attempt" in issues
 
+    def test_injection_patterns_rejected_in_any_case(self):
+        """Test that every injection pattern is caught past the trigger prefilter."""
+        malicious_configs = [
+            "vmess://EXEC (x)",
+            "vmess://<SCRIPT>",
+            "vmess://JavaScript:alert(1)",
+            "vmess://DATA:TEXT/HTML,x",
+            "vmess://x' ; drop  table users",
+            "vmess://x DeLeTe FROM users",
+            "vmess://../../etc/passwd",
+            "vmess://FILE://etc",
+            "vmess://test%00",
+            "vmess://javaſcript:alert(1)",  # non-ASCII case folding
+        ]
+
+        for config in malicious_configs:
+            issues = SecurityValidator._validate_config_string(config)
+            assert "suspicious_injection_attempt" in issues, config
+
+    def test_hyperscan_agrees_with_regex(self):
+        """Test that the Hyperscan database flags exactly what the regex flags."""
+        pytest.importorskip("hyperscan")
+        configs = [
+            "vmess://test;\x1crm -rf /",
+            "vmess://test;\x0brm\x0b",
+            "vmess://x DROP\tTABLE users",
+            "vmess://xDROP TABLE users",
+            "vmess://eval  (1)",
+            "vless://id@host:443?type=ws&path=%2Fws#Node|01",
+        ]
+
+        for config in configs:
+            expected = security_validator._SUSPICIOUS_RE.search(config) is not None
+            assert (security_validator._find_injection(config) is not None) == expected, config
+
+    def test_clean_config_with_query_string_accepted(self):
+        """Test that ordinary URI configs pass the injection check."""
+        config = (
+            "vless://0e9a3c5e-1f8b-4b2e-9d3c-2f1e5a6b7c8d@cdn.example.com:443"
+            "?encryption=none&security=tls&type=ws&path=%2Fws#US%20Node"
+        )
+
+        assert SecurityValidator._validate_config_string(config) == {}
+
     def test_excessively_long_config_rejected(self):
         """Test that excessively long configs are rejected."""
         long_config = "vmess://" + "A" * 15000
@@ -354,6 +463,31 @@ class TestURLValidation:
 
             assert is_valid is False
 
+    def test_host_checked_without_port_or_credentials(self):
+        """Test that ports and userinfo do not hide a private host."""
+        for url in [
+            "http://127.0.0.1:8080/",
+            "http://127.1:8080/",
+            "http://10.0.0.1:80/sub",
+            "https://user:pw@192.168.1.1/",
+            "http://[::1]:8080/",
+            "HTTP://10.0.0.1:80/",
+        ]:
+            is_valid, error = SecurityValidator.validate_url(url)
+
+            assert is_valid is False, url
+            assert "suspicious" in error.lower()
+
+        url = "https://user@valid-proxy-domain.com:8443/x?y#z"
+        assert SecurityValidator.validate_url(url) == (True, None)
+
+    def test_malformed_ipv6_url_rejected(self):
+        """Test that malformed bracketed hosts report a parsing error."""
+        is_valid, error = SecurityValidator.validate_url("http://[::1/")
+
+        assert is_valid is False
+        assert "parsing error" in error.lower()
+
     def test_missing_domain_rejected(self):
         """Test that URLs without domain/netloc are rejected."""
         # URL with scheme but no domain
@@ -509,3 +643,70 @@ class TestBatchValidation:
         secure_proxies = validate_batch_configs(proxies)
 
         assert len(secure_proxies) == 0
+
+    def test_batch_issues_match_single_validation(self):
+        """Test that column-wise batch checks report what per-proxy validation does."""
+        proxies = [
+            Proxy(
+                config="vmess://test; rm -rf /" if i % 4 == 0 else f"vmess://test{i % 3}",
+                protocol="vmess" if i % 5 else "bogus",
+                address="10.0.0.1" if i % 3 == 0 else "valid-proxy-domain.com",
+                port=22 if i % 2 else 443,
+            )
+            for i in range(24)
+        ]
+        expected = [
+            SecurityValidator.validate_proxy_config(p, policy=TEST_POLICY)[1] for p in proxies
+        ]
+
+        validate_batch_configs(proxies, policy=TEST_POLICY)
+
+        assert [p.security_issues if not p.is_secure else {} for p in proxies] == expected
+
+    def test_pool_validation_matches_inline(self, monkeypatch):
+        """Test that the process pool path filters and marks like the inline path."""
+
+        def make_batch():
+            return [
+                Proxy(
+                    config="vmess://test" if i % 3 else "vmess://test; rm -rf /",
+                    protocol="vmess",
+                    address="valid-proxy-domain.com" if i % 4 else "10.0.0.1",
+                    port=443 if i % 5 else 22,
+                )
+                for i in range(30)
+            ]
+
+        inline = make_batch()
+        expected = validate_batch_configs(inline, policy=TEST_POLICY)
+
+        monkeypatch.setattr(security_validator, "PARALLEL_VALIDATION_MIN_BATCH", 1)
+        monkeypatch.setattr(security_validator.os, "cpu_count", lambda: 2)
+        pooled = make_batch()
+        secure = validate_batch_configs(pooled, policy=TEST_POLICY)
+
+        assert [p.config for p in secure] == [p.config for p in expected]
+        assert [p.security_issues for p in pooled] == [p.security_issues for p in inline]
+        assert [p.is_secure for p in pooled] == [p.is_secure for p in inline]
+
+    def test_pool_validation_uses_given_pool_and_logs_in_parent(self, monkeypatch, caplog):
+        """Test that a caller's pool is used and left running, with issues logged here."""
+        import logging
+        from concurrent.futures import ProcessPoolExecutor
+
+        monkeypatch.setattr(security_validator, "PARALLEL_VALIDATION_MIN_BATCH", 1)
+        monkeypatch.setattr(security_validator.os, "cpu_count", lambda: 2)
+        proxies = [
+            Proxy(config="vmess://test", protocol="vmess", address="valid-proxy-domain.com", port=p)
+            for p in (443, 22)
+        ]
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            with caplog.at_level(logging.WARNING, logger="configstream.security_validator"):
+                secure = validate_batch_configs(proxies, policy=TEST_POLICY, pool=pool)
+            assert pool.submit(int, "7").result() == 7
+
+        assert secure == [proxies[0]]
+        assert "Insecure proxy filtered: valid-proxy-domain.com:22 (Dangerous port: 22)" in (
+            caplog.text
+        )